@@ -3,7 +3,38 @@ from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import uuid
 import sys
-import importlib
+import asyncio
+import functools
+import importlib.util
+
+# Optional modules and the import name used to locate each of them
+OPTIONAL_MODULES = {
+    'torch': 'torch',
+    'diffusers': 'diffusers',
+    'transformers': 'transformers',
+    'langchain': 'langchain',
+    'langchain_community': 'langchain_community',
+    'langchain_perplexity': 'langchain_perplexity',
+    'opencv': 'cv2',
+    'reportlab': 'reportlab',
+    'sqlalchemy': 'sqlalchemy'
+}
+
+@functools.lru_cache(maxsize=None)
+def probe_available_modules() -> Dict[str, bool]:
+    """Check which optional modules are installed.
+
+    Runs once per process and only locates the modules with ``find_spec``
+    instead of importing them, so it costs milliseconds rather than the
+    seconds needed to import torch or transformers.
+    """
+    modules = {}
+    for module_name, import_name in OPTIONAL_MODULES.items():
+        try:
+            modules[module_name] = importlib.util.find_spec(import_name) is not None
+        except (ImportError, ValueError):
+            modules[module_name] = False
+    return modules
 
 class BaseAgent(ABC):
     """Base class for all content governance agents with dynamic import support"""
@@ -19,39 +50,21 @@ class BaseAgent(ABC):
     
     def _check_available_modules(self) -> Dict[str, bool]:
         """Check which optional modules are available"""
-        modules = {
-            'torch': False,
-            'diffusers': False,
-            'transformers': False,
-            'langchain': False,
-            'langchain_community': False,
-            'langchain_perplexity': False,
-            'opencv': False,
-            'reportlab': False,
-            'sqlalchemy': False
-        }
-        
-        # Check each module
-        for module_name in modules:
-            try:
-                if module_name == 'opencv':
-                    importlib.import_module('cv2')
-                elif module_name == 'langchain_community':
-                    importlib.import_module('langchain_community')
-                elif module_name == 'langchain_perplexity':
-                    importlib.import_module('langchain_perplexity')
-                else:
-                    importlib.import_module(module_name)
-                modules[module_name] = True
-            except ImportError:
-                pass
-        
-        return modules
+        return dict(probe_available_modules())
     
     @abstractmethod
     def process(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Process content and return results"""
         pass
+
+    async def aprocess(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of process.
+
+        Runs the blocking ``process`` in the default executor so it does not
+        stall the event loop. Agents with native async clients override this.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.process, content))
     
     def log_activity(self, activity: str, details: Dict[str, Any] = None):
         """Log agent activity for monitoring"""
@@ -0,0 +1,201 @@
+# agents/factcheck/claim_extractor.py
+
+from typing import Dict, Any, List, Tuple
+import re
+
+# Trigger phrases grouped by claim category. Each trigger is the head of a
+# claim; the claim itself runs from the trigger to the end of its sentence.
+# Like the original per-pattern regexes, a trigger only counts when it is
+# followed by more text on the same line; unlike them, it must start a word.
+CLAIM_TRIGGERS: Dict[str, List[str]] = {
+    "statistical": [
+        r"\d+% of ",               # Percentage claims
+        r"\d+ out of \d+ ",        # Ratio claims
+        r"\d+x more ",             # Multiplier claims
+        r"up to \d+% ",            # Range percentage claims
+        r"over \d+(?=[^\n]+ [^\n])",  # "Over X" claims
+        r"more than \d+ ",         # "More than X" claims
+        r"\d+ times ",             # "X times" claims
+        r"nearly \d+% ",           # "Nearly X%" claims
+        r"approximately \d+ ",     # Approximation claims
+    ],
+    "authority": [
+        r"studies show ",          # Research claims
+        r"research indicates ",    # Research claims
+        r"experts say ",           # Expert opinions
+        r"scientists found ",      # Scientific findings
+        r"researchers discovered ",  # Research discoveries
+        r"data shows ",            # Data-based claims
+        r"analysis reveals ",      # Analysis results
+        r"survey found ",          # Survey results
+        r"report shows ",          # Report findings
+        r"clinical trials ",       # Medical research
+        r"peer-reviewed ",         # Academic validation
+    ],
+    "temporal": [
+        r"in recent years ",       # Time-based claims
+        r"latest research ",       # Recent findings
+        r"new study ",             # New research
+        r"recent data ",           # Recent information
+        r"breakthrough study ",    # Significant research
+    ],
+    "comparative": [
+        r"compared to ",           # Comparison statements
+        r"better than ",           # Superior claims
+        r"faster than ",           # Speed comparisons
+        r"more effective than ",   # Effectiveness claims
+        r"proven to be ",          # Proof claims
+    ],
+    "certainty": [
+        r"proven fact ",           # Certainty claims
+        r"guaranteed to ",         # Guarantee statements
+        r"scientifically proven ",  # Scientific validation
+        r"clinically proven ",     # Medical validation
+        r"evidence suggests ",     # Evidence-based claims
+        r"shown to ",              # Demonstration claims
+    ],
+    "attribution": [
+        r"according to ",          # Attribution claims
+        r"published in ",          # Publication references
+        r"featured in ",           # Media mentions
+        r"as reported by ",        # Media attribution
+        r"cited by ",              # Citation references
+        r"recommended by ",        # Endorsement claims
+    ],
+    "medical": [
+        r"doctors recommend ",     # Medical recommendations
+        r"fda approved ",          # Regulatory approval
+        r"clinically tested ",     # Testing claims
+        r"medical professionals ",  # Professional opinions
+    ],
+    "market": [
+        r"market leader ",         # Market position
+        r"industry standard ",     # Standard claims
+        r"award-winning ",         # Recognition claims
+        r"bestselling ",           # Sales claims
+        r"top-rated ",             # Rating claims
+    ],
+    "customer": [
+        r"customers report ",      # Customer feedback
+        r"users experience ",      # User experience
+        r"testimonials show ",     # Testimonial claims
+        r"reviews indicate ",      # Review-based claims
+    ],
+    "superlative": [
+        r"world's first ",         # Innovation claims
+        r"only [^\n]+? that ",     # Exclusivity claims
+        r"never before ",          # Novelty claims
+        r"revolutionary ",         # Revolutionary claims
+        r"breakthrough ",          # Breakthrough claims
+        r"cutting-edge ",          # Technology claims
+    ],
+}
+
+# End of a sentence: terminal punctuation followed by whitespace/end of text,
+# or a line break (claims never span lines).
+_SENTENCE_END = re.compile(r"[.!?](?=\s|$)|\n")
+
+
+# Leading run of literal characters in a trigger regex
+_LITERAL_PREFIX = re.compile(r"(?:[^\\\[\](){}.*+?|^$]|\\[ '\-])*")
+
+
+def _split_trigger(trigger: str) -> Tuple[str, str]:
+    """Split a trigger into its literal prefix (lower-cased) and the remaining regex."""
+    literal = _LITERAL_PREFIX.match(trigger).group()
+    return re.sub(r"\\(.)", r"\1", literal).lower(), trigger[len(literal):]
+
+
+def _compile_triggers(triggers: Dict[str, List[str]]) -> Tuple["re.Pattern", Dict[str, str]]:
+    """
+    Compile every trigger into one pattern shaped like a trie of their literal
+    prefixes, so at each position the regex engine follows a single branch per
+    character instead of trying every trigger in turn (an Aho-Corasick-style
+    scan). Each trigger ends in its own named group, which identifies the
+    trigger (and therefore its category) through ``match.lastgroup``.
+    """
+    trie: Dict[Any, Any] = {}
+    group_categories: Dict[str, str] = {}
+    for category, phrases in triggers.items():
+        for index, phrase in enumerate(phrases):
+            literal, rest = _split_trigger(phrase)
+            group_name = f"{category}__{index}"
+            group_categories[group_name] = category
+            node = trie
+            for char in literal:
+                node = node.setdefault(char, {})
+            # The lookahead requires at least one more character on the line
+            node.setdefault(None, []).append(f"(?P<{group_name}>{rest}(?=[^\\n]))")
+
+    def emit(node: Dict[Any, Any]) -> str:
+        # Longer (more specific) triggers are tried before shorter ones
+        branches = [re.escape(char) + emit(child) for char, child in node.items() if char is not None]
+        branches.extend(node.get(None, []))
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    # Triggers only start at a word boundary
+    return re.compile(r"\b" + emit(trie), re.IGNORECASE), group_categories
+
+
+class ClaimExtractor:
+    """
+    Single-pass claim extraction engine.
+
+    All trigger phrases are compiled into one trie-shaped pattern, so the text
+    is scanned once regardless of how many triggers exist. Each trigger opens
+    a claim that ends at the sentence boundary; triggers falling inside a
+    claim that is already open are merged into it (adding their category),
+    and repeated claim sentences are reported once.
+    """
+
+    def __init__(self, triggers: Dict[str, List[str]] = None):
+        self.triggers = triggers or CLAIM_TRIGGERS
+        self.pattern, self._group_categories = _compile_triggers(self.triggers)
+
+    def extract(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Extract claims from content.
+
+        Returns:
+            A list of claims in document order, each with ``text``, ``start``,
+            ``end`` and ``categories``.
+        """
+        claims: List[Dict[str, Any]] = []
+        seen_texts: Dict[str, Dict[str, Any]] = {}
+        current = None
+
+        for match in self.pattern.finditer(content):
+            category = self._group_categories[match.lastgroup]
+            if current is not None and match.start() < current["end"]:
+                # Overlapping trigger: fold it into the open claim
+                if category not in current["categories"]:
+                    current["categories"].append(category)
+                continue
+
+            start, end = self._claim_span(content, match)
+            text = content[start:end].strip()
+            key = text.lower()
+            if key in seen_texts:
+                current = {"end": end, "categories": seen_texts[key]["categories"]}
+                if category not in current["categories"]:
+                    current["categories"].append(category)
+                continue
+
+            current = {"text": text, "start": start, "end": end, "categories": [category]}
+            seen_texts[key] = current
+            claims.append(current)
+
+        return claims
+
+    def extract_texts(self, content: str) -> List[str]:
+        """Extract claims and return just their text."""
+        return [claim["text"] for claim in self.extract(content)]
+
+    @staticmethod
+    def _claim_span(content: str, match: "re.Match") -> Tuple[int, int]:
+        boundary = _SENTENCE_END.search(content, match.end())
+        if boundary is None:
+            return match.start(), len(content)
+        if boundary.group() == "\n":
+            return match.start(), boundary.start()
+        return match.start(), boundary.end()
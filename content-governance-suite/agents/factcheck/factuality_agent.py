@@ -2,14 +2,51 @@ from langchain_openai import OpenAI
 from datetime import datetime
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from langchain_perplexity import ChatPerplexity
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
 import re
 import os
+import threading
 from ..base_agent import BaseAgent
+from ..rate_limiter import provider_limits
+from .claim_extractor import ClaimExtractor
+from .verdict_cache import ClaimVerdictCache
 from dotenv import load_dotenv
 load_dotenv()
 
+FACT_CHECK_RATINGS = ("ACCURATE", "QUESTIONABLE", "INACCURATE")
+
+# Outermost JSON object, else array, in a reply (models sometimes wrap it in prose or code fences)
+_JSON_BLOCKS = (re.compile(r"\{.*\}", re.DOTALL), re.compile(r"\[.*\]", re.DOTALL))
+
+# Fallback for replies that ignore the JSON format:
+# "Claim 3: [QUESTIONABLE] - reasoning" (brackets, bold markers and dash style vary)
+_RATING_LINE = re.compile(
+    r"claim\s*(\d+)\W*?\b(INACCURATE|QUESTIONABLE|ACCURATE)\b[\s\]*:\-–—]*(.*)",
+    re.IGNORECASE
+)
+
+# How risky an unverified claim of each category is (0-1); a claim takes the
+# highest risk of its categories, unknown categories count as 1.0
+CLAIM_CATEGORY_RISK = {
+    "medical": 1.0,
+    "certainty": 0.9,
+    "statistical": 0.8,
+    "authority": 0.7,
+    "superlative": 0.6,
+    "comparative": 0.5,
+    "market": 0.5,
+    "customer": 0.4,
+    "temporal": 0.3,
+    "attribution": 0.2,
+}
+
+# Why the fact-check LLM was or was not called for a piece of content
+CASCADE_OUTCOMES = ("no_claims", "cached", "escalated", "guaranteed_fail", "low_risk_claims")
+
 
 class FactualityAgent(BaseAgent):
     """Agent responsible for fact-checking and compliance verification"""
@@ -22,7 +59,32 @@ class FactualityAgent(BaseAgent):
             temperature=0.1,  # Low temperature for factual accuracy
             api_key=os.getenv("PPLX_API_KEY")  # Use api_key parameter
         )
+        self.llm_provider = "perplexity"
         self.compliance_rules = self._load_compliance_rules()
+        self.claim_extractor = ClaimExtractor()
+
+        # Verdicts for previously checked claims; set CLAIM_CACHE_PATH="" for memory only
+        self.verdict_cache = ClaimVerdictCache(
+            path=self.config.get("verdict_cache_path", os.getenv(
+                "CLAIM_CACHE_PATH", os.path.join(".cache", "claim_verdicts.sqlite3"))),
+            ttl_seconds=float(self.config.get("verdict_cache_ttl", os.getenv(
+                "CLAIM_CACHE_TTL", 7 * 24 * 3600)))
+        )
+
+        # Evaluation cascade: local compliance rules and claim triage run first,
+        # and only content whose outcome they leave open is sent to the LLM
+        self.pass_threshold = float(self.config.get("pass_threshold", os.getenv("FACTCHECK_PASS_THRESHOLD", 0.7)))
+        self.cascade_enabled = str(self.config.get(
+            "cascade", os.getenv("FACTCHECK_CASCADE", "1"))).lower() in ("1", "true", "yes")
+        # Claims below this risk are never escalated; 0 keeps LLM-identical pass/fail decisions
+        self.min_claim_risk = float(self.config.get("min_claim_risk", os.getenv("FACTCHECK_MIN_CLAIM_RISK", 0.0)))
+        self._cascade_counts = {outcome: 0 for outcome in CASCADE_OUTCOMES}
+        self._cascade_lock = threading.Lock()
+
+        # Escalated claims are checked in batches of claim_batch_size, at most
+        # max_concurrency batches in flight per document (plus provider_limits)
+        self.claim_batch_size = max(1, int(self.config.get("claim_batch_size", os.getenv("FACTCHECK_BATCH_SIZE", 10))))
+        self.max_concurrency = max(1, int(self.config.get("max_concurrency", os.getenv("FACTCHECK_MAX_CONCURRENCY", 4))))
 
     def _load_compliance_rules(self) -> Dict[str, List[str]]:
         """Load compliance rules for different regulations"""
@@ -52,33 +114,30 @@ class FactualityAgent(BaseAgent):
             })
 
             text_content = content.get("content", "")
-            # Perform fact-checking
-            
-            fact_check_results = self._check_facts(text_content)
-            
-            # Check compliance
             compliance_results = self._check_compliance(text_content)
+            fact_check_results = self._check_facts(text_content, compliance_results)
+
+            return self._build_result(fact_check_results, compliance_results)
 
-            # Calculate overall score
-            overall_score = self._calculate_factuality_score(
-                fact_check_results, compliance_results
-            )
-
-            result = {
-                "fact_check": fact_check_results,
-                "compliance": compliance_results,
-                "overall_score": overall_score,
-                "status": "passed" if overall_score > 0.7 else "failed",
-                "agent_id": self.agent_id,
-                "timestamp": datetime.now().isoformat()
+        except Exception as e:
+            self.log_activity("Factuality check failed", {"error": str(e)})
+            return {
+                "error": str(e),
+                "status": "error"
             }
 
-            self.log_activity("Factuality check completed", {
-                "score": overall_score,
-                "status": result["status"]
+    async def aprocess(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Check content for factual accuracy and compliance using the async LLM client"""
+        try:
+            self.log_activity("Starting factuality check", {
+                "content_length": len(content.get("content", ""))
             })
 
-            return result
+            text_content = content.get("content", "")
+            compliance_results = self._check_compliance(text_content)
+            fact_check_results = await self._acheck_facts(text_content, compliance_results)
+
+            return self._build_result(fact_check_results, compliance_results)
 
         except Exception as e:
             self.log_activity("Factuality check failed", {"error": str(e)})
@@ -87,12 +146,160 @@ class FactualityAgent(BaseAgent):
                 "status": "error"
             }
 
-    def _check_facts(self, content: str) -> Dict[str, Any]:
+    def _build_result(self, fact_check_results: Dict[str, Any], compliance_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine fact-check and compliance results into the agent output"""
+        # Calculate overall score
+        overall_score = self._calculate_factuality_score(
+            fact_check_results, compliance_results
+        )
+
+        result = {
+            "fact_check": fact_check_results,
+            "compliance": compliance_results,
+            "overall_score": overall_score,
+            "status": "passed" if overall_score > self.pass_threshold else "failed",
+            "agent_id": self.agent_id,
+            "timestamp": datetime.now().isoformat()
+        }
+
+        self.log_activity("Factuality check completed", {
+            "score": overall_score,
+            "status": result["status"]
+        })
+
+        return result
+
+    def _check_facts(self, content: str, compliance_results: Dict[str, Any]) -> Dict[str, Any]:
         """Check factual claims in the content"""
         # Extract potential factual claims
-        claims = self._extract_claims(content)
-        
-        fact_check_prompt = PromptTemplate(
+        claims = self.claim_extractor.extract(content)
+        cached, misses = self._lookup_verdicts(claims)
+        escalated, outcome = self._triage_claims(claims, cached, misses, compliance_results)
+
+        # A failed batch is returned as its exception, so the others' verdicts are still kept
+        def check(batch):
+            try:
+                return self._check_batch(claims, batch)
+            except Exception as e:
+                return e
+
+        # Only claims without a cached verdict whose outcome is still open are sent to the LLM
+        batches = self._batch_claims(escalated)
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                replies = list(executor.map(check, batches))
+        else:
+            replies = [check(batch) for batch in batches]
+
+        return self._summarize_fact_check(claims, cached, misses, escalated, outcome, batches, replies)
+
+    async def _acheck_facts(self, content: str, compliance_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of _check_facts"""
+        claims = self.claim_extractor.extract(content)
+        # The verdict cache's disk tier is blocking SQLite I/O, so it is read and written off the event loop
+        loop = asyncio.get_running_loop()
+        cached, misses = await loop.run_in_executor(None, self._lookup_verdicts, claims)
+        escalated, outcome = self._triage_claims(claims, cached, misses, compliance_results)
+
+        batches = self._batch_claims(escalated)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def check(batch):
+            async with semaphore:
+                return await self._acheck_batch(claims, batch)
+
+        replies = await asyncio.gather(*(check(batch) for batch in batches), return_exceptions=True)
+        return await loop.run_in_executor(None, self._summarize_fact_check, claims, cached, misses, escalated,
+                                          outcome, batches, list(replies))
+
+    def _batch_claims(self, indices: List[int]) -> List[List[int]]:
+        """Split escalated claim indices into prompts of at most claim_batch_size claims"""
+        return [indices[start:start + self.claim_batch_size]
+                for start in range(0, len(indices), self.claim_batch_size)]
+
+    def _check_batch(self, claims: List[Dict[str, Any]], batch: List[int]) -> str:
+        """Fact-check one batch of claims and return the raw reply text"""
+        runnable = self._build_fact_check_prompt() | self.llm
+        provider_limits.acquire(self.llm_provider)
+        response = runnable.invoke({"claims": self._format_claims(claims, batch)})
+        return getattr(response, "content", str(response))
+
+    async def _acheck_batch(self, claims: List[Dict[str, Any]], batch: List[int]) -> str:
+        """Async variant of _check_batch"""
+        runnable = self._build_fact_check_prompt() | self.llm
+        await provider_limits.aacquire(self.llm_provider)
+        response = await runnable.ainvoke({"claims": self._format_claims(claims, batch)})
+        return getattr(response, "content", str(response))
+
+    @staticmethod
+    def _claim_risk(claim: Dict[str, Any]) -> float:
+        return max((CLAIM_CATEGORY_RISK.get(category, 1.0) for category in claim["categories"]), default=1.0)
+
+    def _triage_claims(
+        self,
+        claims: List[Dict[str, Any]],
+        cached: Dict[int, Dict[str, Any]],
+        misses: List[int],
+        compliance_results: Dict[str, Any]
+    ) -> Tuple[List[int], str]:
+        """
+        Decide which uncached claims need the LLM, returning their indices and
+        one of CASCADE_OUTCOMES. Claims that are not escalated count as not
+        flagged. The LLM is only skipped when the content fails even with no
+        new flags (a failed factuality check rejects the content whatever its
+        score) or when no claim reaches ``min_claim_risk``. Content that could
+        pass is always escalated, since its overall_score feeds the consensus.
+        """
+        if not claims:
+            return self._count_outcome([], "no_claims")
+        if not misses:
+            return self._count_outcome([], "cached")
+        if not self.cascade_enabled:
+            return self._count_outcome(misses, "escalated")
+
+        risky = [index for index in misses if self._claim_risk(claims[index]) >= self.min_claim_risk]
+        if not risky:
+            return self._count_outcome([], "low_risk_claims")
+
+        known_flags = sum(1 for verdict in cached.values() if verdict["rating"] != "ACCURATE")
+        best_score = self._calculate_factuality_score({"flagged_claims": [None] * known_flags}, compliance_results)
+        if best_score <= self.pass_threshold:
+            return self._count_outcome([], "guaranteed_fail")
+        return self._count_outcome(risky, "escalated")
+
+    def _count_outcome(self, escalated: List[int], outcome: str) -> Tuple[List[int], str]:
+        with self._cascade_lock:
+            self._cascade_counts[outcome] += 1
+        return escalated, outcome
+
+    def get_cascade_stats(self) -> Dict[str, Any]:
+        """How often content with unverified claims was escalated to the LLM, and why it was not"""
+        with self._cascade_lock:
+            counts = dict(self._cascade_counts)
+        needing_llm = sum(counts[outcome] for outcome in ("escalated", "guaranteed_fail", "low_risk_claims"))
+        return {
+            "enabled": self.cascade_enabled,
+            "pass_threshold": self.pass_threshold,
+            "min_claim_risk": self.min_claim_risk,
+            "outcomes": counts,
+            "llm_calls": counts["escalated"],
+            "llm_calls_avoided": needing_llm - counts["escalated"],
+            "llm_avoided_fraction": (needing_llm - counts["escalated"]) / needing_llm if needing_llm else 0.0
+        }
+
+    def _lookup_verdicts(self, claims: List[Dict[str, Any]]) -> Tuple[Dict[int, Dict[str, Any]], List[int]]:
+        """Split claims into cached verdicts ({claim index: verdict}) and indices of cache misses"""
+        cached = self.verdict_cache.get_many([claim["text"] for claim in claims])
+        misses = [index for index in range(len(claims)) if index not in cached]
+        return cached, misses
+
+    @staticmethod
+    def _format_claims(claims: List[Dict[str, Any]], indices: List[int]) -> str:
+        """Claims as a JSON list; the id (claim index + 1) is stable across batches"""
+        return json.dumps([{"id": index + 1, "claim": claims[index]["text"]} for index in indices], indent=1)
+
+    def _build_fact_check_prompt(self) -> PromptTemplate:
+        return PromptTemplate(
             input_variables=["claims"],
             template="""
             You are a fact-checker. Analyze the following claims for accuracy:
@@ -107,126 +314,135 @@ class FactualityAgent(BaseAgent):
             Rate each claim as: ACCURATE, QUESTIONABLE, or INACCURATE
             Provide reasoning for each rating.
             
-            Response format:
-            Claim 1: [RATING] - [Reasoning]
-            Claim 2: [RATING] - [Reasoning]
+            Respond with JSON only, one verdict per claim, using the claim ids given above:
+            {{"verdicts": [{{"id": 1, "rating": "ACCURATE", "reasoning": "..."}}]}}
             """
         )
 
-        # chain = LLMChain(llm=self.llm, prompt=fact_check_prompt)
-        runnable = fact_check_prompt | self.llm
-        if claims:
-            # fact_check_response = chain.run(claims="\n".join(claims))
-            fact_check_response = runnable.invoke(
-                {"claims": "\n".join(claims)})
-            return {
-                "claims_found": len(claims),
-                "analysis": fact_check_response,
-                "flagged_claims": self._parse_flagged_claims(fact_check_response)
-            }
-                
-        else:
+    def _summarize_fact_check(
+        self,
+        claims: List[Dict[str, Any]],
+        cached: Dict[int, Dict[str, Any]],
+        misses: List[int],
+        escalated: List[int],
+        outcome: str,
+        batches: List[List[int]],
+        replies: List[str]
+    ) -> Dict[str, Any]:
+        """Merge cached and freshly parsed verdicts into fact-check results"""
+        if not claims:
             return {
                 "claims_found": 0,
                 "analysis": "No specific factual claims detected",
                 "flagged_claims": []
             }
 
-    def _extract_claims(self, content: str) -> List[str]:
-        """Extract potential factual claims from content"""
-        # Simple pattern matching for claims
-        patterns = [
-            # Existing patterns
-            r"(\d+% of .+)",  # Percentage claims
-            r"(studies show .+)",  # Research claims
-            r"(according to .+)",  # Attribution claims
-            r"(research indicates .+)",  # Research claims
-
-            # Statistical and numerical claims
-            r"(\d+ out of \d+ .+)",  # Ratio claims
-            r"(\d+x more .+)",  # Multiplier claims
-            r"(up to \d+% .+)",  # Range percentage claims
-            r"(over \d+.+ .+)",  # "Over X" claims
-            r"(more than \d+ .+)",  # "More than X" claims
-            r"(\d+ times .+)",  # "X times" claims
-            r"(nearly \d+% .+)",  # "Nearly X%" claims
-            r"(approximately \d+ .+)",  # Approximation claims
-
-            # Expert and authority claims
-            r"(experts say .+)",  # Expert opinions
-            r"(scientists found .+)",  # Scientific findings
-            r"(researchers discovered .+)",  # Research discoveries
-            r"(data shows .+)",  # Data-based claims
-            r"(analysis reveals .+)",  # Analysis results
-            r"(survey found .+)",  # Survey results
-            r"(report shows .+)",  # Report findings
-            r"(clinical trials .+)",  # Medical research
-            r"(peer-reviewed .+)",  # Academic validation
-
-            # Temporal and trend claims
-            r"(in recent years .+)",  # Time-based claims
-            r"(latest research .+)",  # Recent findings
-            r"(new study .+)",  # New research
-            r"(recent data .+)",  # Recent information
-            r"(breakthrough study .+)",  # Significant research
-
-            # Comparative claims
-            r"(compared to .+)",  # Comparison statements
-            r"(better than .+)",  # Superior claims
-            r"(faster than .+)",  # Speed comparisons
-            r"(more effective than .+)",  # Effectiveness claims
-            r"(proven to be .+)",  # Proof claims
-
-            # Certainty and probability
-            r"(proven fact .+)",  # Certainty claims
-            r"(guaranteed to .+)",  # Guarantee statements
-            r"(scientifically proven .+)",  # Scientific validation
-            r"(clinically proven .+)",  # Medical validation
-            r"(evidence suggests .+)",  # Evidence-based claims
-            r"(shown to .+)",  # Demonstration claims
-
-            # Source attribution
-            r"(published in .+)",  # Publication references
-            r"(featured in .+)",  # Media mentions
-            r"(as reported by .+)",  # Media attribution
-            r"(cited by .+)",  # Citation references
-            r"(recommended by .+)",  # Endorsement claims
-
-            # Health and medical claims
-            r"(doctors recommend .+)",  # Medical recommendations
-            r"(fda approved .+)",  # Regulatory approval
-            r"(clinically tested .+)",  # Testing claims
-            r"(medical professionals .+)",  # Professional opinions
-
-            # Business and market claims
-            r"(market leader .+)",  # Market position
-            r"(industry standard .+)",  # Standard claims
-            r"(award-winning .+)",  # Recognition claims
-            r"(bestselling .+)",  # Sales claims
-            r"(top-rated .+)",  # Rating claims
-
-            # User and customer claims
-            r"(customers report .+)",  # Customer feedback
-            r"(users experience .+)",  # User experience
-            r"(testimonials show .+)",  # Testimonial claims
-            r"(reviews indicate .+)",  # Review-based claims
-
-            # Superlative and absolute claims
-            r"(world's first .+)",  # Innovation claims
-            r"(only .+ that .+)",  # Exclusivity claims
-            r"(never before .+)",  # Novelty claims
-            r"(revolutionary .+)",  # Revolutionary claims
-            r"(breakthrough .+)",  # Breakthrough claims
-            r"(cutting-edge .+)",  # Technology claims
+        # Verdicts are keyed by claim index, so the merge does not depend on batch completion order
+        verdicts = dict(cached)
+        unrated = {}
+        errors = []
+        for batch, reply in zip(batches, replies):
+            if isinstance(reply, BaseException):
+                errors.append(reply)
+                continue
+            ratings = self._parse_verdicts(reply, batch)
+            for index in batch:
+                verdict = ratings.get(index)
+                if verdict is None:
+                    # A claim the reply gave no usable verdict for is unverified, never accurate
+                    unrated[index] = {"rating": "QUESTIONABLE", "reasoning": "No verdict in the fact-check reply"}
+                    continue
+                verdicts[index] = verdict
+                self.verdict_cache.set(claims[index]["text"], verdict)
+        if errors:
+            # The verdicts of the batches that succeeded are cached, so a retry only re-checks the rest
+            raise errors[0]
+        verdicts.update(unrated)
+
+        flagged_claims = [
+            f"{verdicts[index]['rating']}: \"{claims[index]['text']}\" - {verdicts[index]['reasoning']}"
+            for index in sorted(verdicts)
+            if verdicts[index]["rating"] != "ACCURATE"
         ]
 
-        claims = []
-        for pattern in patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                claims.append(match.group(1))
+        if replies:
+            analysis = "\n".join(replies)
+        elif outcome == "cached":
+            analysis = "All claims answered from the verdict cache"
+        else:
+            analysis = f"Fact-check LLM skipped ({outcome}); {len(misses)} claims not verified"
+
+        return {
+            "claims_found": len(claims),
+            "claim_categories": self._count_categories(claims),
+            "analysis": analysis,
+            "flagged_claims": flagged_claims,
+            "cache": {"hits": len(cached), "misses": len(misses)},
+            "cascade": {"outcome": outcome, "escalated_claims": len(escalated),
+                        "unverified_claims": len(misses) - len(escalated)},
+            "llm": {"batches": len(batches), "unrated_claims": len(unrated)}
+        }
 
-        return claims
+    def _parse_verdicts(self, reply: str, batch: List[int]) -> Dict[int, Dict[str, str]]:
+        """
+        Parse a batch reply into {claim index: verdict}. Expects the JSON
+        format from the prompt and falls back to 'Claim N: RATING - reasoning'
+        lines. Ids outside the batch and duplicates after the first are ignored.
+        """
+        expected = set(batch)
+        ratings = {}
+        for claim_id, rating, reasoning in self._parse_json_verdicts(reply) or self._parse_claim_ratings(reply):
+            index = claim_id - 1
+            rating = str(rating).upper()
+            if index in expected and index not in ratings and rating in FACT_CHECK_RATINGS:
+                ratings[index] = {"rating": rating, "reasoning": str(reasoning or "").strip()}
+        return ratings
+
+    @staticmethod
+    def _parse_json_verdicts(reply: str) -> List[Tuple[int, str, str]]:
+        """(id, rating, reasoning) for each verdict in a JSON reply; [] if the reply is not valid JSON"""
+        for pattern in _JSON_BLOCKS:
+            match = pattern.search(reply)
+            if not match:
+                continue
+            try:
+                data = json.loads(match.group(0))
+                break
+            except ValueError:
+                continue
+        else:
+            return []
+        items = data.get("verdicts", []) if isinstance(data, dict) else data
+        verdicts = []
+        for item in items if isinstance(items, list) else []:
+            try:
+                verdicts.append((int(item["id"]), item["rating"], item.get("reasoning", "")))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+        return verdicts
+
+    @staticmethod
+    def _parse_claim_ratings(reply: str) -> List[Tuple[int, str, str]]:
+        """(id, rating, reasoning) for each 'Claim N: RATING - reasoning' line"""
+        return [(int(match.group(1)), match.group(2), match.group(3))
+                for match in map(_RATING_LINE.search, reply.split('\n')) if match]
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Verdict cache counters (hits, misses, estimated tokens saved)"""
+        return self.verdict_cache.get_stats()
+
+    @staticmethod
+    def _count_categories(claims: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Number of claims tagged with each category"""
+        counts: Dict[str, int] = {}
+        for claim in claims:
+            for category in claim["categories"]:
+                counts[category] = counts.get(category, 0) + 1
+        return counts
+
+    def _extract_claims(self, content: str) -> List[str]:
+        """Extract potential factual claims from content"""
+        return [claim["text"] for claim in self.claim_extractor.extract(content)]
 
     def _check_compliance(self, content: str) -> Dict[str, Any]:
         """Check content for regulatory compliance"""
@@ -253,16 +469,6 @@ class FactualityAgent(BaseAgent):
             "status": "compliant" if len(violations) == 0 else "non-compliant"
         }
 
-    def _parse_flagged_claims(self, analysis: str) -> List[str]:
-        """Parse flagged claims from fact-check analysis"""
-        flagged = []
-        lines = analysis.content.split('\n')
-        for line in lines:
-            if 'QUESTIONABLE' in line or 'INACCURATE' in line:
-                flagged.append(line.strip())
-
-        return flagged
-
     def _calculate_factuality_score(self, fact_check: Dict, compliance: Dict) -> float:
         """Calculate overall factuality score"""
         fact_score = 1.0 - (len(fact_check.get("flagged_claims", [])) * 0.3)
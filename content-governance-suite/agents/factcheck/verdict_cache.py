@@ -0,0 +1,187 @@
+# agents/factcheck/verdict_cache.py
+
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Rough characters-per-token ratio used to estimate LLM tokens saved by hits
+CHARS_PER_TOKEN = 4
+
+
+class ClaimVerdictCache:
+    """
+    Two-tier cache of fact-check verdicts keyed by normalized claim text.
+
+    The in-memory tier is an LRU map bounded by ``max_memory_entries``; the
+    on-disk tier is a SQLite table shared by every process using the same
+    file. Entries in both tiers expire after ``ttl_seconds``. Disk hits are
+    promoted into memory.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_memory_entries: int = 10000,
+        max_disk_entries: int = 500000,
+        clock: Callable[[], float] = time.time
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._clock = clock
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = self._open_disk_tier(path) if path else None
+        self._writes_since_prune = 0
+
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "prompt_tokens_saved": 0,
+            "completion_tokens_saved": 0
+        }
+
+    @staticmethod
+    def normalize_claim(claim: str) -> str:
+        """Lower-case, collapse whitespace and drop surrounding punctuation."""
+        text = re.sub(r"\s+", " ", claim.lower()).strip()
+        return text.strip(" \"'“”‘’.,;:!?")
+
+    @classmethod
+    def key_for(cls, claim: str) -> str:
+        return hashlib.sha256(cls.normalize_claim(claim).encode("utf-8")).hexdigest()
+
+    def _open_disk_tier(self, path: str) -> sqlite3.Connection:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS claim_verdicts (
+                key TEXT PRIMARY KEY,
+                claim TEXT NOT NULL,
+                verdict TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("DELETE FROM claim_verdicts WHERE expires_at <= ?", (self._clock(),))
+        conn.commit()
+        return conn
+
+    def get(self, claim: str) -> Optional[Dict[str, Any]]:
+        """Return the cached verdict for a claim, or None."""
+        key = self.key_for(claim)
+        now = self._clock()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, verdict = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._record_hit("memory_hits", claim, verdict)
+                    return verdict
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT verdict, expires_at FROM claim_verdicts WHERE key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+                if row is not None:
+                    verdict = json.loads(row[0])
+                    self._conn.execute("UPDATE claim_verdicts SET last_used = ? WHERE key = ?", (now, key))
+                    self._conn.commit()
+                    self._remember(key, verdict, row[1])
+                    self._record_hit("disk_hits", claim, verdict)
+                    return verdict
+
+            self._stats["misses"] += 1
+            return None
+
+    def get_many(self, claims: List[str]) -> Dict[int, Dict[str, Any]]:
+        """Look up several claims; returns {claim index: verdict} for the hits."""
+        hits = {}
+        for index, claim in enumerate(claims):
+            verdict = self.get(claim)
+            if verdict is not None:
+                hits[index] = verdict
+        return hits
+
+    def set(self, claim: str, verdict: Dict[str, Any]):
+        """Store a verdict in both tiers."""
+        key = self.key_for(claim)
+        now = self._clock()
+        expires_at = now + self.ttl_seconds
+
+        with self._lock:
+            self._remember(key, verdict, expires_at)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO claim_verdicts (key, claim, verdict, expires_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, self.normalize_claim(claim), json.dumps(verdict), expires_at, now)
+                )
+                self._conn.commit()
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= 1000:
+                    self._prune_disk_tier(now)
+
+    def _remember(self, key: str, verdict: Dict[str, Any], expires_at: float):
+        self._memory[key] = (expires_at, verdict)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _prune_disk_tier(self, now: float):
+        """Drop expired rows, then the least recently used rows beyond the size cap."""
+        self._writes_since_prune = 0
+        self._conn.execute("DELETE FROM claim_verdicts WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM claim_verdicts WHERE key IN ("
+            "SELECT key FROM claim_verdicts ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+        self._conn.commit()
+
+    def _record_hit(self, tier: str, claim: str, verdict: Dict[str, Any]):
+        self._stats[tier] += 1
+        self._stats["prompt_tokens_saved"] += len(claim) // CHARS_PER_TOKEN + 1
+        self._stats["completion_tokens_saved"] += len(verdict.get("reasoning", "")) // CHARS_PER_TOKEN + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and an estimate of the LLM tokens the cache has saved."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["tokens_saved"] = stats["prompt_tokens_saved"] + stats["completion_tokens_saved"]
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM claim_verdicts")
+                self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -2,15 +2,17 @@
 
 from langchain_perplexity import ChatPerplexity
 from langchain.chains import RetrievalQA
-from langchain_community.vectorstores import FAISS
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-# from langchain.document_loaders import TextLoader
-from langchain_community.document_loaders import TextLoader
-from typing import Dict, Any, List
+from langchain_core.prompts import format_document
+from typing import Dict, Any, List, AsyncIterator
 from datetime import datetime
 import os
+import threading
+import time
 from ..base_agent import BaseAgent
+from ..rate_limiter import provider_limits
+from .knowledge_base import KnowledgeBase
+from .embedding_cache import CachedEmbeddings
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -27,17 +29,29 @@ class ContentGeneratorAgent(BaseAgent):
             temperature=0.7,
             api_key=os.getenv("PPLX_API_KEY")  # Use api_key parameter
         )
+        self.llm_provider = "perplexity"
 
-        # Initialize a local, open-source embeddings model
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
+        # Initialize a local, open-source embeddings model behind an LRU cache
+        self.embeddings = CachedEmbeddings(
+            HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2"),
+            max_entries=int(self.config.get(
+                "embedding_cache_size", os.getenv("EMBEDDING_CACHE_SIZE", 10000)))
         )
 
-        self.knowledge_base = None
+        # The RetrievalQA chain is built once and reused across requests
+        self._qa_chain = None
+        self._chain_lock = threading.Lock()
+
+        # Persistent FAISS index: loaded from disk, only new or changed guidelines are embedded
+        self.knowledge_base = KnowledgeBase(
+            self.embeddings,
+            index_dir=self.config.get(
+                "knowledge_base_dir", os.getenv("KNOWLEDGE_BASE_DIR", ".cache/knowledge_base"))
+        )
         self._setup_knowledge_base()
 
     def _setup_knowledge_base(self):
-        """Initialize RAG knowledge base"""
+        """Load the RAG knowledge base, seeding it with the default guidelines"""
         try:
             sample_docs = [
                 "Content should be engaging and informative.",
@@ -46,68 +60,182 @@ class ContentGeneratorAgent(BaseAgent):
                 "Include relevant examples and case studies when possible."
             ]
 
-            docs = []
-            for i, doc in enumerate(sample_docs):
-                with open(f"temp_doc_{i}.txt", "w") as f:
-                    f.write(doc)
-                docs.append(f"temp_doc_{i}.txt")
-
-            documents = []
-            for doc_path in docs:
-                loader = TextLoader(doc_path)
-                documents.extend(loader.load())
-
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000, chunk_overlap=200)
-            splits = text_splitter.split_documents(documents)
-            
-            self.knowledge_base = FAISS.from_documents(splits, self.embeddings)
-            
-            for doc_path in docs:
-                if os.path.exists(doc_path):
-                    os.remove(doc_path)
+            # Unchanged documents are skipped by content hash, so this is cheap after the first run
+            stats = self.knowledge_base.add_documents([
+                {"id": f"default-guideline-{i}", "text": doc}
+                for i, doc in enumerate(sample_docs)
+            ])
+
+            source_dir = self.config.get(
+                "knowledge_base_source_dir", os.getenv("KNOWLEDGE_BASE_SOURCE_DIR"))
+            if source_dir and os.path.isdir(source_dir):
+                dir_stats = self.knowledge_base.ingest_directory(source_dir)
+                stats = {key: stats.get(key, 0) + dir_stats.get(key, 0)
+                         for key in set(stats) | set(dir_stats)}
+
+            if stats["added"] or stats["updated"] or stats.get("removed"):
+                self.knowledge_base.save()
+            self.log_activity("Knowledge base ready", stats)
 
         except Exception as e:
             self.log_activity(
                 "Error setting up knowledge base", {"error": str(e)})
 
+    def ingest_guidelines(self, documents: List[Dict[str, Any]] = None,
+                          remove_ids: List[str] = None) -> Dict[str, Any]:
+        """Add, update or remove guideline documents and persist the index"""
+        stats = self.knowledge_base.add_documents(documents or [])
+        stats["removed"] = self.knowledge_base.remove_documents(remove_ids or [])
+        if stats["added"] or stats["updated"] or stats["removed"]:
+            self.knowledge_base.save()
+            # The first ingest into an empty knowledge base creates the vector store
+            self._qa_chain = None
+        self.log_activity("Guidelines ingested", stats)
+        return {**stats, "knowledge_base": self.knowledge_base.get_stats()}
+
     def process(self, content_request: Dict[str, Any]) -> Dict[str, Any]:
         """Generate content based on the request"""
         try:
             self.log_activity("Starting content generation", content_request)
 
             topic = content_request.get("topic", "")
+            qa_chain = self.qa_chain
+            timings = {}
+
+            # Same steps as RetrievalQA.invoke, split so each stage can be timed
+            started = time.perf_counter()
+            documents = qa_chain.retriever.invoke(topic)
+            timings["retrieve_ms"] = (time.perf_counter() - started) * 1000
+
+            timings["rate_limit_wait_ms"] = provider_limits.acquire(self.llm_provider) * 1000
+            started = time.perf_counter()
+            response = qa_chain.combine_documents_chain.invoke(
+                {"input_documents": documents, "question": topic})
+            timings["llm_ms"] = (time.perf_counter() - started) * 1000
+            generated_content = response.get("output_text", "")
+
+            return self._build_result(content_request, generated_content, timings)
+
+        except Exception as e:
+            self.log_activity("Content generation failed", {"error": str(e)})
+            return {"content": None, "error": str(e), "status": "failed"}
+
+    async def aprocess(self, content_request: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate content using the async LLM client"""
+        try:
+            self.log_activity("Starting content generation", content_request)
+
+            topic = content_request.get("topic", "")
+            qa_chain = self.qa_chain
+            timings = {}
 
-            # Use a RetrievalQA chain for RAG
-            qa_chain = RetrievalQA.from_chain_type(
-                llm=self.llm,
-                chain_type="stuff",
-                retriever=self.knowledge_base.as_retriever()
-            )
-            # Invoke the chain with the topic as the query
-            response = qa_chain.invoke(topic)
-            generated_content = response.get("result", "")
-
-            result = {
-                "content": generated_content,
-                "metadata": {
-                    "content_type": content_request.get("type", "blog_post"),
-                    "topic": topic,
-                    "agent_id": self.agent_id,
-                    "generation_timestamp": datetime.now().isoformat()
-                },
-                "status": "generated",
-                "quality_score": self._calculate_quality_score(generated_content)
-            }
-
-            self.log_activity("Content generation completed", {
-                              "content_length": len(generated_content)})
-            return result
+            started = time.perf_counter()
+            documents = await qa_chain.retriever.ainvoke(topic)
+            timings["retrieve_ms"] = (time.perf_counter() - started) * 1000
+
+            timings["rate_limit_wait_ms"] = await provider_limits.aacquire(self.llm_provider) * 1000
+            started = time.perf_counter()
+            response = await qa_chain.combine_documents_chain.ainvoke(
+                {"input_documents": documents, "question": topic})
+            timings["llm_ms"] = (time.perf_counter() - started) * 1000
+            generated_content = response.get("output_text", "")
+
+            return self._build_result(content_request, generated_content, timings)
 
         except Exception as e:
             self.log_activity("Content generation failed", {"error": str(e)})
             return {"content": None, "error": str(e), "status": "failed"}
 
+    async def astream(self, content_request: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream content generation. Yields ``{"type": "token", "content": ...}``
+        for each LLM chunk as it arrives, then one ``{"type": "generated",
+        "data": result}`` event carrying the same result ``aprocess`` returns.
+        """
+        try:
+            self.log_activity("Starting content generation (streaming)", content_request)
+
+            topic = content_request.get("topic", "")
+            stuff_chain = self.qa_chain.combine_documents_chain
+            timings = {}
+
+            started = time.perf_counter()
+            documents = await self.qa_chain.retriever.ainvoke(topic)
+            timings["retrieve_ms"] = (time.perf_counter() - started) * 1000
+
+            # Build the same prompt the "stuff" chain would, then stream the LLM directly
+            context = stuff_chain.document_separator.join(
+                format_document(document, stuff_chain.document_prompt) for document in documents)
+            prompt = stuff_chain.llm_chain.prompt.format_prompt(
+                **{stuff_chain.document_variable_name: context, "question": topic})
+
+            timings["rate_limit_wait_ms"] = await provider_limits.aacquire(self.llm_provider) * 1000
+            started = time.perf_counter()
+            parts = []
+            async for chunk in self.llm.astream(prompt):
+                if not chunk.content:
+                    continue
+                if not parts:
+                    timings["first_token_ms"] = (time.perf_counter() - started) * 1000
+                parts.append(chunk.content)
+                yield {"type": "token", "content": chunk.content}
+            timings["llm_ms"] = (time.perf_counter() - started) * 1000
+
+            yield {"type": "generated", "data": self._build_result(content_request, "".join(parts), timings)}
+
+        except Exception as e:
+            self.log_activity("Content generation failed", {"error": str(e)})
+            yield {"type": "generated", "data": {"content": None, "error": str(e), "status": "failed"}}
+
+    @property
+    def qa_chain(self) -> RetrievalQA:
+        """RetrievalQA chain for RAG, built on first use"""
+        if self._qa_chain is None:
+            with self._chain_lock:
+                if self._qa_chain is None:
+                    self._qa_chain = RetrievalQA.from_chain_type(
+                        llm=self.llm,
+                        chain_type="stuff",
+                        retriever=self.knowledge_base.as_retriever()
+                    )
+        return self._qa_chain
+
+    def embed_topics(self, topics: List[str]) -> int:
+        """
+        Embed a bulk list of topics in one batched call so the retrieval step
+        of each later request is a cache hit. Returns the number of topics.
+        """
+        self.embeddings.embed_queries(topics)
+        return len(topics)
+
+    def get_embedding_cache_stats(self) -> Dict[str, Any]:
+        return self.embeddings.get_stats()
+
+    def _build_result(self, content_request: Dict[str, Any], generated_content: str,
+                      timings: Dict[str, float] = None) -> Dict[str, Any]:
+        """Assemble the generator output returned to the pipeline"""
+        timings = dict(timings or {})
+        started = time.perf_counter()
+        quality_score = self._calculate_quality_score(generated_content)
+        timings["scoring_ms"] = (time.perf_counter() - started) * 1000
+
+        result = {
+            "content": generated_content,
+            "metadata": {
+                "content_type": content_request.get("type", "blog_post"),
+                "topic": content_request.get("topic", ""),
+                "agent_id": self.agent_id,
+                "generation_timestamp": datetime.now().isoformat(),
+                "timings": timings
+            },
+            "status": "generated",
+            "quality_score": quality_score
+        }
+
+        self.log_activity("Content generation completed", {
+                          "content_length": len(generated_content)})
+        return result
+
     def _calculate_quality_score(self, content: str) -> float:
         """Calculate a basic quality score for the generated content"""
         score = 0.0
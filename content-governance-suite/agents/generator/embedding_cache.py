@@ -0,0 +1,109 @@
+# agents/generator/embedding_cache.py
+
+from langchain_core.embeddings import Embeddings
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+import hashlib
+import threading
+import unicodedata
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC unicode, collapsed whitespace."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    LRU cache in front of an embeddings model.
+
+    Keys are sha256 hashes of the normalized text, so repeated topics and
+    re-ingested guideline chunks are embedded once. Misses from a single
+    ``embed_documents`` call are de-duplicated and embedded in one batch.
+
+    With ``symmetric=True`` (the default, correct for sentence-transformers
+    models such as all-MiniLM-L6-v2 that encode queries and documents the
+    same way) queries and documents share cache entries and lists of queries
+    can be embedded in one batch. Otherwise they are cached separately.
+    """
+
+    def __init__(self, underlying: Embeddings, max_entries: int = 10000, symmetric: bool = True):
+        self.underlying = underlying
+        self.max_entries = max_entries
+        self.symmetric = symmetric
+
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _key(self, text: str, kind: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return digest if self.symmetric else f"{kind}:{digest}"
+
+    def _get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is None:
+                self._misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return vector
+
+    def _put(self, key: str, vector: List[float]):
+        with self._lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _embed_many(self, texts: List[str], kind: str) -> List[List[float]]:
+        keys = [self._key(text, kind) for text in texts]
+        vectors = [self._get(key) for key in keys]
+
+        # One batched call for the distinct misses
+        missing: Dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = text
+        if missing:
+            if kind == "document" or self.symmetric:
+                embedded = self.underlying.embed_documents(list(missing.values()))
+            else:
+                embedded = [self.underlying.embed_query(text) for text in missing.values()]
+            computed = dict(zip(missing, embedded))
+            for key, vector in computed.items():
+                self._put(key, vector)
+            vectors = [vector if vector is not None else computed[key] for key, vector in zip(keys, vectors)]
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed_many(texts, "document")
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text, "query")
+        vector = self._get(key)
+        if vector is None:
+            vector = self.underlying.embed_query(text)
+            self._put(key, vector)
+        return vector
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of queries, batching the misses (used to warm bulk topic lists)."""
+        return self._embed_many(texts, "query")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._cache),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,296 @@
+# agents/generator/knowledge_base.py
+
+from langchain_community.vectorstores import FAISS
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from typing import Dict, Any, List, Optional, Set, Tuple
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "index.pkl"
+MANIFEST_FILE = "manifest.json"
+INGESTABLE_EXTENSIONS = (".txt", ".md")
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _read_faiss_index(path: str, mmap: bool) -> Tuple[Any, bool]:
+    """Read a FAISS index, memory-mapping it read-only when the build supports it."""
+    import faiss
+
+    if mmap:
+        for flag_name in ("IO_FLAG_MMAP_IFC", "IO_FLAG_MMAP"):
+            flag = getattr(faiss, flag_name, None)
+            if flag is None:
+                continue
+            try:
+                return faiss.read_index(path, flag | faiss.IO_FLAG_READ_ONLY), True
+            except RuntimeError:
+                continue
+    return faiss.read_index(path), False
+
+
+class KnowledgeBaseRetriever(BaseRetriever):
+    """Retriever over a KnowledgeBase that always searches its current index under its lock."""
+
+    knowledge_base: Any
+    search_kwargs: Dict[str, Any] = {}
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return self.knowledge_base.similarity_search(query, **self.search_kwargs)
+
+
+class KnowledgeBase:
+    """
+    Persistent FAISS knowledge base with incremental updates.
+
+    Documents are ingested straight from memory (or read from a directory),
+    split into chunks, and every chunk is identified by the hash of its text.
+    Only chunks whose hash is not already in the index get embedded, and
+    chunks no document references any more are deleted, so re-ingesting an
+    edited document re-embeds just the changed content. The index, docstore
+    and a manifest of document -> chunk hashes are saved to ``index_dir`` and
+    loaded (memory-mapped where FAISS supports it) on startup. FAISS does not
+    allow searches during writes, so searches take the same lock as updates.
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        index_dir: str,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        mmap: bool = True
+    ):
+        self.embeddings = embeddings
+        self.index_dir = index_dir
+        self.mmap = mmap
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+        self.vectorstore: Optional[FAISS] = None
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self._chunk_refs: Dict[str, Set[str]] = {}
+        self._read_only = False
+        self._lock = threading.RLock()
+
+        self.load()
+
+    # ------------------------------------------------------------------ storage
+
+    def load(self) -> bool:
+        """Load the saved index; returns False when nothing has been saved yet."""
+        index_path = os.path.join(self.index_dir, INDEX_FILE)
+        docstore_path = os.path.join(self.index_dir, DOCSTORE_FILE)
+        manifest_path = os.path.join(self.index_dir, MANIFEST_FILE)
+        if not all(os.path.exists(p) for p in (index_path, docstore_path, manifest_path)):
+            return False
+
+        with self._lock:
+            index, self._read_only = _read_faiss_index(index_path, self.mmap)
+            # The docstore pickle is written by save() below, never by a client
+            with open(docstore_path, "rb") as f:
+                docstore, index_to_docstore_id = pickle.load(f)
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+
+            self.vectorstore = FAISS(
+                embedding_function=self.embeddings,
+                index=index,
+                docstore=docstore,
+                index_to_docstore_id=index_to_docstore_id
+            )
+            self.documents = manifest.get("documents", {})
+            self._rebuild_chunk_refs()
+        return True
+
+    def save(self):
+        """Write index, docstore and manifest atomically (file by file) to index_dir."""
+        with self._lock:
+            os.makedirs(self.index_dir, exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=".staging-", dir=self.index_dir)
+            try:
+                if self.vectorstore is not None:
+                    # Writes index.faiss and index.pkl
+                    self.vectorstore.save_local(staging)
+                with open(os.path.join(staging, MANIFEST_FILE), "w") as f:
+                    json.dump({"version": 1, "documents": self.documents}, f)
+                # Replacing (rather than overwriting) keeps any memory-mapped
+                # copy of the old index valid for readers in other processes
+                for name in os.listdir(staging):
+                    os.replace(os.path.join(staging, name), os.path.join(self.index_dir, name))
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _rebuild_chunk_refs(self):
+        self._chunk_refs = {}
+        for doc_id, entry in self.documents.items():
+            for chunk_id in entry["chunk_ids"]:
+                self._chunk_refs.setdefault(chunk_id, set()).add(doc_id)
+
+    def _ensure_writable(self):
+        """Swap a read-only memory-mapped index for an in-memory copy before mutating it."""
+        if self._read_only and self.vectorstore is not None:
+            import faiss
+            # clone_index would keep pointing at the read-only mapping; a
+            # serialized round trip gives an index that owns its vectors
+            self.vectorstore.index = faiss.deserialize_index(faiss.serialize_index(self.vectorstore.index))
+            self._read_only = False
+
+    # ---------------------------------------------------------------- ingestion
+
+    def add_documents(self, documents: List[Dict[str, Any]], directory: str = None) -> Dict[str, int]:
+        """
+        Add or update documents given as ``{"id", "text", "metadata"}`` dicts.
+
+        Documents whose content hash is unchanged are skipped; for changed
+        documents only chunks that are new to the index are embedded.
+        """
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "chunks_embedded": 0, "chunks_removed": 0}
+        new_chunks: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        orphan_candidates: Set[str] = set()
+
+        with self._lock:
+            for document in documents:
+                text = document["text"]
+                doc_hash = content_hash(text)
+                doc_id = document.get("id") or doc_hash
+                existing = self.documents.get(doc_id)
+                if existing is not None and existing["content_hash"] == doc_hash:
+                    stats["unchanged"] += 1
+                    continue
+
+                chunk_ids = []
+                for chunk in self.text_splitter.split_text(text):
+                    chunk_id = content_hash(chunk)
+                    chunk_ids.append(chunk_id)
+                    if chunk_id not in self._chunk_refs and chunk_id not in new_chunks:
+                        metadata = dict(document.get("metadata") or {}, source=doc_id)
+                        new_chunks[chunk_id] = (chunk, metadata)
+
+                if existing is not None:
+                    orphan_candidates.update(existing["chunk_ids"])
+                    for chunk_id in existing["chunk_ids"]:
+                        self._chunk_refs.get(chunk_id, set()).discard(doc_id)
+                    stats["updated"] += 1
+                else:
+                    stats["added"] += 1
+
+                self.documents[doc_id] = {
+                    "content_hash": doc_hash,
+                    "chunk_ids": chunk_ids,
+                    "directory": directory
+                }
+                for chunk_id in chunk_ids:
+                    self._chunk_refs.setdefault(chunk_id, set()).add(doc_id)
+
+            if new_chunks:
+                self._embed_chunks(new_chunks)
+                stats["chunks_embedded"] = len(new_chunks)
+            stats["chunks_removed"] = self._delete_orphans(orphan_candidates)
+        return stats
+
+    def add_texts(self, texts: List[str], ids: List[str] = None) -> Dict[str, int]:
+        """Convenience wrapper around add_documents for plain strings."""
+        ids = ids or [None] * len(texts)
+        return self.add_documents([{"id": doc_id, "text": text} for doc_id, text in zip(ids, texts)])
+
+    def ingest_directory(self, path: str, prune: bool = True) -> Dict[str, int]:
+        """
+        Ingest every .txt/.md file under ``path`` (ids are paths relative to it).
+        With ``prune``, documents previously ingested from this directory whose
+        files no longer exist are removed.
+        """
+        root = os.path.abspath(path)
+        documents = []
+        for dirpath, _, filenames in os.walk(root):
+            for filename in sorted(filenames):
+                if not filename.lower().endswith(INGESTABLE_EXTENSIONS):
+                    continue
+                file_path = os.path.join(dirpath, filename)
+                with open(file_path, encoding="utf-8") as f:
+                    text = f.read()
+                doc_id = os.path.relpath(file_path, root).replace(os.sep, "/")
+                documents.append({"id": doc_id, "text": text, "metadata": {"path": file_path}})
+
+        stats = self.add_documents(documents, directory=root)
+        if prune:
+            present = {document["id"] for document in documents}
+            stale = [
+                doc_id for doc_id, entry in self.documents.items()
+                if entry.get("directory") == root and doc_id not in present
+            ]
+            stats["removed"] = self.remove_documents(stale)
+        return stats
+
+    def remove_documents(self, ids: List[str]) -> int:
+        """Remove documents by id, deleting chunks no other document shares."""
+        with self._lock:
+            orphan_candidates: Set[str] = set()
+            removed = 0
+            for doc_id in ids:
+                entry = self.documents.pop(doc_id, None)
+                if entry is None:
+                    continue
+                removed += 1
+                for chunk_id in entry["chunk_ids"]:
+                    self._chunk_refs.get(chunk_id, set()).discard(doc_id)
+                    orphan_candidates.add(chunk_id)
+            self._delete_orphans(orphan_candidates)
+        return removed
+
+    def _embed_chunks(self, chunks: Dict[str, Tuple[str, Dict[str, Any]]]):
+        chunk_ids = list(chunks)
+        texts = [chunks[chunk_id][0] for chunk_id in chunk_ids]
+        metadatas = [chunks[chunk_id][1] for chunk_id in chunk_ids]
+        if self.vectorstore is None:
+            self.vectorstore = FAISS.from_texts(texts, self.embeddings, metadatas=metadatas, ids=chunk_ids)
+        else:
+            self._ensure_writable()
+            self.vectorstore.add_texts(texts, metadatas=metadatas, ids=chunk_ids)
+
+    def _delete_orphans(self, candidates: Set[str]) -> int:
+        orphans = [chunk_id for chunk_id in candidates if not self._chunk_refs.get(chunk_id)]
+        for chunk_id in orphans:
+            self._chunk_refs.pop(chunk_id, None)
+        if orphans and self.vectorstore is not None:
+            self._ensure_writable()
+            self.vectorstore.delete(orphans)
+        return len(orphans)
+
+    # ------------------------------------------------------------------ queries
+
+    def is_empty(self) -> bool:
+        return self.vectorstore is None or not self.documents
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs) -> List[Document]:
+        """Search the current index; the query is embedded before taking the lock."""
+        embedding = self.embeddings.embed_query(query)
+        with self._lock:
+            if self.vectorstore is None:
+                return []
+            return self.vectorstore.similarity_search_by_vector(embedding, k=k, **kwargs)
+
+    def as_retriever(self, search_kwargs: Dict[str, Any] = None) -> KnowledgeBaseRetriever:
+        if self.vectorstore is None:
+            raise RuntimeError("Knowledge base is empty; ingest documents first")
+        return KnowledgeBaseRetriever(knowledge_base=self, search_kwargs=search_kwargs or {})
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": len(self.documents),
+                "chunks": len(self._chunk_refs),
+                "memory_mapped": self._read_only,
+                "index_dir": os.path.abspath(self.index_dir)
+            }
@@ -0,0 +1,120 @@
+# agents/rate_limiter.py
+
+from typing import Dict, Any, Optional
+import asyncio
+import os
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from both threads and coroutines.
+
+    ``rate`` tokens are added per second up to ``capacity`` (the burst size).
+    Each acquire reserves its tokens immediately, letting the balance go
+    negative, and then waits until the reservation is covered. Callers are
+    therefore paced in arrival order whether they block (``acquire``) or await
+    (``aacquire``), and sync and async callers share one budget.
+    """
+
+    def __init__(self, rate: float, capacity: float = None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._clock = clock
+
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self._acquired = 0
+        self._delayed = 0
+        self._total_wait = 0.0
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserve tokens and return how many seconds the caller must wait."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            self._acquired += 1
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self.rate
+            self._delayed += 1
+            self._total_wait += wait
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until the tokens are available; returns the time waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: float = 1.0) -> float:
+        """Async variant of acquire."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.capacity,
+                "acquired": self._acquired,
+                "delayed": self._delayed,
+                "total_wait_seconds": round(self._total_wait, 4)
+            }
+
+
+class ProviderRateLimits:
+    """
+    One shared token bucket per LLM provider (e.g. "perplexity").
+
+    Limits come from ``RATE_LIMIT_<PROVIDER>_RPS`` and optional
+    ``RATE_LIMIT_<PROVIDER>_BURST`` or from ``configure``. Providers without a
+    configured rate are not limited.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, provider: str, rate: Optional[float], burst: float = None):
+        """Set (or with rate=None, remove) the limit of a provider."""
+        with self._lock:
+            self._buckets[provider] = TokenBucket(rate, burst) if rate else None
+
+    def get(self, provider: str) -> Optional[TokenBucket]:
+        if provider not in self._buckets:
+            with self._lock:
+                if provider not in self._buckets:
+                    prefix = f"RATE_LIMIT_{provider.upper()}"
+                    rate = float(os.getenv(f"{prefix}_RPS", 0) or 0)
+                    burst = float(os.getenv(f"{prefix}_BURST", 0) or 0)
+                    self._buckets[provider] = TokenBucket(rate, burst or None) if rate > 0 else None
+        return self._buckets[provider]
+
+    def acquire(self, provider: str) -> float:
+        bucket = self.get(provider)
+        return bucket.acquire() if bucket is not None else 0.0
+
+    async def aacquire(self, provider: str) -> float:
+        bucket = self.get(provider)
+        return await bucket.aacquire() if bucket is not None else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                provider: bucket.get_stats() if bucket is not None else {"status": "unlimited"}
+                for provider, bucket in self._buckets.items()
+            }
+
+
+# Global per-provider limits shared by every agent in the process
+provider_limits = ProviderRateLimits()
@@ -0,0 +1,130 @@
+# agents/registry.py
+
+from typing import Dict, Any, Callable, List
+import asyncio
+import threading
+import time
+
+from .base_agent import BaseAgent
+
+
+def _content_generator() -> BaseAgent:
+    from .generator.content_generator import ContentGeneratorAgent
+    return ContentGeneratorAgent()
+
+
+def _factuality() -> BaseAgent:
+    from .factcheck.factuality_agent import FactualityAgent
+    return FactualityAgent()
+
+
+def _style_analyzer() -> BaseAgent:
+    from .sentiment.style_analyzer import StyleAnalyzerAgent
+    return StyleAnalyzerAgent()
+
+
+def _multimodal_reviewer() -> BaseAgent:
+    from .multimodal.multimodal_reviewer import MultimodalReviewerAgent
+    return MultimodalReviewerAgent()
+
+
+def _consensus() -> BaseAgent:
+    from .consensus.consensus_agent import ConsensusAgent
+    return ConsensusAgent()
+
+
+class AgentRegistry:
+    """
+    Process-wide registry that builds each agent on first use and shares the
+    instance with every caller (API endpoints, workflows, workers).
+
+    Agent modules are imported inside the factories, so importing the registry
+    does not pull in langchain, transformers or torch.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], BaseAgent]] = {}
+        self._instances: Dict[str, BaseAgent] = {}
+        self._load_times: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], BaseAgent]):
+        """Register (or replace) the factory used to build an agent."""
+        with self._registry_lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.Lock())
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> BaseAgent:
+        """Return the shared agent, building it on first access."""
+        agent = self._instances.get(name)
+        if agent is not None:
+            return agent
+
+        if name not in self._factories:
+            raise KeyError(f"Unknown agent: {name}")
+
+        # One lock per agent so a slow model load does not block other agents
+        with self._locks[name]:
+            agent = self._instances.get(name)
+            if agent is None:
+                start = time.perf_counter()
+                agent = self._factories[name]()
+                self._load_times[name] = round(time.perf_counter() - start, 4)
+                self._instances[name] = agent
+        return agent
+
+    async def aget(self, name: str) -> BaseAgent:
+        """Async variant of get; a first-time build runs in the default executor."""
+        agent = self._instances.get(name)
+        if agent is not None:
+            return agent
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get, name)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def names(self) -> List[str]:
+        return list(self._factories)
+
+    def preload(self, names: List[str] = None):
+        """Eagerly build agents, e.g. to warm a worker before taking traffic."""
+        for name in names or self.names():
+            self.get(name)
+
+    def shutdown(self):
+        """Call ``shutdown()`` on every loaded agent that has one (worker threads, connections)."""
+        for name, agent in list(self._instances.items()):
+            shutdown = getattr(agent, "shutdown", None)
+            if callable(shutdown):
+                try:
+                    shutdown()
+                except Exception as e:
+                    print(f"Failed to shut down agent {name}: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        """Report which agents are loaded without triggering any loads."""
+        report = {}
+        for name in self.names():
+            agent = self._instances.get(name)
+            if agent is None:
+                report[name] = {"status": "not_loaded"}
+            else:
+                report[name] = {
+                    "agent_id": agent.agent_id,
+                    "status": "active",
+                    "created_at": agent.created_at.isoformat(),
+                    "load_time": self._load_times.get(name)
+                }
+        return report
+
+
+# Global agent registry
+agent_registry = AgentRegistry()
+agent_registry.register("content_generator", _content_generator)
+agent_registry.register("factuality", _factuality)
+agent_registry.register("style_analyzer", _style_analyzer)
+agent_registry.register("multimodal_reviewer", _multimodal_reviewer)
+agent_registry.register("consensus", _consensus)
@@ -0,0 +1,157 @@
+# agents/sentiment/batch_scheduler.py
+
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+import queue
+import threading
+import time
+
+
+class MicroBatchScheduler:
+    """
+    Shared inference scheduler that coalesces work from concurrent callers.
+
+    Callers submit items (e.g. text chunks) from any thread. A single worker
+    thread collects queued items and flushes them as one batch once
+    ``max_batch_size`` items are waiting or ``max_wait_ms`` has passed since
+    the oldest item arrived, then routes each result back to its caller's
+    future. While a batch is running, new items keep queueing, so batches
+    naturally fill up under load.
+    """
+
+    def __init__(
+        self,
+        infer_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "inference"
+    ):
+        self.infer_fn = infer_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._stopped = False
+        # Held across the stopped check and the puts, so no item can be queued
+        # behind the shutdown sentinel and never be answered
+        self._submit_lock = threading.Lock()
+
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._failed_batches = 0
+        self._inference_time = 0.0
+        self._recent_waits: deque = deque(maxlen=1000)
+
+    def submit(self, items: List[Any]) -> List[Future]:
+        """Queue items for inference; returns one future per item."""
+        futures = []
+        with self._submit_lock:
+            if self._stopped:
+                raise RuntimeError(f"{self.name} scheduler has been shut down")
+            self._ensure_worker()
+
+            now = time.perf_counter()
+            for item in items:
+                future = Future()
+                self._queue.put((item, future, now))
+                futures.append(future)
+        return futures
+
+    def infer(self, items: List[Any]) -> List[Any]:
+        """Submit items and block until all their results are available."""
+        return [future.result() for future in self.submit(items)]
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name=f"{self.name}-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            batch = [entry]
+            deadline = entry[2] + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self._flush(batch)
+                    return
+                batch.append(entry)
+
+            self._flush(batch)
+
+    def _flush(self, batch: List[tuple]):
+        started = time.perf_counter()
+        items = [item for item, _, _ in batch]
+        try:
+            results = self.infer_fn(items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"{self.name}: expected {len(items)} results, got {len(results)}"
+                )
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            failed = True
+        else:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+            failed = False
+
+        with self._metrics_lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._failed_batches += int(failed)
+            self._inference_time += time.perf_counter() - started
+            self._recent_waits.extend(started - enqueued for _, _, enqueued in batch)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Batch fill ratio, queue wait and inference time statistics."""
+        with self._metrics_lock:
+            batches, items = self._batches, self._items
+            waits = sorted(self._recent_waits)
+            inference_time = self._inference_time
+            failed = self._failed_batches
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p * len(waits)))] * 1000
+
+        return {
+            "batches": batches,
+            "items": items,
+            "failed_batches": failed,
+            "queue_depth": self._queue.qsize(),
+            "avg_batch_size": items / batches if batches else 0.0,
+            "batch_fill_ratio": items / (batches * self.max_batch_size) if batches else 0.0,
+            "avg_queue_wait_ms": (sum(waits) / len(waits) * 1000) if waits else 0.0,
+            "p95_queue_wait_ms": percentile(0.95),
+            "max_queue_wait_ms": waits[-1] * 1000 if waits else 0.0,
+            "avg_batch_inference_ms": inference_time / batches * 1000 if batches else 0.0
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker after it flushes everything already queued."""
+        with self._submit_lock:
+            if not self._stopped and self._worker is not None:
+                self._queue.put(None)
+            self._stopped = True
+        if wait and self._worker is not None:
+            self._worker.join()
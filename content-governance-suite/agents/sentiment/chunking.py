@@ -0,0 +1,76 @@
+# agents/sentiment/chunking.py
+
+from typing import List
+import re
+
+# Sentence boundaries: terminal punctuation followed by whitespace, or line breaks
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, dropping empty fragments"""
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+def chunk_text(text: str, tokenizer, max_tokens: int) -> List[str]:
+    """
+    Pack whole sentences into chunks of at most ``max_tokens`` model tokens.
+
+    Token counts come from the model's own tokenizer (one batched call for all
+    sentences), so chunks never get truncated by the model. A sentence that is
+    longer than ``max_tokens`` on its own is cut at token boundaries using the
+    tokenizer's offset mapping, so words are never split in half.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+
+    token_counts = [
+        len(ids) for ids in tokenizer(sentences, add_special_tokens=False)["input_ids"]
+    ]
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for sentence, count in zip(sentences, token_counts):
+        if count > max_tokens:
+            if current:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_long_sentence(sentence, tokenizer, max_tokens))
+            continue
+
+        if current and current_tokens + count > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += count
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _split_long_sentence(sentence: str, tokenizer, max_tokens: int) -> List[str]:
+    try:
+        offsets = tokenizer(
+            sentence, add_special_tokens=False, return_offsets_mapping=True
+        )["offset_mapping"]
+    except (NotImplementedError, KeyError, TypeError):
+        # Slow (pure Python) tokenizers have no offset mapping; fall back to words
+        words = sentence.split()
+        step = max(1, max_tokens // 2)
+        return [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+
+    pieces = []
+    start = 0
+    while start < len(offsets):
+        end = min(start + max_tokens, len(offsets))
+        # Back off while the window would end inside a word (contiguous sub-word tokens)
+        while end < len(offsets) and end - start > 1 and offsets[end][0] == offsets[end - 1][1]:
+            end -= 1
+        piece = sentence[offsets[start][0]:offsets[end - 1][1]].strip()
+        if piece:
+            pieces.append(piece)
+        start = end
+    return pieces
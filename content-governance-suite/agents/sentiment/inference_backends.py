@@ -0,0 +1,147 @@
+# agents/sentiment/inference_backends.py
+"""
+Inference backends for the StyleAnalyzerAgent's text classifiers.
+
+Each backend returns a text-classification pipeline (or an object that
+behaves like one for the agent): it has a ``tokenizer`` and is called as
+``classifier(texts, batch_size=..., truncation=True)``, returning one
+``{"label", "score"}`` per text.
+
+* ``pytorch``   - transformers pipeline in fp32 (default)
+* ``int8``      - the same pipeline with Linear layers dynamically quantized to int8
+* ``onnx``      - the model exported to ONNX once and run by ONNX Runtime
+* ``onnx-int8`` - the exported model with int8 dynamically quantized weights
+
+Exported models are cached under STYLE_ONNX_CACHE_DIR (default
+``.cache/onnx``); delete an entry to re-export it.
+"""
+
+from typing import Dict, Any, List, Union
+import os
+import re
+import tempfile
+
+import numpy as np
+
+INFERENCE_BACKENDS = ("pytorch", "int8", "onnx", "onnx-int8")
+
+
+def load_classifier(task: str, model: str, backend: str = "pytorch"):
+    """Build the classifier for a model on the given backend."""
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend} (expected one of {', '.join(INFERENCE_BACKENDS)})")
+    if backend in ("onnx", "onnx-int8"):
+        return OnnxTextClassifier.from_pretrained(model, quantize=backend == "onnx-int8")
+
+    from transformers import pipeline
+    classifier = pipeline(task, model=model)
+    if backend == "int8":
+        import torch
+        from torch.ao.quantization import quantize_dynamic
+        classifier.model = quantize_dynamic(classifier.model, {torch.nn.Linear}, dtype=torch.qint8)
+    return classifier
+
+
+def _cache_path(cache_dir: str, model: str, filename: str) -> str:
+    return os.path.join(cache_dir, re.sub(r"[^A-Za-z0-9._-]+", "--", model).strip("-"), filename)
+
+
+def _write_atomically(path: str, write):
+    """Let ``write(tmp_path)`` produce the file, then move it into place (workers may race)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".onnx.tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def export_onnx(model: str, cache_dir: str = None) -> str:
+    """Export a sequence classification model to ONNX (once) and return the file's path."""
+    cache_dir = cache_dir or os.getenv("STYLE_ONNX_CACHE_DIR", ".cache/onnx")
+    path = _cache_path(cache_dir, model, "model.onnx")
+    if os.path.exists(path):
+        return path
+
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    tokenizer = AutoTokenizer.from_pretrained(model)
+    torch_model = AutoModelForSequenceClassification.from_pretrained(model).eval()
+    sample = tokenizer(["A short sample sentence.", "Another one."], padding=True, return_tensors="pt")
+    dynamic_axes = {"input_ids": {0: "batch", 1: "sequence"}, "attention_mask": {0: "batch", 1: "sequence"},
+                    "logits": {0: "batch"}}
+
+    def write(tmp_path):
+        export_args = dict(input_names=["input_ids", "attention_mask"], output_names=["logits"],
+                           dynamic_axes=dynamic_axes, opset_version=17)
+        with torch.no_grad():
+            try:
+                torch.onnx.export(torch_model, (sample["input_ids"], sample["attention_mask"]), tmp_path,
+                                  dynamo=False, **export_args)
+            except TypeError:
+                # torch < 2.5 has only the TorchScript exporter and no ``dynamo`` argument
+                torch.onnx.export(torch_model, (sample["input_ids"], sample["attention_mask"]), tmp_path,
+                                  **export_args)
+
+    _write_atomically(path, write)
+    return path
+
+
+def quantize_onnx(path: str) -> str:
+    """int8 dynamic quantization of an exported model's weights (once); returns the quantized file's path."""
+    quantized_path = os.path.join(os.path.dirname(path), "model.int8.onnx")
+    if not os.path.exists(quantized_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        _write_atomically(quantized_path,
+                          lambda tmp_path: quantize_dynamic(path, tmp_path, weight_type=QuantType.QInt8))
+    return quantized_path
+
+
+class OnnxTextClassifier:
+    """Text classification with an ONNX Runtime session, with the same output as the transformers pipeline."""
+
+    def __init__(self, session, tokenizer, config):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.id2label = {int(i): label for i, label in config.id2label.items()}
+        self.multi_label = config.problem_type == "multi_label_classification" or config.num_labels == 1
+        self._input_names = [node.name for node in session.get_inputs()]
+
+    @classmethod
+    def from_pretrained(cls, model: str, quantize: bool = False, cache_dir: str = None) -> "OnnxTextClassifier":
+        import onnxruntime
+        from transformers import AutoConfig, AutoTokenizer
+
+        path = export_onnx(model, cache_dir)
+        if quantize:
+            path = quantize_onnx(path)
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = int(os.getenv("STYLE_ONNX_THREADS", 0))
+        session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        return cls(session, AutoTokenizer.from_pretrained(model), AutoConfig.from_pretrained(model))
+
+    def __call__(self, texts: Union[str, List[str]], batch_size: int = 8,
+                 truncation: bool = True) -> List[Dict[str, Any]]:
+        if isinstance(texts, str):
+            texts = [texts]
+        results = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(texts[start:start + batch_size], padding=True, truncation=truncation,
+                                     return_tensors="np")
+            logits = self.session.run(None, {name: encoded[name].astype(np.int64) for name in self._input_names})[0]
+            results.extend(self._postprocess(logits))
+        return results
+
+    def _postprocess(self, logits: np.ndarray) -> List[Dict[str, Any]]:
+        # Same scoring as the pipeline: sigmoid for multi-label / single-logit models, softmax otherwise
+        if self.multi_label:
+            scores = 1 / (1 + np.exp(-logits))
+        else:
+            shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+            scores = shifted / shifted.sum(axis=-1, keepdims=True)
+        best = scores.argmax(axis=-1)
+        return [{"label": self.id2label[int(i)], "score": float(row[i])} for row, i in zip(scores, best)]
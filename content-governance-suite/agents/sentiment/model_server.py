@@ -0,0 +1,198 @@
+# agents/sentiment/model_server.py
+"""
+Style model server: one process owns the StyleAnalyzerAgent's sentiment and
+toxicity models and classifies text for any number of API workers over a
+Unix socket, so N workers hold one copy of the weights instead of N.
+
+    python -m agents.sentiment.model_server --socket /tmp/style-models.sock
+
+Workers use it when STYLE_MODEL_SERVER (or the agent's ``model_server``
+config) is the socket path. Chunking, batch sizes and micro-batching
+follow the server's STYLE_* settings; requests from all workers go through
+the server's schedulers, so they also share model calls.
+
+Messages are length-prefixed JSON: a 4-byte big-endian size, then the body.
+"""
+
+from typing import Dict, Any, List, Optional
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+
+_HEADER = struct.Struct("!I")
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]):
+    body = json.dumps(message).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data.extend(chunk)
+    return bytes(data)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Read one message; None if the peer closed the connection."""
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    body = _recv_exactly(sock, _HEADER.unpack(header)[0])
+    if body is None:
+        return None
+    return json.loads(body)
+
+
+class StyleModelClient:
+    """
+    Client side of the model server, used by StyleAnalyzerAgent. Thread-safe:
+    each call takes an idle connection (or opens one) and returns it after
+    the reply.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = None):
+        self.socket_path = socket_path
+        self.timeout = float(timeout or os.getenv("STYLE_MODEL_SERVER_TIMEOUT", 60))
+        self._idle: List[socket.socket] = []
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise ConnectionError(f"Style model server not reachable at {self.socket_path}: {e}") from e
+        return sock
+
+    def _exchange(self, sock: socket.socket, message: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            send_message(sock, message)
+            reply = recv_message(sock)
+        except OSError:
+            sock.close()
+            raise
+        if reply is None:
+            sock.close()
+            raise ConnectionError("Style model server closed the connection")
+        self._idle.append(sock)
+        return reply
+
+    def request(self, message: Dict[str, Any]) -> Any:
+        try:
+            sock = self._idle.pop()
+        except IndexError:
+            reply = self._exchange(self._connect(), message)
+        else:
+            try:
+                reply = self._exchange(sock, message)
+            except (ConnectionError, OSError):
+                # The idle connection went stale (e.g. the server restarted); retry once on a new one
+                reply = self._exchange(self._connect(), message)
+        if "error" in reply:
+            raise RuntimeError(f"Style model server error: {reply['error']}")
+        return reply["result"]
+
+    def classify(self, model: str, text: str) -> List[Dict[str, Any]]:
+        return self.request({"op": "classify", "model": model, "text": text})
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return self.request({"op": "metrics"})
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+class _ModelRequestHandler(socketserver.BaseRequestHandler):
+    """One thread per client connection; blocking calls meet in the agent's batch schedulers."""
+
+    def handle(self):
+        while True:
+            try:
+                message = recv_message(self.request)
+            except OSError:
+                return
+            if message is None:
+                return
+            try:
+                reply = {"result": self.server.handle_message(message)}
+            except Exception as e:
+                reply = {"error": f"{type(e).__name__}: {e}"}
+            send_message(self.request, reply)
+
+
+class StyleModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, agent=None):
+        if agent is None:
+            from .style_analyzer import StyleAnalyzerAgent
+            # The server's own agent loads the models locally instead of calling itself
+            agent = StyleAnalyzerAgent({"model_server": ""})
+        self.agent = agent
+        self.socket_path = socket_path
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _ModelRequestHandler)
+
+    def preload(self):
+        """Load both models before accepting requests."""
+        self.agent.sentiment_analyzer
+        self.agent.readability_analyzer
+
+    def handle_message(self, message: Dict[str, Any]) -> Any:
+        op = message.get("op")
+        if op == "classify":
+            if message.get("model") not in ("sentiment", "toxicity"):
+                raise ValueError(f"Unknown model: {message.get('model')}")
+            return self.agent.classify_text(message["model"], message.get("text", ""))
+        if op == "metrics":
+            return self.agent.get_inference_metrics()
+        if op == "ping":
+            return "pong"
+        raise ValueError(f"Unknown operation: {op}")
+
+    def serve_in_thread(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="style-model-server", daemon=True)
+        thread.start()
+        return thread
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the StyleAnalyzer models over a Unix socket")
+    parser.add_argument("--socket", default=os.getenv("STYLE_MODEL_SERVER", "/tmp/style-models.sock"))
+    parser.add_argument("--no-preload", action="store_true", help="load models on the first request")
+    args = parser.parse_args()
+
+    server = StyleModelServer(args.socket)
+    if not args.no_preload:
+        server.preload()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Style model server listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
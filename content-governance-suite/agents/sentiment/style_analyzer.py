@@ -1,8 +1,12 @@
-from transformers import pipeline
 from typing import Dict, Any, List
 import os
+import threading
 from datetime import datetime
 from ..base_agent import BaseAgent
+from .chunking import chunk_text
+from .batch_scheduler import MicroBatchScheduler
+from .model_server import StyleModelClient
+from .inference_backends import load_classifier, INFERENCE_BACKENDS
 
 class StyleAnalyzerAgent(BaseAgent):
     """Agent responsible for style and sentiment analysis"""
@@ -10,20 +14,60 @@ class StyleAnalyzerAgent(BaseAgent):
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__("StyleAnalyzer", config)
         
-        # Initialize sentiment analysis pipeline
-        self.sentiment_analyzer = pipeline(
-            "sentiment-analysis",
-            model="cardiffnlp/twitter-roberta-base-sentiment-latest"
-        )
+        # Transformer pipelines are loaded on first use (see the properties below)
+        self._sentiment_analyzer = None
+        self._readability_analyzer = None
+        self._model_lock = threading.Lock()
+        self.sentiment_model = self.config.get(
+            "sentiment_model", os.getenv("STYLE_SENTIMENT_MODEL", "cardiffnlp/twitter-roberta-base-sentiment-latest"))
+        self.toxicity_model = self.config.get(
+            "toxicity_model", os.getenv("STYLE_TOXICITY_MODEL", "martin-ha/toxic-comment-model"))
+        # pytorch (fp32), int8, onnx or onnx-int8; see inference_backends.py
+        self.inference_backend = self.config.get("inference_backend", os.getenv("STYLE_INFERENCE_BACKEND", "pytorch"))
+        if self.inference_backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend: {self.inference_backend}")
         
-        # Initialize other analyzers
-        self.readability_analyzer = pipeline(
-            "text-classification",
-            model="martin-ha/toxic-comment-model"
-        )
+        # With a model server (agents/sentiment/model_server.py) this process loads no models;
+        # chunking and inference happen in the server, shared by every API worker
+        self.model_server = self.config.get("model_server", os.getenv("STYLE_MODEL_SERVER")) or None
+        self._model_client = StyleModelClient(self.model_server) if self.model_server else None
+        
+        # Batched inference settings
+        self.batch_size = int(self.config.get("batch_size", os.getenv("STYLE_BATCH_SIZE", 8)))
+        self.max_chunk_tokens = int(self.config.get("max_chunk_tokens", os.getenv("STYLE_MAX_CHUNK_TOKENS", 256)))
+        
+        # Cross-request micro-batching: chunks from concurrent requests share model calls
+        self.micro_batching = str(self.config.get(
+            "micro_batching", os.getenv("STYLE_MICRO_BATCHING", "1"))).lower() in ("1", "true", "yes")
+        self.micro_batch_size = int(self.config.get("micro_batch_size", os.getenv("STYLE_MICRO_BATCH_SIZE", 32)))
+        self.micro_batch_wait_ms = float(self.config.get("micro_batch_wait_ms", os.getenv("STYLE_MICRO_BATCH_WAIT_MS", 5)))
+        self._schedulers: Dict[str, MicroBatchScheduler] = {}
         
         self.brand_guidelines = self._load_brand_guidelines()
     
+    @property
+    def sentiment_analyzer(self):
+        """Sentiment analysis pipeline, loaded on first access"""
+        if self._sentiment_analyzer is None:
+            with self._model_lock:
+                if self._sentiment_analyzer is None:
+                    self._sentiment_analyzer = self._load_pipeline("sentiment-analysis", self.sentiment_model)
+        return self._sentiment_analyzer
+    
+    @property
+    def readability_analyzer(self):
+        """Toxicity classification pipeline, loaded on first access"""
+        if self._readability_analyzer is None:
+            with self._model_lock:
+                if self._readability_analyzer is None:
+                    self._readability_analyzer = self._load_pipeline("text-classification", self.toxicity_model)
+        return self._readability_analyzer
+    
+    def _load_pipeline(self, task: str, model: str):
+        """Build the classifier on the configured inference backend"""
+        self.log_activity("Loading model", {"task": task, "model": model, "backend": self.inference_backend})
+        return load_classifier(task, model, self.inference_backend)
+    
     def _load_brand_guidelines(self) -> Dict[str, Any]:
         """Load brand guidelines for consistency checking"""
         return {
@@ -79,24 +123,84 @@ class StyleAnalyzerAgent(BaseAgent):
                 "status": "error"
             }
     
+    def _chunk(self, content: str, classifier) -> List[str]:
+        """Split content into sentence-aligned chunks that fit the classifier's tokenizer"""
+        max_tokens = min(self.max_chunk_tokens, classifier.tokenizer.model_max_length - 2)
+        return chunk_text(content, classifier.tokenizer, max_tokens)
+    
+    def _classifier(self, model: str):
+        return self.sentiment_analyzer if model == "sentiment" else self.readability_analyzer
+    
+    def _run_classifier(self, model: str, chunks: List[str]) -> List[Dict[str, Any]]:
+        """Run one batched pipeline call over the given chunks"""
+        return self._classifier(model)(chunks, batch_size=self.batch_size, truncation=True)
+    
+    def _get_scheduler(self, model: str) -> MicroBatchScheduler:
+        scheduler = self._schedulers.get(model)
+        if scheduler is None:
+            with self._model_lock:
+                scheduler = self._schedulers.get(model)
+                if scheduler is None:
+                    scheduler = MicroBatchScheduler(
+                        lambda chunks: self._run_classifier(model, chunks),
+                        max_batch_size=self.micro_batch_size,
+                        max_wait_ms=self.micro_batch_wait_ms,
+                        name=model
+                    )
+                    self._schedulers[model] = scheduler
+        return scheduler
+    
+    def _classify(self, model: str, chunks: List[str]) -> List[Dict[str, Any]]:
+        """Classify chunks with the "sentiment" or "toxicity" model"""
+        if not chunks:
+            return []
+        if self.micro_batching:
+            return self._get_scheduler(model).infer(chunks)
+        return self._run_classifier(model, chunks)
+    
+    def classify_text(self, model: str, content: str) -> List[Dict[str, Any]]:
+        """Chunk content and classify every chunk with the "sentiment" or "toxicity" model"""
+        if self._model_client is not None:
+            return self._model_client.classify(model, content)
+        return self._classify(model, self._chunk(content, self._classifier(model)))
+    
+    def get_inference_metrics(self) -> Dict[str, Any]:
+        """Micro-batching metrics (batch fill ratio, queue wait) per model"""
+        if self._model_client is not None:
+            return self._model_client.get_metrics()
+        return {model: scheduler.get_metrics() for model, scheduler in self._schedulers.items()}
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the micro-batching worker threads (after queued chunks are flushed) and close server connections"""
+        with self._model_lock:
+            schedulers = list(self._schedulers.values())
+            self._schedulers.clear()
+        for scheduler in schedulers:
+            scheduler.shutdown(wait=wait)
+        if self._model_client is not None:
+            self._model_client.close()
+    
     def _analyze_sentiment(self, content: str) -> Dict[str, Any]:
         """Analyze content sentiment"""
-        # Split content into chunks for analysis
-        chunks = [content[i:i+500] for i in range(0, len(content), 500)]
-        
-        sentiment_scores = []
-        for chunk in chunks:
-            result = self.sentiment_analyzer(chunk)
-            sentiment_scores.append(result[0])
+        # Split content into sentence-aligned chunks and score them in batches
+        sentiment_scores = self.classify_text("sentiment", content)
+        if not sentiment_scores:
+            # Empty or whitespace-only content has no chunks to score
+            return {
+                "overall_sentiment": "NEUTRAL",
+                "confidence": 1.0,
+                "distribution": {"positive": 0, "negative": 0, "neutral": 0}
+            }
         
-        # Aggregate results
-        positive_count = sum(1 for s in sentiment_scores if s['label'] == 'POSITIVE')
-        negative_count = sum(1 for s in sentiment_scores if s['label'] == 'NEGATIVE')
+        # Aggregate results; model label casing varies (cardiffnlp emits "positive")
+        positive_count = sum(1 for s in sentiment_scores if s['label'].upper() == 'POSITIVE')
+        negative_count = sum(1 for s in sentiment_scores if s['label'].upper() == 'NEGATIVE')
         neutral_count = len(sentiment_scores) - positive_count - negative_count
+        strongest = max(sentiment_scores, key=lambda x: x['score'])
         
         return {
-            "overall_sentiment": max(sentiment_scores, key=lambda x: x['score'])['label'],
-            "confidence": max(sentiment_scores, key=lambda x: x['score'])['score'],
+            "overall_sentiment": strongest['label'].upper(),
+            "confidence": strongest['score'],
             "distribution": {
                 "positive": positive_count,
                 "negative": negative_count,
@@ -112,14 +216,16 @@ class StyleAnalyzerAgent(BaseAgent):
         
         avg_sentence_length = len(words) / len(sentences) if sentences else 0
         
-        # Check for toxic content
-        toxicity_result = self.readability_analyzer(content[:500])  # Limit input size
+        # Check for toxic content across the whole document; the most toxic chunk wins
+        toxicity_results = self.classify_text("toxicity", content)
+        toxic_scores = [r['score'] for r in toxicity_results if r['label'].upper() == 'TOXIC']
         
         return {
             "average_sentence_length": avg_sentence_length,
             "total_words": len(words),
             "total_sentences": len(sentences),
-            "toxicity_score": toxicity_result[0]['score'] if toxicity_result[0]['label'] == 'TOXIC' else 0,
+            "toxicity_score": max(toxic_scores, default=0),
+            "toxic_chunks": len(toxic_scores),
             "readability_grade": "good" if avg_sentence_length < 20 else "needs_improvement"
         }
     
@@ -150,7 +256,7 @@ class StyleAnalyzerAgent(BaseAgent):
     
     def _calculate_style_score(self, sentiment: Dict, readability: Dict, brand: Dict) -> float:
         """Calculate overall style score"""
-        sentiment_score = sentiment['confidence'] if sentiment['overall_sentiment'] != 'NEGATIVE' else 0.5
+        sentiment_score = sentiment['confidence'] if sentiment['overall_sentiment'].upper() != 'NEGATIVE' else 0.5
         readability_score = 1.0 if readability['readability_grade'] == 'good' else 0.6
         brand_score = brand['alignment_score']
         
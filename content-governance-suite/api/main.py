@@ -1,36 +1,49 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, FileResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional, List
 from dotenv import load_dotenv
 import os
 import sys
 import asyncio
+import contextlib
 import json
-import io
 
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import all necessary components
-from agents.generator.content_generator import ContentGeneratorAgent
+# Load settings before importing components that read them at import time
+load_dotenv()
+
+# Import all necessary components. Agents themselves are built lazily by the
+# registry, so importing this module does not load any model.
+from agents.registry import agent_registry
 from workflows.review_workflow import ReviewWorkflow
-from agents.consensus.consensus_agent import ConsensusAgent
+from workflows.governance_pipeline import GovernancePipeline, GenerationFailed
+from services.batch_jobs import BatchJobManager
+from services.result_cache import build_result_cache
+from services.job_queue import open_job_queue
+from agents.rate_limiter import provider_limits
+from api.websocket_manager import ws_manager
 
 # Only import database components if they exist
 try:
-    from database.models import create_tables, get_db, ContentHistory
-    from services.analytics_service import AnalyticsService
-    from services.export_service import export_service
+    from database.models import (
+        create_tables, ContentHistory, SessionLocal, AsyncSessionLocal, async_database_enabled,
+        init_engines, dispose_engines, get_pool_stats
+    )
+    from services.history_writer import BackgroundWriter, PipelineRecorder
+    from services.content_rollup import ensure_daily_rollup
+    from services.analytics_service import AnalyticsService, dashboard_cache
+    from services.export_service import export_service, EXPORT_FORMATS
+    from services.history_export import history_export_service
     DATABASE_ENABLED = True
 except ImportError as e:
     print(f"Database components not available: {e}")
     DATABASE_ENABLED = False
 
-load_dotenv()
-
 app = FastAPI(
     title="Autonomous Content Generation & Governance Suite",
     description="API for managing AI agents for content creation and review.",
@@ -54,9 +67,59 @@ app.add_middleware(
 )
 
 # Initialize core components
-content_generator = ContentGeneratorAgent()
 review_workflow = ReviewWorkflow()
-consensus_agent = ConsensusAgent()
+# Pipeline runs are persisted off the request path by a background batched writer
+history_writer = BackgroundWriter(SessionLocal) if DATABASE_ENABLED else None
+if history_writer is not None:
+    # New history rows make cached dashboard numbers stale
+    history_writer.add_flush_listener(
+        lambda models: dashboard_cache.invalidate() if ContentHistory in models else None)
+# Identical requests (retries, double submits) share one pipeline run and its result
+result_cache = build_result_cache()
+governance_pipeline = GovernancePipeline(
+    review_workflow, recorder=PipelineRecorder(history_writer) if history_writer else None,
+    result_cache=result_cache)
+batch_jobs = BatchJobManager(governance_pipeline)
+# Durable queue drained by separate worker processes (services/job_worker.py)
+job_queue = open_job_queue()
+
+@app.on_event("startup")
+async def preload_agents():
+    """Optionally build every agent before serving traffic (PRELOAD_AGENTS=1)."""
+    if os.getenv("PRELOAD_AGENTS", "0").lower() in ("1", "true", "yes"):
+        await asyncio.get_running_loop().run_in_executor(None, agent_registry.preload)
+
+@app.on_event("startup")
+def init_database():
+    """Create the database engines and tables, and backfill the trend rollup if needed."""
+    if not DATABASE_ENABLED:
+        return
+    try:
+        init_engines()
+        create_tables()
+        print("Database tables created successfully")
+        with SessionLocal() as db:
+            backfilled = ensure_daily_rollup(db)
+        if backfilled:
+            print(f"Backfilled daily content rollup for {backfilled} days")
+    except Exception as e:
+        print(f"Database initialization failed: {e}")
+
+@app.on_event("shutdown")
+async def release_resources():
+    """Flush buffered history and metrics rows, then release caches, worker threads and connections."""
+    if history_writer is not None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, history_writer.shutdown, float(os.getenv("HISTORY_WRITER_SHUTDOWN_TIMEOUT", 10)))
+    if result_cache is not None:
+        await result_cache.aclose()
+    review_workflow.shutdown()
+    # Joins the style analyzer's micro-batching threads once their queued chunks are flushed
+    await asyncio.get_running_loop().run_in_executor(None, agent_registry.shutdown)
+    job_queue.close()
+    if DATABASE_ENABLED:
+        export_service.shutdown()
+        await dispose_engines()
 
 # Define request models
 class ContentRequest(BaseModel):
@@ -65,6 +128,19 @@ class ContentRequest(BaseModel):
     style_guide: Optional[Dict[str, Any]] = {}
     target_audience: str = "general"
 
+class BatchContentRequest(BaseModel):
+    requests: List[ContentRequest]
+    concurrency: Optional[int] = None
+
+class GuidelineDocument(BaseModel):
+    id: Optional[str] = None
+    text: str
+    metadata: Optional[Dict[str, Any]] = {}
+
+class GuidelineIngestRequest(BaseModel):
+    documents: List[GuidelineDocument] = []
+    remove_ids: List[str] = []
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Content Governance Suite API!"}
@@ -74,98 +150,263 @@ def health_check():
     return {"status": "ok", "message": "API is healthy."}
 
 @app.post("/generate-and-govern")
-def generate_and_govern_content(request: ContentRequest):
+async def generate_and_govern_content(request: ContentRequest):
     """
     A single endpoint to run the entire generation and governance pipeline.
+    All agent work is awaited, so the worker never blocks on an LLM or model call.
     """
     try:
-        # Step 1: Generate Content
-        print("\n--- Step 1: GENERATING CONTENT ---")
-        generated_content_data = content_generator.process(request.dict())
-        if generated_content_data.get("status") == "failed":
-            raise HTTPException(status_code=500, detail=f"Content generation failed: {generated_content_data.get('error')}")
-
-        # Step 2: Run Review Workflow
-        print("\n--- Step 2: EXECUTING REVIEW WORKFLOW ---")
-        review_results = review_workflow.execute({"content_data": generated_content_data})
-
-        # Step 3: Get Consensus
-        print("\n--- Step 3: CALCULATING CONSENSUS ---")
-        final_consensus = consensus_agent.process(review_results)
-
-        # Step 4: Assemble the final response
-        return {
-            "success": True,
-            "data": {
-                "generated_content": generated_content_data,
-                "review_pipeline": review_results,
-                "final_decision": final_consensus
-            }
-        }
+        return {"success": True, "data": await governance_pipeline.arun(request.dict())}
+    except GenerationFailed as e:
+        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         # Log the full exception for debugging
         print(f"An error occurred in the main pipeline: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.websocket("/ws/generate")
+async def websocket_generate(websocket: WebSocket, user_id: Optional[str] = None):
+    """
+    Streaming variant of /generate-and-govern. Send a ContentRequest as JSON;
+    the server streams generation_update, token, generated_content and
+    review_result messages as they happen and finishes each request with a
+    consensus message. The socket stays open for further requests.
+    """
+    await ws_manager.connect(websocket, user_id)
+    try:
+        while True:
+            try:
+                request = ContentRequest(**json.loads(await websocket.receive_text()))
+            except (ValueError, TypeError) as e:
+                await ws_manager.send_json(websocket, {"type": "error", "detail": str(e)})
+                continue
+
+            try:
+                # aclosing cancels in-flight reviewers if the client goes away mid-stream
+                async with contextlib.aclosing(governance_pipeline.astream(request.dict())) as events:
+                    async for event in events:
+                        if event["type"] == "generation_update":
+                            await ws_manager.send_generation_update(
+                                event["step"], event["progress"], websocket=websocket)
+                        else:
+                            await ws_manager.send_json(websocket, event)
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                print(f"An error occurred in the streaming pipeline: {e}")
+                await ws_manager.send_json(websocket, {"type": "error", "detail": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        ws_manager.disconnect(websocket, user_id)
+
+@app.get("/ws/stats")
+def get_websocket_stats():
+    """Connection count, queue depth and drop/coalesce/removal counters of the WebSocket fan-out"""
+    return ws_manager.get_stats()
+
+@app.get("/cache/stats")
+def get_result_cache_stats():
+    """Hit, miss and single-flight counters of the request-level result cache"""
+    return result_cache.get_stats() if result_cache is not None else {"enabled": False}
+
+@app.post("/batch/generate-and-govern")
+async def submit_batch(request: BatchContentRequest):
+    """
+    Queue many content requests as one job. Items run through the same pipeline
+    as /generate-and-govern with at most `concurrency` in flight; poll
+    /batch/{job_id} or stream /batch/{job_id}/stream for results.
+    """
+    if not request.requests:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one request")
+    job = batch_jobs.submit([item.dict() for item in request.requests], request.concurrency)
+    return job.to_dict(include_results=False)
+
+@app.get("/batch")
+def list_batches():
+    return {"jobs": batch_jobs.list_jobs(), "rate_limits": provider_limits.get_stats()}
+
+@app.get("/batch/{job_id}")
+def get_batch(job_id: str, include_results: bool = True):
+    """Poll a batch job; results are listed in completion order"""
+    job = batch_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return job.to_dict(include_results=include_results)
+
+@app.get("/batch/{job_id}/stream")
+async def stream_batch(job_id: str):
+    """Stream item results as NDJSON as soon as each one finishes, then a final summary line"""
+    job = batch_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+
+    async def ndjson():
+        async for result in job.stream():
+            yield json.dumps(result, default=str) + "\n"
+        yield json.dumps({"summary": job.to_dict(include_results=False)}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@app.delete("/batch/{job_id}")
+def cancel_batch(job_id: str):
+    if batch_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return {"job_id": job_id, "cancelled": batch_jobs.cancel(job_id)}
+
+@app.post("/jobs", status_code=202)
+def enqueue_job(request: ContentRequest):
+    """
+    Queue one content request for the worker processes and return at once.
+    Poll /jobs/{job_id} for its status and, once succeeded, its result.
+    """
+    job_id = job_queue.enqueue(request.dict())
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/jobs/stats")
+def get_job_queue_stats():
+    """Number of jobs per status in the durable job queue"""
+    return {"backend": type(job_queue).__name__, "jobs": job_queue.get_stats()}
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 @app.get("/agents/status")
 def get_agent_status():
-    """Get status of all agents"""
+    """Get status of all agents (agents that have not been used yet report not_loaded)"""
+    return agent_registry.status()
+
+@app.get("/agents/factcheck/cache")
+def get_factcheck_cache_stats():
+    """Claim verdict cache counters, including the estimated LLM tokens saved"""
+    if not agent_registry.is_loaded("factuality"):
+        return {"status": "not_loaded"}
+    return agent_registry.get("factuality").get_cache_stats()
+
+@app.get("/agents/factcheck/cascade")
+def get_factcheck_cascade_stats():
+    """How much content the local checks decided without the fact-check LLM"""
+    if not agent_registry.is_loaded("factuality"):
+        return {"status": "not_loaded"}
+    return agent_registry.get("factuality").get_cascade_stats()
+
+@app.get("/agents/style/inference")
+def get_style_inference_metrics():
+    """Micro-batching metrics of the style analyzer's models"""
+    if not agent_registry.is_loaded("style_analyzer"):
+        return {"status": "not_loaded"}
+    return agent_registry.get("style_analyzer").get_inference_metrics()
+
+@app.post("/knowledge-base/ingest")
+async def ingest_guidelines(request: GuidelineIngestRequest):
+    """
+    Bulk add, update or remove RAG guideline documents.
+    Only documents whose content changed are re-embedded; the index is persisted to disk.
+    """
+    content_generator = await agent_registry.aget("content_generator")
+    documents = [document.dict() for document in request.documents]
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, content_generator.ingest_guidelines, documents, request.remove_ids
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Guideline ingestion failed: {e}")
+
+@app.get("/knowledge-base/stats")
+def get_knowledge_base_stats():
+    """Document and chunk counts of the persisted knowledge base, plus embedding cache counters"""
+    if not agent_registry.is_loaded("content_generator"):
+        return {"status": "not_loaded"}
+    content_generator = agent_registry.get("content_generator")
     return {
-        "content_generator": {
-            "agent_id": content_generator.agent_id,
-            "status": "active",
-            "created_at": content_generator.created_at.isoformat()
-        }
+        **content_generator.knowledge_base.get_stats(),
+        "embedding_cache": content_generator.get_embedding_cache_stats()
     }
 
 # Analytics endpoints (only if database is enabled)
 if DATABASE_ENABLED:
+    async def run_analytics(call):
+        """
+        Run ``call(AnalyticsService)`` off the request threads: on the async
+        engine when DATABASE_ASYNC=1, otherwise on a sync session in the executor.
+        """
+        if async_database_enabled():
+            async with AsyncSessionLocal() as db:
+                return await db.run_sync(lambda session: call(AnalyticsService(session)))
+
+        def run():
+            with SessionLocal() as db:
+                return call(AnalyticsService(db))
+        return await asyncio.get_running_loop().run_in_executor(None, run)
+
     @app.get("/analytics/dashboard")
-    def get_analytics_dashboard(days: int = 30, db: Session = Depends(get_db)):
+    async def get_analytics_dashboard(days: int = 30):
         """Get comprehensive analytics data"""
-        analytics_service = AnalyticsService(db)
-        return analytics_service.get_dashboard_stats(days)
+        return await run_analytics(lambda service: service.get_dashboard_stats(days))
+
+    @app.get("/analytics/writer")
+    def get_history_writer_metrics():
+        """Buffer depth, flush latency and row counters of the background history writer"""
+        return history_writer.get_metrics()
+
+    @app.get("/analytics/database")
+    def get_database_pool_stats():
+        """Connection pool occupancy and checkout wait times of each database engine"""
+        return get_pool_stats()
 
     @app.get("/analytics/trends")
-    def get_content_trends(days: int = 30, db: Session = Depends(get_db)):
+    async def get_content_trends(days: int = 30):
         """Get content generation trends"""
-        analytics_service = AnalyticsService(db)
-        return analytics_service.get_content_trends(days)
+        return await run_analytics(lambda service: service.get_content_trends(days))
 
-    @app.post("/export/pdf")
-    async def export_content_pdf(content_data: Dict[str, Any]):
-        """Export content analysis to PDF"""
+    @app.get("/analytics/agents")
+    async def get_agent_performance(days: int = 7):
+        """Per-agent and per-operation counts, success rate and execution time percentiles"""
+        return await run_analytics(lambda service: service.get_agent_performance(days))
+
+    async def export_response(export_format: str, content_data: Dict[str, Any], filename: str):
+        """Render (or reuse) the report off the event loop and stream the file."""
         try:
-            pdf_buffer = export_service.export_to_pdf(content_data)
-            
-            return StreamingResponse(
-                io.BytesIO(pdf_buffer.read()),
-                media_type="application/pdf",
-                headers={"Content-Disposition": "attachment; filename=content_report.pdf"}
-            )
+            path = await export_service.render(export_format, content_data)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+        # The cached file stays safe from pruning until it has been sent
+        return FileResponse(path, media_type=EXPORT_FORMATS[export_format][2], filename=filename,
+                            background=BackgroundTask(export_service.release, path))
+
+    @app.post("/export/pdf")
+    async def export_content_pdf(content_data: Dict[str, Any]):
+        """Export content analysis to PDF"""
+        return await export_response("pdf", content_data, "content_report.pdf")
 
     @app.post("/export/word")
     async def export_content_word(content_data: Dict[str, Any]):
         """Export content analysis to Word document"""
+        return await export_response("word", content_data, "content_report.docx")
+
+    @app.get("/export/history")
+    def export_history(format: str = "csv", days: Optional[int] = None, decision: Optional[str] = None,
+                       include_content: bool = False):
+        """Stream stored content history as CSV, NDJSON, Parquet or Arrow"""
         try:
-            word_buffer = export_service.export_to_word(content_data)
-            
-            return StreamingResponse(
-                io.BytesIO(word_buffer.read()),
-                media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                headers={"Content-Disposition": "attachment; filename=content_report.docx"}
-            )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            media_type, extension = history_export_service.check_format(format)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return StreamingResponse(
+            history_export_service.stream(format, days=days, decision=decision, include_content=include_content),
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename=content_history.{extension}"}
+        )
+
+    @app.get("/export/stats")
+    def get_export_stats():
+        """Render and cache-hit counters of the export worker pool"""
+        return export_service.get_stats()
 
-    # Initialize database tables
-    try:
-        create_tables()
-        print("Database tables created successfully")
-    except Exception as e:
-        print(f"Database initialization failed: {e}")
 else:
     print("Running without database features")
 
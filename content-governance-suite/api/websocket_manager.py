@@ -1,48 +1,262 @@
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import List, Dict
+from collections import deque
+from typing import List, Dict, Set, Optional, Union
 import json
 import asyncio
+import os
+
+# Messages of these types are progress updates: a newer one replaces a still
+# queued older one on the same connection, and they are dropped first when a
+# connection's queue is full
+PROGRESS_MESSAGE_TYPES = ("generation_update",)
+
+# Streamed text chunks: a token queued behind another queued token of the same
+# stream is appended to it, so a slow reader gets fewer, longer tokens
+TOKEN_MESSAGE_TYPES = ("token",)
+
+# Close codes: a normal removal, and a kick of a client that could not keep up
+CLOSE_NORMAL = 1000
+CLOSE_TRY_AGAIN_LATER = 1013
+KICK_REASONS = ("send_timeout", "slow_consumer")
+
+
+class Connection:
+    """
+    One WebSocket plus its bounded outbound queue and sender task.
+
+    Messages are enqueued without waiting; the sender task writes them to the
+    socket one by one, so a slow client only ever delays itself. A send that
+    takes longer than the manager's ``send_timeout`` gets the connection
+    removed by the manager's watchdog.
+    """
+
+    def __init__(self, manager: "WebSocketManager", websocket: WebSocket, user_id: str = None):
+        self.manager = manager
+        self.websocket = websocket
+        self.user_id = user_id
+        self.closed = False
+
+        # Entries are [coalesce_key, text, token message or None]; the key is None for regular messages
+        self._queue: deque = deque()
+        self._pending_keys: Dict[str, list] = {}
+        self._ready = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self.send_started: Optional[float] = None
+        self._sender = self._loop.create_task(self._send_loop())
+
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def enqueue(self, text: str, coalesce_key: str = None, token: dict = None) -> bool:
+        """Queue a serialized message; returns False if the connection is (now) closed."""
+        if self.closed:
+            return False
+
+        if token is not None and self._queue and self._merge_token(self._queue[-1], token):
+            self.coalesced += 1
+            return True
+
+        if coalesce_key is not None:
+            pending = self._pending_keys.pop(coalesce_key, None)
+            if pending is not None:
+                # The newer update replaces the queued one and moves behind
+                # anything queued since, so progress never overtakes results
+                self._queue.remove(pending)
+                self.coalesced += 1
+
+        if len(self._queue) >= self.manager.max_queue_size:
+            oldest_progress = next((entry for entry in self._queue if entry[0] is not None), None)
+            if oldest_progress is not None:
+                self._queue.remove(oldest_progress)
+                self._pending_keys.pop(oldest_progress[0], None)
+                self.dropped += 1
+            elif coalesce_key is not None:
+                # Queue is full of messages that matter more than this update
+                self.dropped += 1
+                return True
+            else:
+                # Cannot drop results or tokens: the client is too slow to keep up
+                self.manager._remove(self, reason="slow_consumer")
+                return False
+
+        entry = [coalesce_key, text, token]
+        self._queue.append(entry)
+        if coalesce_key is not None:
+            self._pending_keys[coalesce_key] = entry
+        self._ready.set()
+        return True
+
+    @staticmethod
+    def _merge_token(entry: list, token: dict) -> bool:
+        """Append a token's content to a queued token entry of the same stream."""
+        queued = entry[2]
+        if queued is None or {k: v for k, v in queued.items() if k != "content"} != \
+                {k: v for k, v in token.items() if k != "content"}:
+            return False
+        merged = dict(queued, content=queued.get("content", "") + token.get("content", ""))
+        entry[1], entry[2] = json.dumps(merged, default=str), merged
+        return True
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    async def _send_loop(self):
+        try:
+            while True:
+                while not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                entry = self._queue.popleft()
+                coalesce_key, text, _ = entry
+                if coalesce_key is not None and self._pending_keys.get(coalesce_key) is entry:
+                    del self._pending_keys[coalesce_key]
+                # Timed out by the manager's watchdog rather than a timer per send
+                self.send_started = self._loop.time()
+                await self.websocket.send_text(text)
+                self.send_started = None
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.manager._remove(self, reason="send_error")
+
+    def close(self, code: int = CLOSE_NORMAL):
+        """Stop the sender and close the socket with ``code`` in the background."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        self._pending_keys.clear()
+        if self._sender is not asyncio.current_task():
+            self._sender.cancel()
+        asyncio.get_running_loop().create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int):
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code), self.manager.send_timeout)
+        except Exception:
+            pass
+
 
 class WebSocketManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.user_connections: Dict[str, WebSocket] = {}
-    
-    async def connect(self, websocket: WebSocket, user_id: str = None):
+    """
+    Fan-out engine for WebSocket messages.
+
+    Every message is serialized once and put on each target connection's
+    bounded queue; per-connection sender tasks deliver them concurrently.
+    Progress updates are coalesced (and dropped first when a queue is full),
+    queued tokens of one stream are concatenated, and connections that time
+    out, error or cannot keep up are removed automatically (kicks close with
+    1013, other removals with 1000). A user may hold several sockets at once.
+    """
+
+    def __init__(self, max_queue_size: int = None, send_timeout: float = None):
+        self.max_queue_size = int(max_queue_size or os.getenv("WS_MAX_QUEUE_SIZE", 100))
+        self.send_timeout = float(send_timeout or os.getenv("WS_SEND_TIMEOUT", 5))
+        self.connections: Dict[WebSocket, Connection] = {}
+        self.user_connections: Dict[str, Set[Connection]] = {}
+        self.removed: Dict[str, int] = {"disconnected": 0, "send_timeout": 0, "send_error": 0, "slow_consumer": 0}
+        self._watchdog: Optional[asyncio.Task] = None
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.connections)
+
+    async def connect(self, websocket: WebSocket, user_id: str = None) -> Connection:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        if self._watchdog is None or self._watchdog.done():
+            self._watchdog = asyncio.get_running_loop().create_task(self._watch_sends())
+        connection = Connection(self, websocket, user_id)
+        self.connections[websocket] = connection
         if user_id:
-            self.user_connections[user_id] = websocket
-    
+            self.user_connections.setdefault(user_id, set()).add(connection)
+        return connection
+
     def disconnect(self, websocket: WebSocket, user_id: str = None):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        if user_id and user_id in self.user_connections:
-            del self.user_connections[user_id]
-    
-    async def send_personal_message(self, message: str, user_id: str):
-        if user_id in self.user_connections:
-            await self.user_connections[user_id].send_text(message)
-    
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                pass
-    
-    async def send_generation_update(self, step: str, progress: int, user_id: str = None):
+        connection = self.connections.get(websocket)
+        if connection is not None:
+            self._remove(connection, reason="disconnected")
+
+    async def _watch_sends(self):
+        """Remove connections whose current send has exceeded send_timeout."""
+        loop = asyncio.get_running_loop()
+        interval = min(1.0, self.send_timeout / 4)
+        while self.connections:
+            await asyncio.sleep(interval)
+            deadline = loop.time() - self.send_timeout
+            for connection in list(self.connections.values()):
+                if connection.send_started is not None and connection.send_started < deadline:
+                    self._remove(connection, reason="send_timeout")
+
+    def _remove(self, connection: Connection, reason: str):
+        if self.connections.pop(connection.websocket, None) is None:
+            return
+        user_sockets = self.user_connections.get(connection.user_id)
+        if user_sockets is not None:
+            user_sockets.discard(connection)
+            if not user_sockets:
+                del self.user_connections[connection.user_id]
+        self.removed[reason] = self.removed.get(reason, 0) + 1
+        connection.close(CLOSE_TRY_AGAIN_LATER if reason in KICK_REASONS else CLOSE_NORMAL)
+
+    @staticmethod
+    def _serialize(message: Union[str, dict]) -> tuple:
+        """Serialize once per fan-out; returns (text, coalesce key or None, token message or None)."""
+        if isinstance(message, str):
+            return message, None, None
+        message_type = message.get("type")
+        coalesce_key = message_type if message_type in PROGRESS_MESSAGE_TYPES else None
+        token = message if message_type in TOKEN_MESSAGE_TYPES else None
+        return json.dumps(message, default=str), coalesce_key, token
+
+    def _fan_out(self, connections, message: Union[str, dict]) -> int:
+        serialized = self._serialize(message)
+        return sum(1 for connection in list(connections) if connection.enqueue(*serialized))
+
+    async def send_json(self, websocket: WebSocket, message: dict):
+        """Queue a message for one socket; raises WebSocketDisconnect if it is gone."""
+        connection = self.connections.get(websocket)
+        if connection is None or not connection.enqueue(*self._serialize(message)):
+            raise WebSocketDisconnect(code=1006)
+
+    async def send_personal_message(self, message: Union[str, dict], user_id: str) -> int:
+        """Queue a message for every socket of a user; returns how many accepted it."""
+        return self._fan_out(self.user_connections.get(user_id, ()), message)
+
+    async def broadcast(self, message: Union[str, dict]) -> int:
+        """Queue a message for every connection; returns how many accepted it."""
+        return self._fan_out(self.connections.values(), message)
+
+    async def send_generation_update(self, step: str, progress: int, user_id: str = None,
+                                     websocket: WebSocket = None):
         message = {
             "type": "generation_update",
             "step": step,
             "progress": progress,
             "timestamp": asyncio.get_event_loop().time()
         }
-        
-        if user_id:
-            await self.send_personal_message(json.dumps(message), user_id)
+
+        if websocket is not None:
+            await self.send_json(websocket, message)
+        elif user_id:
+            await self.send_personal_message(message, user_id)
         else:
-            await self.broadcast(json.dumps(message))
+            await self.broadcast(message)
+
+    def get_stats(self) -> Dict[str, Union[int, Dict[str, int]]]:
+        connections = list(self.connections.values())
+        return {
+            "connections": len(connections),
+            "users": len(self.user_connections),
+            "queued_messages": sum(c.queued for c in connections),
+            "max_queue_depth": max((c.queued for c in connections), default=0),
+            "sent": sum(c.sent for c in connections),
+            "coalesced": sum(c.coalesced for c in connections),
+            "dropped": sum(c.dropped for c in connections),
+            "removed": dict(self.removed)
+        }
 
 # Global WebSocket manager instance
 ws_manager = WebSocketManager()
@@ -0,0 +1,112 @@
+"""
+Throughput benchmark for batch generate-and-govern jobs.
+
+Runs a batch of topics through the real BatchJobManager, GovernancePipeline
+and ReviewWorkflow, with every agent replaced by a stub that simulates LLM /
+model latency with ``asyncio.sleep``. The generator and factuality stubs take
+a token from the shared "perplexity" rate limiter before their simulated LLM
+call, exactly like the real agents.
+
+Reports items/second and per-item latency for each concurrency limit, so the
+scaling with concurrency (and the ceiling imposed by --rate-limit) is visible.
+
+Usage:
+    python benchmarks/batch_throughput.py --items 64 --concurrency 1 2 4 8 16
+    python benchmarks/batch_throughput.py --items 64 --concurrency 4 16 --rate-limit 20
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.base_agent import BaseAgent
+from agents.registry import AgentRegistry
+from agents.rate_limiter import provider_limits
+from services.batch_jobs import BatchJobManager
+from workflows.governance_pipeline import GovernancePipeline
+from workflows.review_workflow import ReviewWorkflow
+
+
+class StubAgent(BaseAgent):
+    """Agent whose work is a fixed sleep, optionally behind the provider rate limit."""
+
+    def __init__(self, name, latency, result, provider=None):
+        super().__init__(name)
+        self.latency = latency
+        self.result = result
+        self.provider = provider
+
+    def process(self, content):
+        if self.provider:
+            provider_limits.acquire(self.provider)
+        time.sleep(self.latency)
+        return dict(self.result)
+
+    async def aprocess(self, content):
+        if self.provider:
+            await provider_limits.aacquire(self.provider)
+        await asyncio.sleep(self.latency)
+        return dict(self.result)
+
+
+def build_registry(args):
+    registry = AgentRegistry()
+    registry.register("content_generator", lambda: StubAgent(
+        "ContentGenerator", args.llm_latency, {"content": "Generated text.", "status": "generated"}, "perplexity"))
+    registry.register("factuality", lambda: StubAgent(
+        "FactualityChecker", args.llm_latency, {"status": "approved"}, "perplexity"))
+    registry.register("style_analyzer", lambda: StubAgent(
+        "StyleAnalyzer", args.model_latency, {"status": "approved"}))
+    registry.register("multimodal_reviewer", lambda: StubAgent(
+        "MultimodalReviewer", args.model_latency, {"status": "approved"}))
+    registry.register("consensus", lambda: StubAgent(
+        "ConsensusAgent", 0.0, {"final_decision": "approved"}))
+    return registry
+
+
+async def run_batch(manager, requests, concurrency):
+    start = time.perf_counter()
+    job = manager.submit(requests, concurrency)
+    await job.task
+    elapsed = time.perf_counter() - start
+    latencies = [result["execution_time"] for result in job.results]
+    return job, elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per stubbed LLM call")
+    parser.add_argument("--model-latency", type=float, default=0.05, help="seconds per stubbed local model call")
+    parser.add_argument("--review-mode", default="concurrent", choices=ReviewWorkflow.EXECUTION_MODES)
+    parser.add_argument("--rate-limit", type=float, default=0, help="perplexity requests/second (0 = unlimited)")
+    args = parser.parse_args()
+
+    provider_limits.configure("perplexity", args.rate_limit or None)
+    registry = build_registry(args)
+    pipeline = GovernancePipeline(ReviewWorkflow({"execution_mode": args.review_mode}, registry), registry)
+    manager = BatchJobManager(pipeline, max_concurrency=max(args.concurrency))
+    requests = [{"topic": f"Topic {i}", "type": "blog_post"} for i in range(args.items)]
+
+    print(f"{args.items} items, LLM {args.llm_latency * 1000:.0f} ms, model {args.model_latency * 1000:.0f} ms, "
+          f"review={args.review_mode}, rate limit={args.rate_limit or 'none'}")
+    print(f"{'concurrency':>11} {'items/s':>9} {'total (s)':>10} {'p50 item (s)':>13} {'max item (s)':>13} {'failed':>7}")
+    for concurrency in args.concurrency:
+        # Refill the bucket between runs so each run starts from the same state
+        provider_limits.configure("perplexity", args.rate_limit or None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            job, elapsed, latencies = asyncio.run(run_batch(manager, requests, concurrency))
+        print(f"{concurrency:>11} {args.items / elapsed:>9.2f} {elapsed:>10.2f} "
+              f"{statistics.median(latencies):>13.3f} {max(latencies):>13.3f} {job.failed:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Micro-benchmark: single-pass ClaimExtractor vs. the original per-pattern
+FactualityAgent._extract_claims (about 65 uncompiled regexes, each with a greedy tail).
+
+Usage:
+    python benchmarks/claim_extraction_benchmark.py
+    python benchmarks/claim_extraction_benchmark.py --sizes 1024 65536 1048576 --repeat 3
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.factcheck.claim_extractor import ClaimExtractor
+
+# The pattern list used by FactualityAgent._extract_claims before the
+# single-pass extractor, kept verbatim as the reference implementation.
+LEGACY_CLAIM_PATTERNS = [
+    r"(\d+% of .+)", r"(studies show .+)", r"(according to .+)", r"(research indicates .+)",
+    r"(\d+ out of \d+ .+)", r"(\d+x more .+)", r"(up to \d+% .+)", r"(over \d+.+ .+)",
+    r"(more than \d+ .+)", r"(\d+ times .+)", r"(nearly \d+% .+)", r"(approximately \d+ .+)",
+    r"(experts say .+)", r"(scientists found .+)", r"(researchers discovered .+)", r"(data shows .+)",
+    r"(analysis reveals .+)", r"(survey found .+)", r"(report shows .+)", r"(clinical trials .+)",
+    r"(peer-reviewed .+)", r"(in recent years .+)", r"(latest research .+)", r"(new study .+)",
+    r"(recent data .+)", r"(breakthrough study .+)", r"(compared to .+)", r"(better than .+)",
+    r"(faster than .+)", r"(more effective than .+)", r"(proven to be .+)", r"(proven fact .+)",
+    r"(guaranteed to .+)", r"(scientifically proven .+)", r"(clinically proven .+)",
+    r"(evidence suggests .+)", r"(shown to .+)", r"(published in .+)", r"(featured in .+)",
+    r"(as reported by .+)", r"(cited by .+)", r"(recommended by .+)", r"(doctors recommend .+)",
+    r"(fda approved .+)", r"(clinically tested .+)", r"(medical professionals .+)",
+    r"(market leader .+)", r"(industry standard .+)", r"(award-winning .+)", r"(bestselling .+)",
+    r"(top-rated .+)", r"(customers report .+)", r"(users experience .+)", r"(testimonials show .+)",
+    r"(reviews indicate .+)", r"(world's first .+)", r"(only .+ that .+)", r"(never before .+)",
+    r"(revolutionary .+)", r"(breakthrough .+)", r"(cutting-edge .+)",
+]
+
+
+def legacy_extract_claims(content):
+    """The original implementation: one full scan per pattern."""
+    claims = []
+    for pattern in LEGACY_CLAIM_PATTERNS:
+        for match in re.finditer(pattern, content, re.IGNORECASE):
+            claims.append(match.group(1))
+    return claims
+
+
+SAMPLE_SENTENCES = [
+    "Studies show that 45% of marketers now use AI tools daily.",
+    "According to a recent survey, remote work is here to stay.",
+    "Our platform is faster than any competing solution on the market.",
+    "Clinically proven ingredients support healthy skin.",
+    "The weather was pleasant and the team enjoyed the offsite.",
+    "Experts say the new approach reduces errors by up to 30% in production.",
+    "We shipped a new dashboard for the analytics team last week.",
+    "This is the only tool that integrates with every major CMS.",
+    "Customers report saving over 10 hours a week on reporting.",
+    "Good documentation helps new contributors get started quickly.",
+    "Revolutionary design meets everyday practicality.",
+    "Doctors recommend regular breaks from screens.",
+]
+
+
+def make_document(size_bytes, seed=0, sentences_per_line=6):
+    rng = random.Random(seed)
+    lines, line, total = [], [], 0
+    while total < size_bytes:
+        sentence = rng.choice(SAMPLE_SENTENCES)
+        line.append(sentence)
+        total += len(sentence) + 1
+        if len(line) == sentences_per_line:
+            lines.append(" ".join(line))
+            line = []
+    if line:
+        lines.append(" ".join(line))
+    return "\n".join(lines)[:size_bytes]
+
+
+def _time(fn, text, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 16 * 1024, 128 * 1024, 1024 * 1024])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    extractor = ClaimExtractor()
+    print(f"{'size':>9} {'legacy (ms)':>12} {'single-pass (ms)':>17} {'speedup':>8} "
+          f"{'legacy claims':>14} {'claims':>7} {'legacy chars':>13} {'claim chars':>12}")
+    for size in args.sizes:
+        text = make_document(size)
+        legacy_time, legacy_claims = _time(legacy_extract_claims, text, args.repeat)
+        new_time, new_claims = _time(extractor.extract, text, args.repeat)
+        print(
+            f"{size:>9} {legacy_time * 1000:>12.2f} {new_time * 1000:>17.2f} "
+            f"{legacy_time / new_time if new_time else float('inf'):>7.1f}x "
+            f"{len(legacy_claims):>14} {len(new_claims):>7} "
+            f"{sum(map(len, legacy_claims)):>13} {sum(len(c['text']) for c in new_claims):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
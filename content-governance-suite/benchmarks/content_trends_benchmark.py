@@ -0,0 +1,86 @@
+"""
+Content trend query benchmark: raw ContentHistory scan vs. the daily rollup.
+
+Reuses (or seeds) the SQLite file from dashboard_query_benchmark.py, makes
+sure the analytics indexes exist, backfills DailyContentRollup, then times:
+
+* raw     - GROUP BY date(created_at) over the window of history rows
+* rollup  - AnalyticsService.get_content_trends, one rollup row per day
+
+and checks that both return the same per-day totals.
+
+Usage:
+    python benchmarks/content_trends_benchmark.py --rows 1000000 --days 30 --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, func, case, inspect, select
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, ContentHistory
+from services.analytics_service import AnalyticsService
+from services.content_rollup import rebuild_daily_rollup
+from dashboard_query_benchmark import seed, timed
+
+
+def raw_content_trends(db, days):
+    """Trends straight from history, as get_content_trends computed them before the rollup."""
+    cutoff_day = (datetime.utcnow() - timedelta(days=days)).date()
+    day = func.date(ContentHistory.created_at)
+    daily_stats = db.query(
+        day.label('date'),
+        func.count(ContentHistory.id).label('total'),
+        func.sum(case((ContentHistory.final_decision == 'Approved', 1), else_=0)).label('approved')
+    ).filter(
+        ContentHistory.created_at >= datetime.combine(cutoff_day, datetime.min.time())
+    ).group_by(day).order_by('date').all()
+    return [{"date": str(stat.date), "total": stat.total, "approved": stat.approved} for stat in daily_stats]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--spread-days", type=int, default=90)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--db-path", default=os.path.join(tempfile.gettempdir(), "dashboard_benchmark.sqlite3"))
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db_path}")
+    seeded = inspect(engine).has_table("content_history")
+    if seeded:
+        with engine.connect() as conn:
+            seeded = conn.execute(select(func.count()).select_from(ContentHistory)).scalar() == args.rows
+    if not seeded:
+        Base.metadata.drop_all(bind=engine)
+        seed(engine, args.rows, args.spread_days)
+    Base.metadata.create_all(bind=engine)
+    for index in ContentHistory.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+    db = sessionmaker(bind=engine)()
+    days_written = rebuild_daily_rollup(db)
+    db.commit()
+
+    raw, raw_times = timed(lambda: raw_content_trends(db, args.days), args.runs)
+    rollup, rollup_times = timed(lambda: AnalyticsService(db, cache=None).get_content_trends(args.days), args.runs)
+
+    assert [(r["date"], r["total"], r["approved"]) for r in raw] == \
+           [(r["date"], r["total"], r["approved"]) for r in rollup]
+
+    print(f"{args.rows:,} history rows, {days_written} rollup days, window {args.days} days")
+    print(f"{'variant':<8} {'median (ms)':>12} {'min (ms)':>10}")
+    for label, times in (("raw", raw_times), ("rollup", rollup_times)):
+        print(f"{label:<8} {statistics.median(times) * 1000:>12.2f} {min(times) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Dashboard statistics benchmark against a seeded SQLite database.
+
+Seeds ``--rows`` ContentHistory rows (1M by default) spread over the last
+``--spread-days`` days into a SQLite file, then times:
+
+* legacy  - the original six queries (four counts, two averages)
+* single  - AnalyticsService.get_dashboard_stats, one conditional-aggregate query
+* cached  - the same call served from the dashboard TTL cache
+
+and checks that legacy and single return the same numbers. The seeded file is
+reused across runs unless --reseed is given.
+
+Usage:
+    python benchmarks/dashboard_query_benchmark.py --rows 1000000 --days 30 --runs 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, func, insert, inspect, select
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, ContentHistory
+from services.analytics_service import AnalyticsService, DashboardCache
+
+DECISIONS = ["Approved", "Needs Revision", "Rejected"]
+
+
+def seed(engine, rows, spread_days, chunk=20000):
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for offset in range(0, rows, chunk):
+            batch = []
+            for _ in range(min(chunk, rows - offset)):
+                created = now - timedelta(seconds=rng.uniform(0, spread_days * 86400))
+                batch.append({
+                    "content_type": "blog_post",
+                    "topic": f"Topic {rng.randint(0, 5000)}",
+                    "generated_content": "Generated content.",
+                    "final_decision": rng.choice(DECISIONS),
+                    "final_score": rng.random(),
+                    "factuality_score": rng.random(),
+                    "style_score": rng.random(),
+                    "generation_time": rng.uniform(1, 20),
+                    "created_at": created,
+                    "updated_at": created,
+                })
+            conn.execute(insert(ContentHistory), batch)
+    print(f"seeded {rows:,} rows")
+
+
+def legacy_dashboard_stats(db, days):
+    """The original implementation: six round-trips over the same window."""
+    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    window = ContentHistory.created_at >= cutoff_date
+    total = db.query(ContentHistory).filter(window).count()
+    approved = db.query(ContentHistory).filter(ContentHistory.final_decision == "Approved", window).count()
+    needs_revision = db.query(ContentHistory).filter(ContentHistory.final_decision == "Needs Revision", window).count()
+    rejected = db.query(ContentHistory).filter(ContentHistory.final_decision == "Rejected", window).count()
+    avg_scores = db.query(
+        func.avg(ContentHistory.final_score).label('avg_final'),
+        func.avg(ContentHistory.factuality_score).label('avg_factuality'),
+        func.avg(ContentHistory.style_score).label('avg_style')
+    ).filter(window).first()
+    avg_generation_time = db.query(func.avg(ContentHistory.generation_time)).filter(window).scalar()
+    return {
+        "content_stats": {"total": total, "approved": approved,
+                          "needs_revision": needs_revision, "rejected": rejected},
+        "quality_scores": {"average_final": float(avg_scores.avg_final or 0)},
+        "performance": {"avg_generation_time": float(avg_generation_time or 0)}
+    }
+
+
+def timed(fn, runs):
+    times = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--spread-days", type=int, default=90)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--db-path", default=os.path.join(tempfile.gettempdir(), "dashboard_benchmark.sqlite3"))
+    parser.add_argument("--reseed", action="store_true")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db_path}")
+    seeded = inspect(engine).has_table("content_history")
+    if seeded:
+        with engine.connect() as conn:
+            seeded = conn.execute(select(func.count()).select_from(ContentHistory)).scalar() == args.rows
+    if args.reseed or not seeded:
+        Base.metadata.drop_all(bind=engine)
+        seed(engine, args.rows, args.spread_days)
+    db = sessionmaker(bind=engine)()
+
+    legacy, legacy_times = timed(lambda: legacy_dashboard_stats(db, args.days), args.runs)
+    single, single_times = timed(lambda: AnalyticsService(db, cache=None).get_dashboard_stats(args.days), args.runs)
+    cached_service = AnalyticsService(db, cache=DashboardCache(ttl_seconds=60))
+    cached_service.get_dashboard_stats(args.days)
+    _, cached_times = timed(lambda: cached_service.get_dashboard_stats(args.days), args.runs)
+
+    assert legacy["content_stats"] == {k: single["content_stats"][k] for k in legacy["content_stats"]}
+    assert abs(legacy["quality_scores"]["average_final"] - single["quality_scores"]["average_final"]) < 1e-9
+
+    print(f"{args.rows:,} rows, window {args.days} days ({single['content_stats']['total']:,} rows in window)")
+    print(f"{'variant':<8} {'median (ms)':>12} {'min (ms)':>10}")
+    for label, times in (("legacy", legacy_times), ("single", single_times), ("cached", cached_times)):
+        print(f"{label:<8} {statistics.median(times) * 1000:>12.2f} {min(times) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Health-check latency while export requests are being rendered.
+
+Serves three routes from one FastAPI app over an in-process ASGI transport
+(so everything shares a single event loop, like one uvicorn worker):
+
+* /health           - the API's health check
+* /legacy/export    - renders on the event loop and copies the buffer, as the
+                      export endpoints did originally
+* /export           - ExportService.render (process pool + artifact cache) and
+                      a FileResponse streamed from the cached file
+
+For each variant, --requests export requests are fired with --concurrency in
+flight, while /health is probed every --probe-ms. Reported: export
+throughput and health-check latency percentiles. A second pass repeats the
+same payloads to show cache hits.
+
+Usage:
+    python benchmarks/export_latency.py --requests 40 --concurrency 8 --workers 2
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse, FileResponse
+from services.export_service import ExportService, EXPORT_FORMATS
+
+
+def build_app(service):
+    app = FastAPI()
+
+    @app.get("/health")
+    def health_check():
+        return {"status": "ok"}
+
+    @app.post("/legacy/export")
+    async def legacy_export(content_data: dict):
+        buffer = service.export_to_pdf(content_data)
+        return StreamingResponse(io.BytesIO(buffer.read()), media_type="application/pdf")
+
+    @app.post("/export")
+    async def export(content_data: dict):
+        path = await service.render("pdf", content_data)
+        return FileResponse(path, media_type=EXPORT_FORMATS["pdf"][2], filename="content_report.pdf")
+
+    return app
+
+
+def make_payload(i, paragraphs):
+    text = " ".join(f"Paragraph {p} of report {i} about renewable energy adoption." * 8 for p in range(paragraphs))
+    return {
+        "generated_content": {"content": text, "metadata": {"topic": f"Report {i}", "content_type": "blog_post"}},
+        "final_decision": {"final_decision": "Approved", "final_score": 0.9, "summary": ["ok"]},
+    }
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))] if values else 0.0
+
+
+async def run_variant(client, route, payloads, concurrency, probe_ms):
+    semaphore = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+    health = []
+
+    async def export(payload):
+        async with semaphore:
+            response = await client.post(route, json=payload)
+            assert response.status_code == 200 and response.content.startswith(b"%PDF")
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/health")
+            health.append(time.perf_counter() - start)
+            await asyncio.sleep(probe_ms / 1000)
+
+    prober = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(export(payload) for payload in payloads))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await prober
+    return elapsed, health
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service = ExportService(cache_dir=cache_dir, max_workers=args.workers)
+        transport = httpx.ASGITransport(app=build_app(service))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # Start the worker processes before timing
+            await client.post("/export", json=make_payload(-1, 1))
+            payloads = [make_payload(i, args.paragraphs) for i in range(args.requests)]
+
+            print(f"{args.requests} PDF exports, {args.concurrency} in flight, {args.workers} export workers, "
+                  f"{os.cpu_count()} CPUs")
+            print(f"{'variant':<14} {'exports/s':>10} {'health p50':>11} {'health p95':>11} {'health max':>11}")
+            for label, route in (("legacy", "/legacy/export"), ("process pool", "/export"),
+                                 ("cached", "/export")):
+                elapsed, health = await run_variant(client, route, payloads, args.concurrency, args.probe_ms)
+                print(f"{label:<14} {len(payloads) / elapsed:>10.1f} "
+                      f"{percentile(health, 0.5) * 1000:>9.1f}ms {percentile(health, 0.95) * 1000:>9.1f}ms "
+                      f"{max(health) * 1000:>9.1f}ms")
+        service.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--probe-ms", type=float, default=10)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
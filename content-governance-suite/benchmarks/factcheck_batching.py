@@ -0,0 +1,148 @@
+"""
+Fact-check latency of one long document: a single prompt with every claim
+versus claim batches (FACTCHECK_BATCH_SIZE) checked concurrently
+(FACTCHECK_MAX_CONCURRENCY).
+
+Documents carry --claims distinct claims built from the labeled fixture
+sentences of factcheck_cascade.py. A local stub LLM answers with JSON
+verdicts from those labels and sleeps like a hosted model would:
+
+    --base-ms + prompt tokens * --prefill-ms + output tokens * --token-ms
+
+(tokens estimated as characters / 4). Prompts whose prompt plus output
+tokens exceed --context-tokens fail with a context-length error, like the
+real API. The cascade and the verdict cache are off, so every claim is sent
+to the LLM. --rps caps LLM calls per second through provider_limits.
+
+Reported per configuration: mean and max seconds per document, LLM calls
+per document, largest prompt in tokens, errors, and whether the flagged
+claims match the labeled ratings exactly.
+
+Usage:
+    python benchmarks/factcheck_batching.py --claims 50 200 --batch-sizes 5 10 25 --concurrency 1 4 8
+    python benchmarks/factcheck_batching.py --async --rps 5
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.rate_limiter import provider_limits
+from factcheck_cascade import LABELED_SENTENCES, StubFactCheckLLM, make_agent
+
+_REPORT_SUFFIX = re.compile(r"\s*\(report \d+\)")
+
+
+def make_claim_document(claims):
+    """A document with `claims` distinct claims; the report number keeps them from being deduplicated."""
+    sentences = [LABELED_SENTENCES[k % len(LABELED_SENTENCES)][0] for k in range(claims)]
+    return " ".join(f"{sentence[:-1]} (report {k})." for k, sentence in enumerate(sentences))
+
+
+def expected_flags(claims):
+    return sum(LABELED_SENTENCES[k % len(LABELED_SENTENCES)][1] != "ACCURATE" for k in range(claims))
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+class TokenDelayLLM(StubFactCheckLLM):
+    """Labeled-fixture fact-checker whose latency grows with prompt and output tokens."""
+
+    def __init__(self, base_ms=200.0, prefill_ms=0.05, token_ms=10.0, context_tokens=8192):
+        super().__init__()
+        self.base_ms, self.prefill_ms, self.token_ms = base_ms, prefill_ms, token_ms
+        self.context_tokens = context_tokens
+        self.max_prompt_tokens = 0
+        self._lock = threading.Lock()
+
+    def rate(self, claim):
+        return super().rate(_REPORT_SUFFIX.sub("", claim))
+
+    def _timed_reply(self, prompt):
+        reply = self._reply(prompt)
+        prompt_tokens, output_tokens = estimate_tokens(prompt.to_string()), estimate_tokens(reply.content)
+        with self._lock:
+            self.max_prompt_tokens = max(self.max_prompt_tokens, prompt_tokens)
+        if prompt_tokens + output_tokens > self.context_tokens:
+            raise ValueError(f"context length exceeded: {prompt_tokens} + {output_tokens} > {self.context_tokens}")
+        return reply, (self.base_ms + prompt_tokens * self.prefill_ms + output_tokens * self.token_ms) / 1000
+
+    def _answer(self, prompt):
+        reply, delay = self._timed_reply(prompt)
+        time.sleep(delay)
+        return reply
+
+    async def _aanswer(self, prompt):
+        reply, delay = self._timed_reply(prompt)
+        await asyncio.sleep(delay)
+        return reply
+
+    def _reply(self, prompt):
+        with self._lock:
+            return super()._reply(prompt)
+
+
+def run_config(args, claims, batch_size, concurrency):
+    llm = TokenDelayLLM(args.base_ms, args.prefill_ms, args.token_ms, args.context_tokens)
+    agent = make_agent(llm, cascade=False, claim_batch_size=batch_size, max_concurrency=concurrency)
+    document = make_claim_document(claims)
+    timings, results = [], []
+    for _ in range(args.docs):
+        start = time.perf_counter()
+        if args.use_async:
+            result = asyncio.run(agent.aprocess({"content": document}))
+        else:
+            result = agent.process({"content": document})
+        timings.append(time.perf_counter() - start)
+        results.append(result)
+    errors = sum(result["status"] == "error" for result in results)
+    correct = all(result.get("fact_check", {}).get("llm", {}).get("unrated_claims") == 0
+                  and len(result["fact_check"]["flagged_claims"]) == expected_flags(claims) for result in results)
+    return sum(timings) / len(timings), max(timings), llm.calls / args.docs, llm.max_prompt_tokens, errors, correct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, nargs="+", default=[20, 100, 300])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[5, 10, 25])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--docs", type=int, default=1, help="documents per configuration")
+    parser.add_argument("--base-ms", type=float, default=200)
+    parser.add_argument("--prefill-ms", type=float, default=0.05)
+    parser.add_argument("--token-ms", type=float, default=10)
+    parser.add_argument("--context-tokens", type=int, default=8192)
+    parser.add_argument("--rps", type=float, default=0, help="provider_limits rate for perplexity (0 = unlimited)")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="use aprocess instead of process")
+    args = parser.parse_args()
+
+    provider_limits.configure("perplexity", args.rps or None, max(args.concurrency) if args.rps else None)
+    print(f"stub LLM: {args.base_ms:g}ms + {args.prefill_ms:g}ms/prompt token + {args.token_ms:g}ms/output token, "
+          f"context {args.context_tokens} tokens, {'async' if args.use_async else 'sync'}, "
+          f"rps {args.rps or 'unlimited'}")
+    for claims in args.claims:
+        print(f"\n{claims} claims per document")
+        print(f"{'mode':<24} {'mean s':>8} {'max s':>8} {'speedup':>8} {'calls':>6} {'max prompt':>10} "
+              f"{'errors':>6}  correct")
+        baseline = None
+        configs = [("single prompt", claims, 1)] + [
+            (f"batch {size} x {concurrency}", size, concurrency)
+            for size in args.batch_sizes if size < claims for concurrency in args.concurrency]
+        for name, batch_size, concurrency in configs:
+            mean, worst, calls, max_prompt, errors, correct = run_config(args, claims, batch_size, concurrency)
+            if baseline is None:
+                baseline = mean if not errors else 0.0  # no speedup against a prompt that overflowed
+            speedup = f"{baseline / mean:.2f}x" if baseline else "-"
+            print(f"{name:<24} {mean:>8.2f} {worst:>8.2f} {speedup:>8} {calls:>6.0f} {max_prompt:>10} "
+                  f"{errors:>6}  {'yes' if correct else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+LLM calls avoided by the FactualityAgent evaluation cascade, and how often
+its pass/fail decision matches always-LLM mode.
+
+The fixture set is built from LABELED_SENTENCES: claim sentences carry the
+rating a fact-checker gives them, other sentences trigger (or satisfy) the
+compliance rules or are neutral. Documents are drawn from it with a fixed
+seed. A stub LLM answers every fact-check prompt from those labels after
+--llm-ms, so runs are deterministic and need no API key. The verdict cache
+is disabled, so every document is decided on its own.
+
+Modes: always-LLM (FACTCHECK_CASCADE=0), then the cascade at each
+--min-risk (FACTCHECK_MIN_CLAIM_RISK; 0 only skips content that fails
+anyway). Reported per mode: LLM calls, fraction avoided, factuality status
+agreement with always-LLM, agreement of the final ConsensusAgent decision,
+mean absolute overall_score difference, and wall time. For the consensus,
+each document is paired with a style score drawn from --style-scores (with
+the same seed) and no multimodal review.
+
+Usage:
+    python benchmarks/factcheck_cascade.py --docs 400 --min-risk 0 0.5 0.75 --llm-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from agents.factcheck.factuality_agent import FactualityAgent
+from agents.consensus.consensus_agent import ConsensusAgent
+
+# (sentence, rating of the claim it contains; None for sentences without claims)
+LABELED_SENTENCES = [
+    ("According to the WHO, regular exercise lowers the risk of heart disease.", "ACCURATE"),
+    ("Published in Nature, the study followed two thousand households for a year.", "ACCURATE"),
+    ("Data shows remote teams adopted video calls within months.", "ACCURATE"),
+    ("In recent years electric vehicle sales have grown every quarter.", "ACCURATE"),
+    ("Customers report shorter onboarding times after the redesign.", "ACCURATE"),
+    ("Recommended by the national library association for school reading lists.", "ACCURATE"),
+    ("Studies show that our app makes teams 3x more productive.", "QUESTIONABLE"),
+    ("Experts say this is the best time to invest in crypto.", "QUESTIONABLE"),
+    ("Our platform is the industry standard for content review.", "QUESTIONABLE"),
+    ("It is faster than any competing tool on the market.", "QUESTIONABLE"),
+    ("Award-winning support is available around the clock.", "QUESTIONABLE"),
+    ("Nearly 90% of readers prefer shorter articles.", "QUESTIONABLE"),
+    ("Research indicates that people read less online.", "QUESTIONABLE"),
+    ("Clinically proven to cure insomnia in a single night.", "INACCURATE"),
+    ("Doctors recommend drinking ten liters of water a day.", "INACCURATE"),
+    ("The world's first smartphone was released in 2015.", "INACCURATE"),
+    ("Scientifically proven results show vitamin C prevents every cold.", "INACCURATE"),
+    ("Over 100 countries have banned coal power entirely.", "INACCURATE"),
+    ("FDA approved for treating anxiety in pets.", "INACCURATE"),
+]
+COMPLIANCE_SENTENCES = [
+    "We store your email address to send product updates.",
+    "Results are guaranteed within a week.",
+    "Our filters never fails to catch spam.",
+]
+CONSENT_SENTENCE = "We only contact you with your explicit consent."
+NEUTRAL_SENTENCES = [
+    "Our team wrote this guide to help you get started.",
+    "Read on for practical tips and examples.",
+    "Each section ends with a short checklist.",
+    "Thanks for reading and sharing your feedback.",
+    "Contact us with any questions about the new features.",
+]
+
+
+def make_labeled_documents(count, seed=0):
+    """Documents of 3-9 sentences: 0-4 claims, sometimes compliance problems."""
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        sentences = rng.sample(NEUTRAL_SENTENCES, rng.randint(1, 3))
+        sentences += [sentence for sentence, _ in rng.sample(LABELED_SENTENCES, rng.choice([0, 1, 1, 2, 2, 3, 4]))]
+        if rng.random() < 0.45:
+            sentences += rng.sample(COMPLIANCE_SENTENCES, rng.randint(1, 3))
+        if rng.random() < 0.3:
+            sentences.append(CONSENT_SENTENCE)
+        rng.shuffle(sentences)
+        documents.append(" ".join(sentences))
+    return documents
+
+
+class StubFactCheckLLM:
+    """Answers fact-check prompts from LABELED_SENTENCES, like a perfectly consistent fact-checker."""
+
+    def __init__(self, delay_ms=0.0):
+        self.delay = delay_ms / 1000
+        self.calls = 0
+        self.runnable = RunnableLambda(self._answer, afunc=self._aanswer)
+
+    def rate(self, claim):
+        for sentence, rating in LABELED_SENTENCES:
+            if claim.rstrip(".!?").lower() in sentence.lower():
+                return rating
+        return "QUESTIONABLE"
+
+    @staticmethod
+    def prompt_claims(prompt):
+        """The [{"id", "claim"}] list the agent put into the prompt"""
+        text = prompt.to_string()
+        return json.JSONDecoder().raw_decode(text, text.index("Claims: ") + len("Claims: "))[0]
+
+    def _reply(self, prompt):
+        self.calls += 1
+        verdicts = [{"id": item["id"], "rating": self.rate(item["claim"]), "reasoning": "labeled fixture"}
+                    for item in self.prompt_claims(prompt)]
+        return AIMessage(content=json.dumps({"verdicts": verdicts}))
+
+    def _answer(self, prompt):
+        time.sleep(self.delay)
+        return self._reply(prompt)
+
+    async def _aanswer(self, prompt):
+        await asyncio.sleep(self.delay)
+        return self._reply(prompt)
+
+
+def make_agent(llm, **config):
+    os.environ.setdefault("PPLX_API_KEY", "benchmark")
+    agent = FactualityAgent({"verdict_cache_path": "", "verdict_cache_ttl": 0, **config})
+    agent.llm = llm.runnable
+    agent.log_activity = lambda *args, **kwargs: None
+    return agent
+
+
+def consensus_decisions(results, style_scores):
+    """Final decisions for factuality results paired with a StyleAnalyzer score each"""
+    consensus = ConsensusAgent()
+    consensus.log_activity = lambda *args, **kwargs: None
+    return [consensus.process([
+        {"agent": "FactualityChecker", "result": result},
+        {"agent": "StyleAnalyzer", "result": {"style_score": style_score, "status": "approved"}},
+        {"agent": "MultimodalReviewer", "result": {"status": "skipped"}},
+    ])["final_decision"] for result, style_score in zip(results, style_scores)]
+
+
+def run_mode(documents, llm_ms, **config):
+    llm = StubFactCheckLLM(llm_ms)
+    agent = make_agent(llm, **config)
+    start = time.perf_counter()
+    results = [agent.process({"content": document}) for document in documents]
+    return results, llm.calls, time.perf_counter() - start, agent.get_cascade_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=400)
+    parser.add_argument("--min-risk", type=float, nargs="+", default=[0.0, 0.5, 0.75])
+    parser.add_argument("--llm-ms", type=float, default=20)
+    parser.add_argument("--style-scores", type=float, nargs="+", default=[0.7, 0.8, 0.9, 1.0])
+    args = parser.parse_args()
+
+    documents = make_labeled_documents(args.docs)
+    rng = random.Random(0)
+    style_scores = [rng.choice(args.style_scores) for _ in documents]
+    reference, reference_calls, reference_time, _ = run_mode(documents, args.llm_ms, cascade=False)
+    reference_decisions = consensus_decisions(reference, style_scores)
+    passed = sum(result["status"] == "passed" for result in reference)
+    approved = reference_decisions.count("Approved")
+    print(f"{args.docs} labeled documents ({passed} pass, {approved} approved in always-LLM mode), "
+          f"stub LLM {args.llm_ms:g}ms/call")
+    print(f"{'mode':<20} {'LLM calls':>9} {'avoided':>8} {'agreement':>9} {'decisions':>9} {'score MAE':>9} "
+          f"{'seconds':>8}  outcomes")
+    print(f"{'always-LLM':<20} {reference_calls:>9} {0:>8.1%} {1:>9.1%} {1:>9.1%} {0:>9.3f} {reference_time:>8.2f}")
+    for min_risk in args.min_risk:
+        results, calls, elapsed, stats = run_mode(documents, args.llm_ms, cascade=True, min_claim_risk=min_risk)
+        agreement = sum(ours["status"] == theirs["status"] for ours, theirs in zip(results, reference)) / len(results)
+        decisions = sum(ours == theirs for ours, theirs in zip(consensus_decisions(results, style_scores),
+                                                               reference_decisions)) / len(results)
+        score_mae = sum(abs(ours["overall_score"] - theirs["overall_score"])
+                        for ours, theirs in zip(results, reference)) / len(results)
+        outcomes = ", ".join(f"{name}={count}" for name, count in stats["outcomes"].items() if count)
+        print(f"{f'cascade risk>={min_risk:g}':<20} {calls:>9} {1 - calls / reference_calls:>8.1%} "
+              f"{agreement:>9.1%} {decisions:>9.1%} {score_mae:>9.3f} {elapsed:>8.2f}  {outcomes}")
+
+
+if __name__ == "__main__":
+    main()
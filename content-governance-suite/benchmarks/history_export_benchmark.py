@@ -0,0 +1,80 @@
+"""
+Bulk ContentHistory export: throughput and peak memory per format.
+
+Reuses (or seeds) the SQLite file from dashboard_query_benchmark.py and
+streams the history through HistoryExportService for a small window
+(--small-days) and for every row, discarding the bytes. Each export runs
+twice: once timed, once under tracemalloc to record the peak Python memory
+allocated while streaming. Peak memory should not grow with the row count.
+
+Usage:
+    python benchmarks/history_export_benchmark.py --rows 1000000 --formats csv ndjson parquet
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, func, inspect, select
+from database.models import Base, ContentHistory
+from services.history_export import HistoryExportService, PYARROW_AVAILABLE
+from dashboard_query_benchmark import seed
+
+
+def drain(service, export_format, days):
+    rows_bytes = 0
+    for chunk in service.stream(export_format, days=days):
+        rows_bytes += len(chunk)
+    return rows_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--spread-days", type=int, default=90)
+    parser.add_argument("--small-days", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--formats", nargs="+", default=["csv", "ndjson", "parquet", "arrow"])
+    parser.add_argument("--db-path", default=os.path.join(tempfile.gettempdir(), "dashboard_benchmark.sqlite3"))
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db_path}")
+    seeded = inspect(engine).has_table("content_history")
+    if seeded:
+        with engine.connect() as conn:
+            seeded = conn.execute(select(func.count()).select_from(ContentHistory)).scalar() == args.rows
+    if not seeded:
+        Base.metadata.drop_all(bind=engine)
+        seed(engine, args.rows, args.spread_days)
+
+    service = HistoryExportService(engine=engine, batch_size=args.batch_size)
+    formats = [f for f in args.formats if PYARROW_AVAILABLE or f in ("csv", "ndjson")]
+    with engine.connect() as conn:
+        small_rows = conn.execute(select(func.count()).select_from(ContentHistory).where(
+            ContentHistory.created_at >= func.datetime("now", f"-{args.small_days} days"))).scalar()
+
+    print(f"batch size {args.batch_size}; windows: last {args.small_days} day(s) (~{small_rows:,} rows) "
+          f"and all {args.rows:,} rows")
+    print(f"{'format':<8} {'rows':>10} {'MB out':>8} {'rows/s':>10} {'peak MB':>8}")
+    for export_format in formats:
+        for days, rows in ((args.small_days, small_rows), (None, args.rows)):
+            start = time.perf_counter()
+            size = drain(service, export_format, days)
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            drain(service, export_format, days)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print(f"{export_format:<8} {rows:>10,} {size / 1e6:>8.1f} {rows / elapsed:>10,.0f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Job queue throughput as the number of worker processes grows.
+
+Workers run the real GovernancePipeline and JobWorker, but with stub agents
+that spend --cpu-ms of CPU and --io-ms waiting (standing in for model
+inference and LLM calls) per agent call. For each process count, --jobs jobs
+are enqueued after the workers have warmed up, and the time until all of
+them have succeeded is measured. The queue is a temporary SQLite file unless
+--queue points at Redis.
+
+Usage:
+    python benchmarks/queue_scaling.py --jobs 200 --processes 1 2 4 --cpu-ms 5 --io-ms 50
+"""
+
+import argparse
+import functools
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.base_agent import BaseAgent
+from agents.registry import AgentRegistry
+from services.job_queue import open_job_queue
+from services.job_worker import start_workers, stop_workers
+
+
+class StubAgent(BaseAgent):
+    def __init__(self, name, result, cpu_ms, io_ms):
+        super().__init__(name)
+        self.result = result
+        self.cpu_ms = cpu_ms
+        self.io_ms = io_ms
+
+    def process(self, content):
+        deadline = time.process_time() + self.cpu_ms / 1000
+        while time.process_time() < deadline:
+            pass
+        time.sleep(self.io_ms / 1000)
+        return dict(self.result)
+
+
+def stub_registry(cpu_ms, io_ms):
+    # Runs in each worker process: keep the pipeline's step logging out of the report
+    sys.stdout = open(os.devnull, "w")
+    results = {
+        "content_generator": ("ContentGenerator", {"content": "Text", "status": "generated"}),
+        "factuality": ("FactualityChecker", {"status": "approved", "overall_score": 0.9}),
+        "style_analyzer": ("StyleAnalyzer", {"status": "approved", "style_score": 0.8}),
+        "multimodal_reviewer": ("MultimodalReviewer", {"status": "approved", "score": 0.9}),
+        "consensus": ("ConsensusAgent", {"final_decision": "Approved", "final_score": 0.9}),
+    }
+    registry = AgentRegistry()
+    for name, (agent_name, result) in results.items():
+        registry.register(name, functools.partial(StubAgent, agent_name, result, cpu_ms, io_ms))
+    return registry
+
+
+def drain(queue, count, timeout=600):
+    job_ids = [queue.enqueue({"topic": f"Benchmark topic {i}"}) for i in range(count)]
+    deadline = time.monotonic() + timeout
+    pending = set(job_ids)
+    while pending:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{len(pending)} jobs still pending")
+        pending = {job_id for job_id in pending if queue.get(job_id)["status"] not in ("succeeded", "failed")}
+        time.sleep(0.02)
+    failed = sum(queue.get(job_id)["status"] == "failed" for job_id in job_ids)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=4, help="jobs in flight per process")
+    parser.add_argument("--cpu-ms", type=float, default=5)
+    parser.add_argument("--io-ms", type=float, default=50)
+    parser.add_argument("--queue", default=None, help="redis://... (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    print(f"{args.jobs} jobs, {args.concurrency} jobs/process, 5 agent calls/job at "
+          f"{args.cpu_ms:g}ms CPU + {args.io_ms:g}ms wait, {os.cpu_count()} CPUs")
+    print(f"{'processes':>9} {'seconds':>8} {'jobs/s':>8} {'speedup':>8} {'failed':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        queue_url = args.queue or f"sqlite:///{os.path.join(tmp, 'jobs.sqlite3')}"
+        queue = open_job_queue(queue_url)
+        baseline = None
+        for processes in args.processes:
+            workers = start_workers(processes, queue_url=queue_url, concurrency=args.concurrency,
+                                    registry_factory=functools.partial(stub_registry, args.cpu_ms, args.io_ms),
+                                    poll_interval=0.01)
+            try:
+                drain(queue, processes * args.concurrency)  # warm up: processes started, agents built
+                start = time.perf_counter()
+                failed = drain(queue, args.jobs)
+                elapsed = time.perf_counter() - start
+            finally:
+                stop_workers(workers, timeout=30)
+            throughput = args.jobs / elapsed
+            baseline = baseline or throughput
+            print(f"{processes:>9} {elapsed:>8.2f} {throughput:>8.1f} {throughput / baseline:>7.2f}x {failed:>7}")
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
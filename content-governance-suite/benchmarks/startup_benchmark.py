@@ -0,0 +1,114 @@
+"""
+Startup-time benchmark for the API.
+
+Each measurement runs in a fresh interpreter so nothing is cached between runs:
+
+* cold import  - time to ``import api.main``
+* startup      - time for the app's startup handlers (TestClient context entry)
+* first request - latency of the first request to ``--endpoint``
+
+Modes compared:
+
+* lazy     - the default; agents and models are built on first use
+* eager    - PRELOAD_AGENTS=1, every agent is built during startup
+* baseline - optional, the same measurements against an older git revision
+             (``--baseline-ref``), checked out into a temporary worktree
+
+Usage:
+    python benchmarks/startup_benchmark.py --runs 3
+    python benchmarks/startup_benchmark.py --baseline-ref HEAD~5 --endpoint /agents/status
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = r"""
+import json, os, sys, time
+sys.path.insert(0, os.getcwd())
+t0 = time.perf_counter()
+import api.main as main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    t2 = time.perf_counter()
+    method, endpoint = sys.argv[1], sys.argv[2]
+    payload = {"type": "blog_post", "topic": "Startup benchmark", "target_audience": "general"}
+    response = client.post(endpoint, json=payload) if method == "POST" else client.get(endpoint)
+    t3 = time.perf_counter()
+print("@@RESULT@@" + json.dumps({
+    "import": t1 - t0,
+    "startup": t2 - t1,
+    "first_request": t3 - t2,
+    "status_code": response.status_code,
+}))
+"""
+
+
+def _run_child(cwd: str, method: str, endpoint: str, env_overrides: dict) -> dict:
+    env = dict(os.environ, **env_overrides)
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, method, endpoint],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("@@RESULT@@"):
+            return json.loads(line[len("@@RESULT@@"):])
+    raise RuntimeError(f"Benchmark child failed in {cwd}:\n{proc.stderr[-2000:]}")
+
+
+def _measure(label: str, cwd: str, runs: int, method: str, endpoint: str, env_overrides: dict) -> dict:
+    samples = [_run_child(cwd, method, endpoint, env_overrides) for _ in range(runs)]
+    summary = {"mode": label, "status_code": samples[-1]["status_code"]}
+    for key in ("import", "startup", "first_request"):
+        summary[key] = statistics.median(s[key] for s in samples)
+    summary["total"] = summary["import"] + summary["startup"] + summary["first_request"]
+    return summary
+
+
+def _print_table(rows):
+    print(f"{'mode':<10} {'import (s)':>11} {'startup (s)':>12} {'1st req (s)':>12} {'total (s)':>10} {'status':>7}")
+    for row in rows:
+        print(
+            f"{row['mode']:<10} {row['import']:>11.3f} {row['startup']:>12.3f} "
+            f"{row['first_request']:>12.3f} {row['total']:>10.3f} {row['status_code']:>7}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per mode (median is reported)")
+    parser.add_argument("--endpoint", default="/health", help="endpoint hit by the first request")
+    parser.add_argument("--method", default="GET", choices=["GET", "POST"])
+    parser.add_argument("--baseline-ref", help="git revision to measure as the 'before' tree")
+    args = parser.parse_args()
+
+    rows = [
+        _measure("lazy", ROOT, args.runs, args.method, args.endpoint, {"PRELOAD_AGENTS": "0"}),
+        _measure("eager", ROOT, args.runs, args.method, args.endpoint, {"PRELOAD_AGENTS": "1"}),
+    ]
+
+    if args.baseline_ref:
+        repo_root = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], cwd=ROOT, text=True).strip()
+        suite_dir = os.path.relpath(ROOT, repo_root)
+        with tempfile.TemporaryDirectory() as tmp:
+            worktree = os.path.join(tmp, "baseline")
+            subprocess.run(["git", "worktree", "add", "--detach", worktree, args.baseline_ref],
+                           cwd=repo_root, check=True, capture_output=True)
+            try:
+                rows.append(_measure("baseline", os.path.join(worktree, suite_dir), args.runs,
+                                     args.method, args.endpoint, {}))
+            finally:
+                subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=repo_root, capture_output=True)
+
+    _print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
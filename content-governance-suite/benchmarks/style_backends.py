@@ -0,0 +1,112 @@
+"""
+Accuracy and CPU cost of the StyleAnalyzerAgent inference backends.
+
+For both style models (sentiment, toxicity), a fixed corpus of
+sentence-aligned chunks is classified by every backend in --backends. Per
+backend it reports:
+
+* agreement - share of chunks whose label matches the fp32 PyTorch label
+* max dscore - largest score difference on chunks where the labels agree
+* p50 / p95  - single-chunk latency (batch of 1)
+* chunks/s   - throughput with --batch-size chunks per call
+* load       - time to build the classifier (includes the one-off ONNX
+               export and quantization when not cached yet)
+
+--synthetic uses randomly initialised models with the production
+architectures (see style_model_memory.py). Their near-uniform logits make
+label flips from quantization more likely than with the real checkpoints,
+so validate agreement with the real models before switching backends.
+
+Usage:
+    python benchmarks/style_backends.py --docs 16 --batch-size 8
+    python benchmarks/style_backends.py --synthetic
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.sentiment.chunking import chunk_text
+from agents.sentiment.inference_backends import load_classifier, INFERENCE_BACKENDS
+from style_throughput import make_corpus
+from style_model_memory import build_synthetic_models
+
+MODELS = {
+    "sentiment": ("sentiment-analysis", "cardiffnlp/twitter-roberta-base-sentiment-latest"),
+    "toxicity": ("text-classification", "martin-ha/toxic-comment-model"),
+}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def evaluate(classifier, chunks, batch_size, latency_samples):
+    results = classifier(chunks, batch_size=batch_size, truncation=True)
+
+    latencies = []
+    for chunk in chunks[:latency_samples]:
+        start = time.perf_counter()
+        classifier([chunk], batch_size=1, truncation=True)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    classifier(chunks, batch_size=batch_size, truncation=True)
+    throughput = len(chunks) / (time.perf_counter() - start)
+    return results, latencies, throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(INFERENCE_BACKENDS), choices=INFERENCE_BACKENDS)
+    parser.add_argument("--docs", type=int, default=16)
+    parser.add_argument("--doc-chars", type=int, default=2000)
+    parser.add_argument("--max-chunk-tokens", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--latency-samples", type=int, default=50)
+    parser.add_argument("--synthetic", action="store_true", help="random-weight models, no Hub download")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("STYLE_ONNX_CACHE_DIR", os.path.join(tmp, "onnx"))
+        models = dict(MODELS)
+        if args.synthetic:
+            paths = build_synthetic_models(tmp)
+            models = {name: (task, paths[name]) for name, (task, _) in MODELS.items()}
+
+        corpus = make_corpus(args.docs, args.doc_chars)
+        for name, (task, model) in models.items():
+            reference = None
+            rows = []
+            for backend in ["pytorch"] + [b for b in args.backends if b != "pytorch"]:
+                start = time.perf_counter()
+                classifier = load_classifier(task, model, backend)
+                load_time = time.perf_counter() - start
+                if reference is None:
+                    chunks = [chunk for doc in corpus
+                              for chunk in chunk_text(doc, classifier.tokenizer, args.max_chunk_tokens)]
+                results, latencies, throughput = evaluate(classifier, chunks, args.batch_size, args.latency_samples)
+                if reference is None:
+                    reference = results
+                agree = [(ours, theirs) for ours, theirs in zip(results, reference) if ours["label"] == theirs["label"]]
+                rows.append((backend, len(agree) / len(reference),
+                             max((abs(ours["score"] - theirs["score"]) for ours, theirs in agree), default=0.0),
+                             statistics.median(latencies), percentile(latencies, 0.95), throughput, load_time))
+
+            print(f"\n{name}: {model} - {len(chunks)} chunks, batch size {args.batch_size}, {os.cpu_count()} CPUs")
+            print(f"{'backend':<10} {'agreement':>9} {'max dscore':>10} {'p50':>8} {'p95':>8} {'chunks/s':>9} "
+                  f"{'speedup':>8} {'load':>7}")
+            baseline = rows[0][5]
+            for backend, agreement, score_diff, p50, p95, throughput, load_time in rows:
+                print(f"{backend:<10} {agreement:>9.1%} {score_diff:>10.4f} {p50 * 1000:>6.1f}ms {p95 * 1000:>6.1f}ms "
+                      f"{throughput:>9.1f} {throughput / baseline:>7.2f}x {load_time:>6.1f}s")
+
+
+if __name__ == "__main__":
+    main()
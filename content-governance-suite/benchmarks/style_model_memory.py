@@ -0,0 +1,151 @@
+"""
+Memory of N API workers running StyleAnalyzerAgent, with and without the
+style model server.
+
+* local  - every worker loads its own sentiment and toxicity models
+* server - one model server process holds the models; workers reach it
+           over a Unix socket (STYLE_MODEL_SERVER)
+
+Each worker is a separate (spawned) process that builds the agent and
+analyzes a document, then idles while memory is sampled. Reported: the sum
+of PSS (proportional set size, shared pages split between processes) and of
+RSS over all processes involved, from /proc/<pid>/smaps_rollup (Linux).
+
+--synthetic builds randomly initialised models with the production
+architectures (RoBERTa-base sentiment, DistilBERT toxicity) in a temporary
+directory, for machines without access to the Hugging Face Hub.
+
+Usage:
+    python benchmarks/style_model_memory.py --workers 1 2 4 --synthetic
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DOCUMENT = ("Our new analytics dashboard helps teams understand their content performance. "
+            "Customers told us the onboarding flow was confusing and slow. "
+            "We rebuilt it from scratch with clear steps and helpful defaults. ") * 20
+
+
+def build_synthetic_models(directory):
+    """Random-weight RoBERTa-base (3 labels) and DistilBERT (2 labels) classifiers with a word-level tokenizer."""
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import (PreTrainedTokenizerFast, RobertaConfig, RobertaForSequenceClassification,
+                              DistilBertConfig, DistilBertForSequenceClassification)
+
+    specials = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    words = sorted(set(DOCUMENT.replace(".", " .").split()))
+    tokenizer = Tokenizer(models.WordLevel({w: i for i, w in enumerate(specials + words)}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    fast_tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, unk_token="[UNK]", pad_token="[PAD]", cls_token="[CLS]", sep_token="[SEP]",
+        mask_token="[MASK]", model_max_length=512)
+
+    sentiment = RobertaForSequenceClassification(RobertaConfig(
+        num_labels=3, id2label={0: "NEGATIVE", 1: "NEUTRAL", 2: "POSITIVE"}, pad_token_id=0,
+        max_position_embeddings=514))
+    toxicity = DistilBertForSequenceClassification(DistilBertConfig(
+        num_labels=2, id2label={0: "NON_TOXIC", 1: "TOXIC"}, pad_token_id=0))
+    paths = {}
+    for name, model in (("sentiment", sentiment), ("toxicity", toxicity)):
+        paths[name] = os.path.join(directory, name)
+        model.save_pretrained(paths[name])
+        fast_tokenizer.save_pretrained(paths[name])
+    return paths
+
+
+def memory_mb(pid):
+    """(PSS, RSS) of a process in MB."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Pss", "Rss"):
+                values[key] = int(rest.split()[0]) / 1024
+    return values["Pss"], values["Rss"]
+
+
+def run_model_server(socket_path, ready):
+    from agents.sentiment.model_server import StyleModelServer
+    sys.stdout = open(os.devnull, "w")
+    server = StyleModelServer(socket_path)
+    server.preload()
+    ready.set()
+    server.serve_forever()
+
+
+def run_api_worker(ready, stop):
+    from agents.sentiment.style_analyzer import StyleAnalyzerAgent
+    sys.stdout = open(os.devnull, "w")
+    result = StyleAnalyzerAgent().process({"content": DOCUMENT})
+    assert result.get("status") != "error", result
+    ready.set()
+    stop.wait()
+
+
+def measure(mode, workers, socket_path):
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    stop = context.Event()
+    if mode == "server":
+        os.environ["STYLE_MODEL_SERVER"] = socket_path
+        ready = context.Event()
+        server = context.Process(target=run_model_server, args=(socket_path, ready), daemon=True)
+        server.start()
+        ready.wait()
+        processes.append(server)
+    else:
+        os.environ.pop("STYLE_MODEL_SERVER", None)
+
+    readies = []
+    for _ in range(workers):
+        ready = context.Event()
+        process = context.Process(target=run_api_worker, args=(ready, stop), daemon=True)
+        process.start()
+        processes.append(process)
+        readies.append(ready)
+    for ready in readies:
+        ready.wait()
+    time.sleep(0.5)
+
+    pss = rss = 0.0
+    for process in processes:
+        process_pss, process_rss = memory_mb(process.pid)
+        pss += process_pss
+        rss += process_rss
+    stop.set()
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    return pss, rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--synthetic", action="store_true", help="random-weight models, no Hub download")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic:
+            paths = build_synthetic_models(tmp)
+            os.environ["STYLE_SENTIMENT_MODEL"] = paths["sentiment"]
+            os.environ["STYLE_TOXICITY_MODEL"] = paths["toxicity"]
+        socket_path = os.path.join(tmp, "style.sock")
+
+        print(f"{'workers':>7} {'local PSS':>10} {'server PSS':>11} {'local RSS':>10} {'server RSS':>11}")
+        for workers in args.workers:
+            local_pss, local_rss = measure("local", workers, socket_path)
+            server_pss, server_rss = measure("server", workers, socket_path)
+            print(f"{workers:>7} {local_pss:>8.0f}MB {server_pss:>9.0f}MB {local_rss:>8.0f}MB {server_rss:>9.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
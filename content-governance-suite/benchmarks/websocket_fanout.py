@@ -0,0 +1,156 @@
+"""
+Load test for WebSocketManager fan-out with thousands of mixed-speed clients.
+
+Simulated clients (no network; ``send_text`` sleeps for the client's latency):
+
+* fast    - completes immediately (a write into the socket buffer)
+* slow    - 50-200 ms per message (fall behind, progress updates get coalesced)
+* stuck   - never finish a send (removed after --send-timeout)
+* broken  - every send raises (removed on the first message)
+
+The driver broadcasts --rounds rounds, each consisting of a progress update
+and a result message, every --interval-ms. Reported:
+
+* time spent inside each broadcast() call (what a pipeline awaiting progress
+  updates would be blocked for)
+* end-to-end delivery latency of result messages to fast clients
+* coalesced / dropped messages and removed connections by reason
+
+With --legacy, a single broadcast is also timed with the original sequential
+loop (stuck clients excluded, since it would never finish with them).
+
+Usage:
+    python benchmarks/websocket_fanout.py --clients 5000 --rounds 30
+    python benchmarks/websocket_fanout.py --clients 5000 --legacy
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.websocket_manager import WebSocketManager
+
+
+class SimulatedClient:
+    def __init__(self, kind, rng):
+        self.kind = kind
+        if kind == "fast":
+            self.delay = 0.0
+        elif kind == "slow":
+            self.delay = rng.uniform(0.05, 0.2)
+        else:
+            self.delay = 3600.0
+        self.latencies = []
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.kind == "broken":
+            raise ConnectionResetError("client went away")
+        await asyncio.sleep(self.delay)
+        self.received += 1
+        if text.startswith('{"type": "result"'):
+            self.latencies.append(time.perf_counter() - json.loads(text)["sent_at"])
+
+    async def close(self, code=1000):
+        pass
+
+
+def make_clients(args, rng):
+    kinds = (["slow"] * int(args.clients * args.slow_fraction)
+             + ["stuck"] * int(args.clients * args.stuck_fraction)
+             + ["broken"] * int(args.clients * args.broken_fraction))
+    kinds += ["fast"] * (args.clients - len(kinds))
+    rng.shuffle(kinds)
+    return [SimulatedClient(kind, rng) for kind in kinds]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))] if values else 0.0
+
+
+async def run_fanout(args):
+    rng = random.Random(0)
+    manager = WebSocketManager(max_queue_size=args.queue_size, send_timeout=args.send_timeout)
+    clients = make_clients(args, rng)
+    for i, client in enumerate(clients):
+        await manager.connect(client, user_id=f"user-{i % (args.clients // 2 or 1)}")
+
+    broadcast_times = []
+    for round_number in range(args.rounds):
+        for message in (
+            {"type": "generation_update", "step": "reviewing", "progress": round_number},
+            {"type": "result", "round": round_number, "sent_at": time.perf_counter()},
+        ):
+            start = time.perf_counter()
+            await manager.broadcast(message)
+            broadcast_times.append(time.perf_counter() - start)
+        await asyncio.sleep(args.interval_ms / 1000)
+
+    # Let fast clients drain and stuck ones hit their timeout
+    await asyncio.sleep(args.send_timeout + 0.5)
+    stats = manager.get_stats()
+    for connection in list(manager.connections.values()):
+        connection.close()
+    return clients, broadcast_times, stats
+
+
+async def run_legacy(args):
+    """One broadcast with the original loop: await every send in turn."""
+    rng = random.Random(0)
+    clients = [c for c in make_clients(args, rng) if c.kind != "stuck"]
+    text = json.dumps({"type": "result", "round": 0, "sent_at": time.perf_counter()})
+    start = time.perf_counter()
+    for client in clients:
+        try:
+            await client.send_text(text)
+        except Exception:
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--interval-ms", type=float, default=100)
+    parser.add_argument("--slow-fraction", type=float, default=0.08)
+    parser.add_argument("--stuck-fraction", type=float, default=0.015)
+    parser.add_argument("--broken-fraction", type=float, default=0.005)
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument("--send-timeout", type=float, default=2.0)
+    parser.add_argument("--legacy", action="store_true", help="also time one broadcast with the sequential loop")
+    args = parser.parse_args()
+
+    clients, broadcast_times, stats = asyncio.run(run_fanout(args))
+    fast_latencies = [lat for c in clients if c.kind == "fast" for lat in c.latencies]
+    delivered = {kind: sum(c.received for c in clients if c.kind == kind)
+                 for kind in ("fast", "slow")}
+
+    print(f"{args.clients} clients, {args.rounds} rounds x 2 messages every {args.interval_ms:.0f} ms")
+    print(f"broadcast() call      p50 {percentile(broadcast_times, 0.5) * 1000:8.2f} ms   "
+          f"p95 {percentile(broadcast_times, 0.95) * 1000:8.2f} ms   max {max(broadcast_times) * 1000:8.2f} ms")
+    print(f"fast-client delivery  p50 {percentile(fast_latencies, 0.5) * 1000:8.2f} ms   "
+          f"p95 {percentile(fast_latencies, 0.95) * 1000:8.2f} ms   "
+          f"mean {statistics.mean(fast_latencies) * 1000 if fast_latencies else 0:8.2f} ms")
+    print(f"messages delivered    fast {delivered['fast']}   slow {delivered['slow']}")
+    print(f"coalesced {stats['coalesced']}   dropped {stats['dropped']}   "
+          f"connections left {stats['connections']}   removed {stats['removed']}")
+
+    if args.legacy:
+        elapsed = asyncio.run(run_legacy(args))
+        print(f"legacy sequential broadcast (stuck clients excluded): {elapsed:.2f} s for one message")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Float, JSON, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from collections import deque
 from datetime import datetime
+from typing import Dict, Any, Optional
 import os
+import threading
+import time
 
 Base = declarative_base()
 
@@ -30,6 +36,25 @@ class ContentHistory(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Analytics queries filter on a created_at window and group by decision
+    __table_args__ = (
+        Index("ix_content_history_created_at_decision", "created_at", "final_decision"),
+    )
+
+class DailyContentRollup(Base):
+    """Per-day ContentHistory aggregates, updated as history rows are written."""
+    __tablename__ = "daily_content_rollup"
+    
+    day = Column(Date, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    approved = Column(Integer, nullable=False, default=0)
+    needs_revision = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    final_score_sum = Column(Float, nullable=False, default=0.0)
+    final_score_count = Column(Integer, nullable=False, default=0)
+    generation_time_sum = Column(Float, nullable=False, default=0.0)
+    generation_time_count = Column(Integer, nullable=False, default=0)
+
 class AgentMetrics(Base):
     __tablename__ = "agent_metrics"
     
@@ -41,6 +66,10 @@ class AgentMetrics(Base):
     error_message = Column(Text)
     timestamp = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_agent_metrics_timestamp_agent", "timestamp", "agent_name"),
+    )
+
 class UserFeedback(Base):
     __tablename__ = "user_feedback"
     
@@ -52,15 +81,206 @@ class UserFeedback(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 # Database setup
-engine = create_engine(os.getenv("DATABASE_URL"))
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+#
+# Engines are created on first use (normally the app's startup hook) rather
+# than at import time, so importing the models never needs DATABASE_URL.
+# Pool settings come from the environment:
+#   DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+# DATABASE_ASYNC=1 enables the async engine; its URL is DATABASE_ASYNC_URL or
+# DATABASE_URL with the matching async driver (asyncpg, aiosqlite, aiomysql).
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite", "mysql": "aiomysql"}
+
+
+class PoolMetrics:
+    """How long checkouts waited for a pooled connection, and how many timed out."""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._waits: deque = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._waits.append(wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0,
+                "p95_wait_ms": waits[min(len(waits) - 1, int(0.95 * len(waits)))] * 1000 if waits else 0.0,
+                "max_wait_ms": self.max_wait * 1000
+            }
+
+
+class _TimedCheckout:
+    """Pool mixin that records checkout wait time in the class's ``metrics``."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    metrics = PoolMetrics()
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+def _database_url() -> str:
+    url = os.getenv("DATABASE_URL")
+    if not url:
+        raise RuntimeError("DATABASE_URL is not set")
+    return url
+
+
+def _engine_options(url, pool_class) -> Dict[str, Any]:
+    url = make_url(url)
+    options = {
+        "pool_pre_ping": _env_flag("DB_POOL_PRE_PING", "1"),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+    }
+    # In-memory SQLite keeps its single-connection pool
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=pool_class,
+        pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", 30)),
+    )
+    return options
+
+
+_engine = None
+_async_engine = None
+_async_sessionmaker = None
+_engine_lock = threading.Lock()
+
+# Bound to the engine when it is created
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+def get_engine():
+    """Create the sync engine on first use and bind SessionLocal to it."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                url = _database_url()
+                _engine = create_engine(url, **_engine_options(url, TimedQueuePool))
+                SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def async_database_enabled() -> bool:
+    return _env_flag("DATABASE_ASYNC", "0")
+
+
+def _async_database_url():
+    if os.getenv("DATABASE_ASYNC_URL"):
+        return os.getenv("DATABASE_ASYNC_URL")
+    url = make_url(_database_url())
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver known for {backend}; set DATABASE_ASYNC_URL")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def get_async_engine():
+    """Create the async engine on first use (needs the async driver and greenlet)."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+        with _engine_lock:
+            if _async_engine is None:
+                url = _async_database_url()
+                _async_engine = create_async_engine(url, **_engine_options(url, TimedAsyncQueuePool))
+                _async_sessionmaker = sessionmaker(
+                    bind=_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    """New AsyncSession on the async engine."""
+    get_async_engine()
+    return _async_sessionmaker()
+
+
+def init_engines():
+    """Create the configured engines; called from the app's startup hook."""
+    get_engine()
+    if async_database_enabled():
+        get_async_engine()
+
+
+async def dispose_engines():
+    """Close every pooled connection; called from the app's shutdown hook."""
+    global _engine, _async_engine, _async_sessionmaker
+    with _engine_lock:
+        engine, async_engine = _engine, _async_engine
+        _engine = _async_engine = _async_sessionmaker = None
+    if engine is not None:
+        engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+def get_pool_stats() -> Dict[str, Optional[Dict[str, Any]]]:
+    """Pool occupancy and checkout wait metrics of each engine that exists."""
+    stats = {}
+    for name, engine, pool_class in (("sync", _engine, TimedQueuePool),
+                                     ("async", _async_engine, TimedAsyncQueuePool)):
+        if engine is None:
+            stats[name] = None
+            continue
+        pool = engine.pool if name == "sync" else engine.sync_engine.pool
+        stats[name] = {"status": pool.status(), **pool_class.metrics.get_stats()}
+        if isinstance(pool, QueuePool):
+            stats[name].update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+    return stats
+
 
 def create_tables():
+    engine = get_engine()
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add indexes introduced since
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 def get_db():
+    get_engine()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
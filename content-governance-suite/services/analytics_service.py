@@ -1,84 +1,135 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from database.models import ContentHistory, AgentMetrics, UserFeedback
-from typing import Dict, List, Any
+from sqlalchemy import func, desc, case, select
+from database.models import ContentHistory, AgentMetrics, UserFeedback, DailyContentRollup
+from services.quantile_sketch import TDigest
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
+import os
+import threading
+import time
+
+class DashboardCache:
+    """
+    Short-lived cache of dashboard statistics keyed by ``days``.
+
+    Entries expire after ``ttl_seconds`` (DASHBOARD_CACHE_TTL) and are
+    dropped as soon as new history rows are written in this process. Other
+    processes writing to the same database are covered by the short TTL.
+    """
+
+    def __init__(self, ttl_seconds: float = None, clock=time.monotonic):
+        self.ttl_seconds = float(ttl_seconds if ttl_seconds is not None else os.getenv("DASHBOARD_CACHE_TTL", 5))
+        self._clock = clock
+        self._entries: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, days: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(days)
+            if entry is None or self._clock() - entry[0] > self.ttl_seconds:
+                return None
+            return entry[1]
+
+    def set(self, days: int, stats: Dict[str, Any], generation: int):
+        """Store stats computed while ``generation`` was current; stale results are ignored."""
+        with self._lock:
+            if generation == self._generation:
+                self._entries[days] = (self._clock(), stats)
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+# Shared by all AnalyticsService instances in the process
+dashboard_cache = DashboardCache()
+
+# Percentile key for an agent's figures across all of its operation types
+ALL_OPERATIONS = object()
+
 
 class AnalyticsService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[DashboardCache] = dashboard_cache):
         self.db = db
+        self.cache = cache
     
     def get_dashboard_stats(self, days: int = 30) -> Dict[str, Any]:
         """Get comprehensive dashboard statistics"""
+        if self.cache is not None:
+            cached = self.cache.get(days)
+            if cached is not None:
+                return cached
+            generation = self.cache.generation
+
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        # Content statistics
-        total_content = self.db.query(ContentHistory).filter(
-            ContentHistory.created_at >= cutoff_date
-        ).count()
-        
-        approved = self.db.query(ContentHistory).filter(
-            ContentHistory.final_decision == "Approved",
-            ContentHistory.created_at >= cutoff_date
-        ).count()
-        
-        needs_revision = self.db.query(ContentHistory).filter(
-            ContentHistory.final_decision == "Needs Revision",
-            ContentHistory.created_at >= cutoff_date
-        ).count()
-        
-        rejected = self.db.query(ContentHistory).filter(
-            ContentHistory.final_decision == "Rejected",
-            ContentHistory.created_at >= cutoff_date
-        ).count()
+        def count_decision(decision: str):
+            return func.sum(case((ContentHistory.final_decision == decision, 1), else_=0))
         
-        # Average scores
-        avg_scores = self.db.query(
+        # One pass over the window: decision counts, average scores and generation time
+        stats = self.db.query(
+            func.count(ContentHistory.id).label('total'),
+            count_decision("Approved").label('approved'),
+            count_decision("Needs Revision").label('needs_revision'),
+            count_decision("Rejected").label('rejected'),
             func.avg(ContentHistory.final_score).label('avg_final'),
             func.avg(ContentHistory.factuality_score).label('avg_factuality'),
-            func.avg(ContentHistory.style_score).label('avg_style')
-        ).filter(ContentHistory.created_at >= cutoff_date).first()
+            func.avg(ContentHistory.style_score).label('avg_style'),
+            func.avg(ContentHistory.generation_time).label('avg_generation_time')
+        ).filter(ContentHistory.created_at >= cutoff_date).one()
         
-        # Performance metrics
-        avg_generation_time = self.db.query(
-            func.avg(ContentHistory.generation_time)
-        ).filter(ContentHistory.created_at >= cutoff_date).scalar()
+        total_content = stats.total or 0
+        approved = int(stats.approved or 0)
         
-        return {
+        result = {
             "content_stats": {
                 "total": total_content,
                 "approved": approved,
-                "needs_revision": needs_revision,
-                "rejected": rejected,
+                "needs_revision": int(stats.needs_revision or 0),
+                "rejected": int(stats.rejected or 0),
                 "approval_rate": (approved / total_content * 100) if total_content > 0 else 0
             },
             "quality_scores": {
-                "average_final": float(avg_scores.avg_final or 0),
-                "average_factuality": float(avg_scores.avg_factuality or 0),
-                "average_style": float(avg_scores.avg_style or 0)
+                "average_final": float(stats.avg_final or 0),
+                "average_factuality": float(stats.avg_factuality or 0),
+                "average_style": float(stats.avg_style or 0)
             },
             "performance": {
-                "avg_generation_time": float(avg_generation_time or 0)
+                "avg_generation_time": float(stats.avg_generation_time or 0)
             }
         }
+        
+        if self.cache is not None:
+            self.cache.set(days, result, generation)
+        return result
     
     def get_content_trends(self, days: int = 30) -> List[Dict[str, Any]]:
-        """Get daily content generation trends"""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        """
+        Get daily content generation trends.
+
+        Reads one DailyContentRollup row per day instead of scanning history;
+        the window covers whole UTC days starting with the cutoff's day.
+        """
+        cutoff_day = (datetime.utcnow() - timedelta(days=days)).date()
         
         daily_stats = self.db.query(
-            func.date(ContentHistory.created_at).label('date'),
-            func.count(ContentHistory.id).label('total'),
-            func.sum(func.case([(ContentHistory.final_decision == 'Approved', 1)], else_=0)).label('approved')
+            DailyContentRollup.day,
+            DailyContentRollup.total,
+            DailyContentRollup.approved
         ).filter(
-            ContentHistory.created_at >= cutoff_date
-        ).group_by(
-            func.date(ContentHistory.created_at)
-        ).order_by('date').all()
+            DailyContentRollup.day >= cutoff_day,
+            DailyContentRollup.total > 0
+        ).order_by(DailyContentRollup.day).all()
         
         return [
             {
-                "date": stat.date.isoformat(),
+                "date": stat.day.isoformat(),
                 "total": stat.total,
                 "approved": stat.approved or 0,
                 "approval_rate": (stat.approved / stat.total * 100) if stat.total > 0 else 0
@@ -86,30 +137,118 @@ class AnalyticsService:
             for stat in daily_stats
         ]
     
-    def get_agent_performance(self) -> Dict[str, Any]:
-        """Get individual agent performance metrics"""
-        recent_metrics = self.db.query(AgentMetrics).filter(
-            AgentMetrics.timestamp >= datetime.utcnow() - timedelta(days=7)
-        ).all()
+    # Reported execution time percentiles: result key suffix -> quantile
+    PERCENTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+    
+    def get_agent_performance(self, days: int = 7) -> Dict[str, Any]:
+        """
+        Get individual agent performance metrics.
+
+        Counts, success rate, average and p50/p95/p99 execution time per agent,
+        plus the same figures per operation type under ``operations``. All
+        aggregation runs in the database; only PostgreSQL has percentile
+        functions, so elsewhere execution times are streamed into t-digests.
+        """
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        window = AgentMetrics.timestamp >= cutoff_date
+        
+        grouped = self.db.query(
+            AgentMetrics.agent_name,
+            AgentMetrics.operation_type,
+            func.count(AgentMetrics.id).label('total'),
+            func.sum(case((AgentMetrics.success == True, 1), else_=0)).label('successful'),
+            func.count(AgentMetrics.execution_time).label('timed'),
+            func.avg(AgentMetrics.execution_time).label('avg_execution_time')
+        ).filter(window).group_by(AgentMetrics.agent_name, AgentMetrics.operation_type).all()
+        
+        if self.db.get_bind().dialect.name == "postgresql":
+            percentiles = self._sql_percentiles(window)
+        else:
+            percentiles = self._streamed_percentiles(window)
         
         agent_stats = {}
-        for metric in recent_metrics:
-            if metric.agent_name not in agent_stats:
-                agent_stats[metric.agent_name] = {
-                    "total_operations": 0,
-                    "successful_operations": 0,
-                    "avg_execution_time": 0,
-                    "error_rate": 0
-                }
+        for row in grouped:
+            operation = row.operation_type or "unknown"
+            op_stats = self._performance_stats(
+                row.total, int(row.successful or 0), row.timed, row.avg_execution_time,
+                percentiles.get((row.agent_name, row.operation_type), {}))
             
-            agent_stats[metric.agent_name]["total_operations"] += 1
-            if metric.success:
-                agent_stats[metric.agent_name]["successful_operations"] += 1
+            agent = agent_stats.setdefault(row.agent_name, {"total": 0, "successful": 0, "timed": 0,
+                                                            "time_sum": 0.0, "operations": {}})
+            agent["total"] += row.total
+            agent["successful"] += op_stats["successful_operations"]
+            agent["timed"] += row.timed
+            agent["time_sum"] += float(row.avg_execution_time or 0) * row.timed
+            agent["operations"][operation] = op_stats
+        
+        return {
+            agent_name: {
+                **self._performance_stats(
+                    agent["total"], agent["successful"], agent["timed"],
+                    agent["time_sum"] / agent["timed"] if agent["timed"] else None,
+                    percentiles.get((agent_name, ALL_OPERATIONS), {})),
+                "operations": agent["operations"]
+            }
+            for agent_name, agent in agent_stats.items()
+        }
+    
+    def _performance_stats(self, total: int, successful: int, timed: int,
+                           avg_execution_time: Optional[float], percentiles: Dict[str, Any]) -> Dict[str, Any]:
+        stats = {
+            "total_operations": total,
+            "successful_operations": successful,
+            "success_rate": (successful / total * 100) if total > 0 else 0,
+            "error_rate": ((total - successful) / total * 100) if total > 0 else 0,
+            "avg_execution_time": float(avg_execution_time or 0)
+        }
+        for name, _ in self.PERCENTILES:
+            key = f"{name}_execution_time"
+            stats[key] = percentiles.get(key) if timed else None
+        return stats
+    
+    def _sql_percentiles(self, window) -> Dict[Tuple[str, Any], Dict[str, float]]:
+        """percentile_cont per (agent, operation) and per agent (ALL_OPERATIONS)."""
+        columns = [
+            func.percentile_cont(q).within_group(AgentMetrics.execution_time).label(name)
+            for name, q in self.PERCENTILES
+        ]
+        percentiles = {}
+        for group_by in ((AgentMetrics.agent_name, AgentMetrics.operation_type), (AgentMetrics.agent_name,)):
+            rows = self.db.query(*group_by, *columns).filter(
+                window, AgentMetrics.execution_time.isnot(None)
+            ).group_by(*group_by).all()
+            for row in rows:
+                key = (row.agent_name, row.operation_type if len(group_by) == 2 else ALL_OPERATIONS)
+                percentiles[key] = {f"{name}_execution_time": float(getattr(row, name))
+                                    for name, _ in self.PERCENTILES}
+        return percentiles
+    
+    def _streamed_percentiles(self, window, batch_size: int = 10000) -> Dict[Tuple[str, Any], Dict[str, float]]:
+        """Stream execution times once into a t-digest per (agent, operation); merge those per agent."""
+        digests: Dict[Tuple[str, Any], TDigest] = {}
+        # Core connection: plain rows, no ORM result processing per value
+        result = self.db.connection().execute(
+            select(AgentMetrics.agent_name, AgentMetrics.operation_type, AgentMetrics.execution_time)
+            .where(window, AgentMetrics.execution_time.isnot(None))
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            values_by_key: Dict[Tuple[str, Any], List[float]] = {}
+            for agent_name, operation_type, execution_time in partition:
+                values_by_key.setdefault((agent_name, operation_type), []).append(execution_time)
+            for key, values in values_by_key.items():
+                digest = digests.get(key)
+                if digest is None:
+                    digest = digests[key] = TDigest()
+                digest.extend(values)
         
-        # Calculate rates and averages
-        for agent, stats in agent_stats.items():
-            total = stats["total_operations"]
-            stats["success_rate"] = (stats["successful_operations"] / total * 100) if total > 0 else 0
-            stats["error_rate"] = ((total - stats["successful_operations"]) / total * 100) if total > 0 else 0
+        for (agent_name, _), digest in list(digests.items()):
+            agent_digest = digests.get((agent_name, ALL_OPERATIONS))
+            if agent_digest is None:
+                agent_digest = digests[(agent_name, ALL_OPERATIONS)] = TDigest()
+            agent_digest.merge(digest)
         
-        return agent_stats
+        return {
+            key: {f"{name}_execution_time": digest.quantile(q) for name, q in self.PERCENTILES}
+            for key, digest in digests.items()
+        }
@@ -0,0 +1,167 @@
+# services/batch_jobs.py
+
+from typing import Dict, Any, List, Optional, AsyncIterator
+from collections import OrderedDict
+from datetime import datetime
+import asyncio
+import os
+import time
+import uuid
+
+TERMINAL_STATUSES = ("completed", "cancelled")
+
+
+class BatchJob:
+    """State of one batch: per-item results in completion order plus counters."""
+
+    def __init__(self, requests: List[Dict[str, Any]], concurrency: int):
+        self.job_id = uuid.uuid4().hex
+        self.requests = requests
+        self.concurrency = concurrency
+        self.status = "queued"
+        self.results: List[Dict[str, Any]] = []
+        self.succeeded = 0
+        self.failed = 0
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def total(self) -> int:
+        return len(self.requests)
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    async def add_result(self, result: Dict[str, Any]):
+        async with self._changed:
+            self.results.append(result)
+            if result["status"] == "completed":
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            self._changed.notify_all()
+
+    async def finish(self, status: str):
+        async with self._changed:
+            self.status = status
+            self.finished_at = datetime.now()
+            self._changed.notify_all()
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every item result (already finished ones first) until the job ends."""
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.results) > sent or self.done)
+                pending = self.results[sent:]
+                finished = self.done
+            for result in pending:
+                yield result
+            sent += len(pending)
+            if finished and sent == len(self.results):
+                return
+
+    def to_dict(self, include_results: bool = True) -> Dict[str, Any]:
+        summary = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "total": self.total,
+            "completed": len(self.results),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "concurrency": self.concurrency,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+        if include_results:
+            summary["results"] = list(self.results)
+        return summary
+
+
+class BatchJobManager:
+    """
+    Runs batches of content requests through a GovernancePipeline.
+
+    Each job processes its items with at most ``concurrency`` in flight
+    (default ``BATCH_CONCURRENCY``, capped by ``BATCH_MAX_CONCURRENCY``).
+    LLM calls inside the pipeline are additionally paced by the per-provider
+    limits in ``agents.rate_limiter``. Finished jobs are kept in memory for
+    polling; the oldest are dropped beyond ``max_jobs``.
+    """
+
+    def __init__(self, pipeline, default_concurrency: int = None,
+                 max_concurrency: int = None, max_jobs: int = None):
+        self.pipeline = pipeline
+        self.default_concurrency = int(default_concurrency or os.getenv("BATCH_CONCURRENCY", 4))
+        self.max_concurrency = int(max_concurrency or os.getenv("BATCH_MAX_CONCURRENCY", 32))
+        self.max_jobs = int(max_jobs or os.getenv("BATCH_MAX_JOBS", 100))
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+
+    def submit(self, requests: List[Dict[str, Any]], concurrency: int = None) -> BatchJob:
+        """Create a job and start it on the running event loop."""
+        concurrency = max(1, min(concurrency or self.default_concurrency, self.max_concurrency))
+        job = BatchJob(requests, concurrency)
+        self._jobs[job.job_id] = job
+        self._evict_finished()
+        job.task = asyncio.get_running_loop().create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        return [job.to_dict(include_results=False) for job in self._jobs.values()]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a running job; items already finished keep their results."""
+        job = self._jobs.get(job_id)
+        if job is None or job.done or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    def _evict_finished(self):
+        while len(self._jobs) > self.max_jobs:
+            oldest = next((job_id for job_id, job in self._jobs.items() if job.done), None)
+            if oldest is None:
+                return
+            del self._jobs[oldest]
+
+    async def _run(self, job: BatchJob):
+        job.status = "running"
+        job.started_at = datetime.now()
+        semaphore = asyncio.Semaphore(job.concurrency)
+
+        try:
+            try:
+                await self.pipeline.awarm(job.requests)
+            except Exception as e:
+                # Warm-up is an optimization only; items still run without it
+                print(f"Batch {job.job_id}: topic warm-up failed: {e}")
+
+            await asyncio.gather(*(
+                self._run_item(job, index, request, semaphore)
+                for index, request in enumerate(job.requests)
+            ))
+        except asyncio.CancelledError:
+            await job.finish("cancelled")
+            raise
+        await job.finish("completed")
+
+    async def _run_item(self, job: BatchJob, index: int, request: Dict[str, Any], semaphore: asyncio.Semaphore):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                data = await self.pipeline.arun(request)
+                result = {"index": index, "status": "completed", "data": data}
+            except Exception as e:
+                print(f"Batch {job.job_id}: item {index} failed: {e}")
+                result = {"index": index, "status": "failed", "error": str(e)}
+            result["topic"] = request.get("topic", "")
+            result["execution_time"] = round(time.perf_counter() - start, 4)
+        await job.add_result(result)
@@ -0,0 +1,130 @@
+from sqlalchemy import func, case, select, insert, update
+from sqlalchemy.orm import Session
+from database.models import ContentHistory, DailyContentRollup
+from typing import Dict, Any, Iterable
+from datetime import datetime, date
+
+# Rollup counter column -> final_decision value it counts (None counts every row)
+DECISION_COUNTERS = {
+    "total": None,
+    "approved": "Approved",
+    "needs_revision": "Needs Revision",
+    "rejected": "Rejected",
+}
+ROLLUP_COLUMNS = list(DECISION_COUNTERS) + [
+    "final_score_sum", "final_score_count", "generation_time_sum", "generation_time_count"
+]
+
+
+def _empty_bucket(day: date) -> Dict[str, Any]:
+    bucket = {column: 0 for column in ROLLUP_COLUMNS}
+    bucket["day"] = day
+    return bucket
+
+
+def accumulate_rows(rows: Iterable[Dict[str, Any]]) -> Dict[date, Dict[str, Any]]:
+    """Fold ContentHistory insert rows into per-day rollup deltas."""
+    buckets: Dict[date, Dict[str, Any]] = {}
+    for row in rows:
+        day = (row.get("created_at") or datetime.utcnow()).date()
+        bucket = buckets.get(day)
+        if bucket is None:
+            bucket = buckets[day] = _empty_bucket(day)
+
+        for column, decision in DECISION_COUNTERS.items():
+            if decision is None or row.get("final_decision") == decision:
+                bucket[column] += 1
+        if row.get("final_score") is not None:
+            bucket["final_score_sum"] += row["final_score"]
+            bucket["final_score_count"] += 1
+        if row.get("generation_time") is not None:
+            bucket["generation_time_sum"] += row["generation_time"]
+            bucket["generation_time_count"] += 1
+    return buckets
+
+
+def apply_rollup_deltas(session: Session, deltas: Dict[date, Dict[str, Any]]):
+    """
+    Add per-day deltas to the rollup inside the caller's transaction.
+
+    SQLite and PostgreSQL get a single INSERT ... ON CONFLICT DO UPDATE, which
+    is safe with several writers. Other databases fall back to UPDATE and
+    INSERT for days that do not exist yet.
+    """
+    if not deltas:
+        return
+    values = list(deltas.values())
+    dialect = session.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        stmt = upsert(DailyContentRollup).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyContentRollup.day],
+            set_={column: getattr(DailyContentRollup, column) + getattr(stmt.excluded, column)
+                  for column in ROLLUP_COLUMNS}
+        )
+        session.execute(stmt)
+        return
+
+    for bucket in values:
+        updated = session.execute(
+            update(DailyContentRollup)
+            .where(DailyContentRollup.day == bucket["day"])
+            .values({column: getattr(DailyContentRollup, column) + bucket[column] for column in ROLLUP_COLUMNS})
+        )
+        if updated.rowcount == 0:
+            session.execute(insert(DailyContentRollup), [bucket])
+
+
+def rebuild_daily_rollup(session: Session) -> int:
+    """
+    Recompute the whole rollup from ContentHistory; returns the number of days.
+
+    Used to backfill history that predates the rollup table. The caller
+    commits.
+    """
+    day = func.date(ContentHistory.created_at)
+
+    def count_decision(decision: str):
+        return func.sum(case((ContentHistory.final_decision == decision, 1), else_=0))
+
+    grouped = session.execute(
+        select(
+            day.label("day"),
+            func.count(ContentHistory.id).label("total"),
+            count_decision("Approved").label("approved"),
+            count_decision("Needs Revision").label("needs_revision"),
+            count_decision("Rejected").label("rejected"),
+            func.coalesce(func.sum(ContentHistory.final_score), 0).label("final_score_sum"),
+            func.count(ContentHistory.final_score).label("final_score_count"),
+            func.coalesce(func.sum(ContentHistory.generation_time), 0).label("generation_time_sum"),
+            func.count(ContentHistory.generation_time).label("generation_time_count"),
+        ).where(ContentHistory.created_at.isnot(None)).group_by(day)
+    ).all()
+
+    session.query(DailyContentRollup).delete()
+    rows = []
+    for stat in grouped:
+        row = dict(stat._mapping)
+        # SQLite returns func.date() as an ISO string
+        if isinstance(row["day"], str):
+            row["day"] = date.fromisoformat(row["day"])
+        rows.append(row)
+    if rows:
+        session.execute(insert(DailyContentRollup), rows)
+    return len(rows)
+
+
+def ensure_daily_rollup(session: Session) -> int:
+    """Backfill the rollup once if it is empty but history exists; returns days written."""
+    if session.query(DailyContentRollup.day).first() is not None:
+        return 0
+    if session.query(ContentHistory.id).first() is None:
+        return 0
+    days = rebuild_daily_rollup(session)
+    session.commit()
+    return days
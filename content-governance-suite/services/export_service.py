@@ -4,15 +4,168 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import hashlib
 import json
 import csv
+import multiprocessing
+import os
+import threading
 from io import StringIO, BytesIO
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import docx
 from docx import Document
 
+# Bump when the report layout changes so cached artifacts are re-rendered
+RENDER_VERSION = 1
+
+# format -> (ExportService method, file extension, media type)
+EXPORT_FORMATS = {
+    "pdf": ("export_to_pdf", "pdf", "application/pdf"),
+    "word": ("export_to_word", "docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+}
+
+
+def _render_to_file(export_format: str, content_data: Dict[str, Any], path: str) -> str:
+    """Render one report into ``path``; runs in an export worker process."""
+    method = EXPORT_FORMATS[export_format][0]
+    buffer = getattr(ExportService(), method)(content_data)
+    staging = f"{path}.{os.getpid()}.tmp"
+    with open(staging, "wb") as f:
+        f.write(buffer.getbuffer())
+    os.replace(staging, path)
+    return path
+
+
 class ExportService:
+    """
+    Renders reports with ReportLab / python-docx.
+
+    ``render`` is the entry point for request handlers: it renders in a
+    process pool (EXPORT_WORKERS processes; 0 renders in a thread instead)
+    straight into a file cache keyed by a hash of the payload
+    (EXPORT_CACHE_DIR, at most EXPORT_CACHE_MAX_FILES files), and returns the
+    file path for the response to stream. Identical concurrent requests share
+    one render. A returned path is leased: pruning leaves it alone until the
+    caller has streamed it and calls ``release``.
+    """
+
+    def __init__(self, cache_dir: str = None, max_workers: int = None, max_cached_files: int = None):
+        self.cache_dir = cache_dir or os.getenv("EXPORT_CACHE_DIR", ".cache/exports")
+        self.max_workers = int(max_workers if max_workers is not None
+                               else os.getenv("EXPORT_WORKERS", min(4, os.cpu_count() or 1)))
+        self.max_cached_files = int(max_cached_files or os.getenv("EXPORT_CACHE_MAX_FILES", 500))
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        # path -> requests still rendering or streaming it; pruning skips these
+        self._leases: Dict[str, int] = {}
+        self._lease_lock = threading.Lock()
+        self.cache_hits = 0
+        self.renders = 0
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Create the export worker pool on first use."""
+        if self.max_workers <= 0:
+            return None
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # spawn: forking a process that holds model threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def cache_key(self, export_format: str, content_data: Dict[str, Any]) -> str:
+        payload = json.dumps(content_data, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(f"{RENDER_VERSION}:{export_format}:{payload}".encode("utf-8")).hexdigest()
+
+    async def render(self, export_format: str, content_data: Dict[str, Any]) -> str:
+        """Leased path of the rendered report, from the cache or rendered off the event loop."""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        key = self.cache_key(export_format, content_data)
+        path = os.path.join(self.cache_dir, f"{key}.{EXPORT_FORMATS[export_format][1]}")
+
+        # Leased before the cache check, so a concurrent prune cannot delete
+        # the file between the check and the response opening it
+        with self._lease_lock:
+            self._leases[path] = self._leases.get(path, 0) + 1
+        try:
+            return await self._render_leased(key, path, export_format, content_data)
+        except BaseException:
+            self.release(path)
+            raise
+
+    def release(self, path: str):
+        """Let pruning delete a path returned by ``render`` once its response is sent."""
+        with self._lease_lock:
+            count = self._leases.get(path, 0) - 1
+            if count > 0:
+                self._leases[path] = count
+            else:
+                self._leases.pop(path, None)
+
+    async def _render_leased(self, key: str, path: str, export_format: str, content_data: Dict[str, Any]) -> str:
+        if os.path.exists(path):
+            self.cache_hits += 1
+            os.utime(path)  # keeps recently used reports out of pruning
+            return path
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.cache_hits += 1
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        future = loop.run_in_executor(self._get_executor(), _render_to_file, export_format, content_data, path)
+        self._in_flight[key] = future
+        try:
+            await asyncio.shield(future)
+        finally:
+            self._in_flight.pop(key, None)
+        self.renders += 1
+        await loop.run_in_executor(None, self._prune_cache)
+        return path
+
+    def _prune_cache(self):
+        """Delete the least recently used reports beyond max_cached_files, except leased ones."""
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir) if not entry.name.endswith(".tmp")]
+        except FileNotFoundError:
+            return
+        if len(entries) <= self.max_cached_files:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_cached_files]:
+            with self._lease_lock:
+                if entry.path in self._leases:
+                    continue
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "renders": self.renders,
+            "cache_hits": self.cache_hits,
+            "in_flight": len(self._in_flight),
+            "leased": len(self._leases),
+            "cache_dir": self.cache_dir
+        }
+
+    def shutdown(self):
+        """Stop the export worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
     
+
     def export_to_pdf(self, content_data: Dict[str, Any]) -> BytesIO:
         """Export content and review data to PDF"""
         buffer = BytesIO()
@@ -160,6 +313,7 @@ class ExportService:
         for content in content_list:
             metadata = content.get('generated_content', {}).get('metadata', {})
             final_decision = content.get('final_decision', {})
+            reviews = {step.get('agent'): step.get('result', {}) for step in content.get('review_pipeline', [])}
             
             row = [
                 metadata.get('topic', ''),
@@ -167,9 +321,8 @@ class ExportService:
                 metadata.get('target_audience', ''),
                 final_decision.get('final_decision', ''),
                 final_decision.get('final_score', 0),
-                # Add other scores from review pipeline
-                '',  # Factuality score
-                '',  # Style score
+                reviews.get('FactualityChecker', {}).get('overall_score', ''),
+                reviews.get('StyleAnalyzer', {}).get('style_score', ''),
                 metadata.get('generation_timestamp', '')
             ]
             writer.writerow(row)
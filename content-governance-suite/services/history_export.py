@@ -0,0 +1,173 @@
+from sqlalchemy import select
+from database.models import ContentHistory, get_engine
+from typing import Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
+from io import StringIO
+import csv
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Exported ContentHistory columns and their Arrow types
+EXPORT_COLUMNS: List[Tuple[str, str]] = [
+    ("id", "int64"),
+    ("created_at", "timestamp"),
+    ("content_type", "string"),
+    ("topic", "string"),
+    ("target_audience", "string"),
+    ("final_decision", "string"),
+    ("final_score", "float64"),
+    ("factuality_score", "float64"),
+    ("style_score", "float64"),
+    ("multimodal_score", "float64"),
+    ("generation_time", "float64"),
+]
+CONTENT_COLUMN = ("generated_content", "string")
+
+# format -> (media type, file extension, needs pyarrow)
+HISTORY_EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv", False),
+    "ndjson": ("application/x-ndjson", "ndjson", False),
+    "parquet": ("application/vnd.apache.parquet", "parquet", True),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows", True),
+}
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever pyarrow wrote since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class HistoryExportService:
+    """
+    Streams ContentHistory out of the database as CSV, NDJSON, Parquet or
+    Arrow IPC.
+
+    Rows are read with a server-side cursor (``stream_results``) in batches of
+    ``batch_size`` (HISTORY_EXPORT_BATCH_SIZE) and each batch is encoded and
+    yielded before the next is fetched, so memory stays flat however many
+    rows match. Parquet and Arrow need pyarrow; each batch becomes one row
+    group / record batch.
+    """
+
+    def __init__(self, engine=None, batch_size: int = None):
+        self.engine = engine
+        self.batch_size = int(batch_size or os.getenv("HISTORY_EXPORT_BATCH_SIZE", 5000))
+
+    def check_format(self, export_format: str) -> Tuple[str, str]:
+        """(media type, file extension) of a format; raises ValueError if it cannot be served."""
+        if export_format not in HISTORY_EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        media_type, extension, needs_pyarrow = HISTORY_EXPORT_FORMATS[export_format]
+        if needs_pyarrow and not PYARROW_AVAILABLE:
+            raise ValueError(f"{export_format} export requires pyarrow")
+        return media_type, extension
+
+    def _columns(self, include_content: bool) -> List[Tuple[str, str]]:
+        return EXPORT_COLUMNS + [CONTENT_COLUMN] if include_content else EXPORT_COLUMNS
+
+    def _batches(self, columns: List[Tuple[str, str]], days: Optional[int],
+                 decision: Optional[str]) -> Iterator[List[tuple]]:
+        query = select(*(getattr(ContentHistory, name) for name, _ in columns)).order_by(ContentHistory.id)
+        if days is not None:
+            query = query.where(ContentHistory.created_at >= datetime.utcnow() - timedelta(days=days))
+        if decision is not None:
+            query = query.where(ContentHistory.final_decision == decision)
+
+        engine = self.engine or get_engine()
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=self.batch_size).execute(query)
+            for partition in result.partitions():
+                yield partition
+
+    def stream(self, export_format: str, days: int = None, decision: str = None,
+               include_content: bool = False) -> Iterator[bytes]:
+        """Yield the encoded export chunk by chunk."""
+        self.check_format(export_format)
+        columns = self._columns(include_content)
+        batches = self._batches(columns, days, decision)
+        encoder = getattr(self, f"_encode_{export_format}")
+        return encoder(columns, batches)
+
+    def _encode_csv(self, columns, batches) -> Iterator[bytes]:
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerow([name for name, _ in columns])
+        for batch in batches:
+            writer.writerows(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row] for row in batch)
+            yield output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate()
+        if output.tell():
+            yield output.getvalue().encode("utf-8")
+
+    def _encode_ndjson(self, columns, batches) -> Iterator[bytes]:
+        names = [name for name, _ in columns]
+        for batch in batches:
+            lines = [
+                json.dumps({name: value.isoformat() if isinstance(value, datetime) else value
+                            for name, value in zip(names, row)})
+                for row in batch
+            ]
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+    def _arrow_schema(self, columns) -> "pa.Schema":
+        types = {"int64": pa.int64(), "timestamp": pa.timestamp("us"), "string": pa.string(), "float64": pa.float64()}
+        return pa.schema([(name, types[arrow_type]) for name, arrow_type in columns])
+
+    def _record_batch(self, schema, batch) -> "pa.RecordBatch":
+        values = list(zip(*batch))
+        return pa.record_batch(
+            [pa.array(values[i], type=field.type) for i, field in enumerate(schema)], schema=schema)
+
+    def _encode_parquet(self, columns, batches) -> Iterator[bytes]:
+        schema = self._arrow_schema(columns)
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+            for batch in batches:
+                writer.write_batch(self._record_batch(schema, batch))
+                yield sink.drain()
+        yield sink.drain()
+
+    def _encode_arrow(self, columns, batches) -> Iterator[bytes]:
+        schema = self._arrow_schema(columns)
+        sink = _ChunkSink()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(self._record_batch(schema, batch))
+                yield sink.drain()
+        yield sink.drain()
+
+
+# Global history export service
+history_export_service = HistoryExportService()
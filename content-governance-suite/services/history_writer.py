@@ -0,0 +1,256 @@
+# services/history_writer.py
+from sqlalchemy import String, insert
+from database.models import ContentHistory, AgentMetrics
+from services.content_rollup import accumulate_rows, apply_rollup_deltas
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable, Set
+from datetime import datetime, timezone
+import os
+import queue
+import threading
+import time
+
+
+def _utcnow() -> datetime:
+    """Naive UTC timestamp, matching the models' timezone-less DateTime columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _fit_to_columns(model, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Truncate strings that are longer than their String(n) column, e.g. a long topic."""
+    for column in model.__table__.columns:
+        value = row.get(column.key)
+        length = getattr(column.type, "length", None)
+        if isinstance(column.type, String) and length and isinstance(value, str) and len(value) > length:
+            row[column.key] = value[:length]
+    return row
+
+
+class BackgroundWriter:
+    """
+    Buffers rows and writes them with bulk inserts from a background thread.
+
+    ``record`` only puts the row on an in-memory queue, so callers on the
+    request path never wait for the database. The writer thread flushes once
+    ``batch_size`` rows are buffered or ``flush_interval`` seconds after the
+    oldest buffered row arrived, with one multi-row INSERT per table.
+    ContentHistory rows also update the daily rollup in the same transaction.
+    Strings are truncated to their column length when buffered, and a batch
+    that still fails is retried row by row so one bad row cannot drop the
+    rest. ``shutdown`` flushes everything still buffered before returning.
+    """
+
+    def __init__(self, session_factory, batch_size: int = None, flush_interval: float = None,
+                 max_buffer: int = None):
+        self.session_factory = session_factory
+        self.batch_size = int(batch_size or os.getenv("HISTORY_WRITER_BATCH_SIZE", 200))
+        self.flush_interval = float(flush_interval or os.getenv("HISTORY_WRITER_FLUSH_INTERVAL", 1.0))
+        max_buffer = int(max_buffer or os.getenv("HISTORY_WRITER_MAX_BUFFER", 10000))
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_buffer)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._stopped = False
+
+        self._metrics_lock = threading.Lock()
+        self._flushes = 0
+        self._rows_written = 0
+        self._rows_failed = 0
+        self._rows_dropped = 0
+        self._last_error: Optional[str] = None
+        self._flush_latencies: deque = deque(maxlen=1000)
+        self._flush_listeners: List[Callable[[Set[Any]], None]] = []
+
+    def add_flush_listener(self, callback: Callable[[Set[Any]], None]):
+        """Call ``callback(models)`` from the writer thread after each successful flush."""
+        self._flush_listeners.append(callback)
+
+    def record(self, model, row: Dict[str, Any]) -> bool:
+        """Buffer one row for ``model``; returns False if it had to be dropped."""
+        if self._stopped:
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((model, _fit_to_columns(model, dict(row))))
+            return True
+        except queue.Full:
+            with self._metrics_lock:
+                self._rows_dropped += 1
+            return False
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="history-writer", daemon=True)
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            batch = [entry]
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self._flush(batch)
+                    return
+                batch.append(entry)
+
+            self._flush(batch)
+
+    def _write(self, batch: List[tuple]):
+        """Insert ``batch`` in one transaction; returns the models written."""
+        rows_by_model: Dict[Any, List[Dict[str, Any]]] = {}
+        for model, row in batch:
+            rows_by_model.setdefault(model, []).append(row)
+
+        session = self.session_factory()
+        try:
+            for model, rows in rows_by_model.items():
+                session.execute(insert(model), rows)
+                if model is ContentHistory:
+                    # Same transaction, so the daily rollup never disagrees with history
+                    apply_rollup_deltas(session, accumulate_rows(rows))
+            session.commit()
+            return set(rows_by_model)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _flush(self, batch: List[tuple]):
+        started = time.perf_counter()
+        try:
+            written_models = self._write(batch)
+            failed, error = 0, None
+        except Exception as e:
+            # Retry row by row so only the rows the database rejects are lost
+            print(f"History writer: batch of {len(batch)} rows failed ({e}), retrying row by row")
+            written_models, failed, error = set(), 0, None
+            for entry in batch:
+                try:
+                    written_models |= self._write([entry])
+                except Exception as row_error:
+                    failed, error = failed + 1, str(row_error)
+            if failed:
+                print(f"History writer: dropped {failed} of {len(batch)} rows: {error}")
+
+        with self._metrics_lock:
+            self._flushes += 1
+            self._rows_written += len(batch) - failed
+            self._rows_failed += failed
+            if error:
+                self._last_error = error
+            self._flush_latencies.append(time.perf_counter() - started)
+
+        if written_models:
+            for callback in self._flush_listeners:
+                try:
+                    callback(written_models)
+                except Exception as e:
+                    print(f"History writer: flush listener failed: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Buffer depth, flush latency and row counters."""
+        with self._metrics_lock:
+            latencies = sorted(self._flush_latencies)
+            metrics = {
+                "buffer_depth": self._queue.qsize(),
+                "flushes": self._flushes,
+                "rows_written": self._rows_written,
+                "rows_failed": self._rows_failed,
+                "rows_dropped": self._rows_dropped,
+                "last_error": self._last_error
+            }
+
+        metrics["avg_rows_per_flush"] = (
+            (metrics["rows_written"] + metrics["rows_failed"]) / metrics["flushes"] if metrics["flushes"] else 0.0)
+        metrics["avg_flush_latency_ms"] = sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+        metrics["p95_flush_latency_ms"] = (
+            latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000 if latencies else 0.0)
+        metrics["max_flush_latency_ms"] = latencies[-1] * 1000 if latencies else 0.0
+        return metrics
+
+    def shutdown(self, timeout: float = None):
+        """Stop accepting rows and wait until the buffer has been flushed."""
+        self._stopped = True
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout)
+
+
+class PipelineRecorder:
+    """Turns pipeline runs into ContentHistory and AgentMetrics rows for a BackgroundWriter."""
+
+    # Review step label -> (ContentHistory score column, key of the score in the agent result)
+    REVIEW_SCORES = {
+        "FactualityChecker": ("factuality_score", "overall_score"),
+        "StyleAnalyzer": ("style_score", "style_score"),
+        "MultimodalReviewer": ("multimodal_score", "score"),
+    }
+
+    def __init__(self, writer: BackgroundWriter):
+        self.writer = writer
+
+    def record_agent_call(self, agent_name: str, operation_type: str, execution_time: float,
+                          success: bool = True, error_message: str = None):
+        self.writer.record(AgentMetrics, {
+            "agent_name": agent_name,
+            "operation_type": operation_type,
+            "execution_time": execution_time,
+            "success": success,
+            "error_message": error_message,
+            "timestamp": _utcnow()
+        })
+
+    def record_run(self, content_request: Dict[str, Any], generated_content: Dict[str, Any],
+                   review_results: List[Dict[str, Any]], final_consensus: Dict[str, Any],
+                   generation_time: float, consensus_time: float):
+        """Record one successful pipeline run and each agent call it made."""
+        self.record_agent_call("ContentGenerator", "generate", generation_time)
+
+        row = {
+            "content_type": content_request.get("type", "blog_post"),
+            "topic": content_request.get("topic", ""),
+            "generated_content": generated_content.get("content") or "",
+            "target_audience": content_request.get("target_audience"),
+            "style_guide": content_request.get("style_guide"),
+            # Every row carries every column so rows can share one executemany INSERT
+            "factuality_score": None,
+            "style_score": None,
+            "multimodal_score": None,
+            "final_score": final_consensus.get("final_score"),
+            "final_decision": final_consensus.get("final_decision"),
+            "agent_ids": [generated_content.get("metadata", {}).get("agent_id")],
+            "generation_time": generation_time,
+            "created_at": _utcnow(),
+            "updated_at": _utcnow()
+        }
+
+        for step in review_results:
+            result = step.get("result", {})
+            column, key = self.REVIEW_SCORES.get(step["agent"], (None, None))
+            if column is not None and result.get(key) is not None:
+                row[column] = result[key]
+            row["agent_ids"].append(result.get("agent_id"))
+            # A "failed" review is a verdict on the content; only "error" means the agent failed
+            self.record_agent_call(step["agent"], "review", step.get("execution_time"),
+                                   success=result.get("status") != "error",
+                                   error_message=result.get("error"))
+
+        row["agent_ids"].append(final_consensus.get("agent_id"))
+        self.record_agent_call("ConsensusAgent", "consensus", consensus_time)
+        self.writer.record(ContentHistory, row)
+
+    def record_generation_failure(self, error: str, generation_time: float):
+        self.record_agent_call("ContentGenerator", "generate", generation_time,
+                               success=False, error_message=error)
@@ -0,0 +1,379 @@
+# services/job_queue.py
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# Job lifecycle: queued -> running -> succeeded | failed. A running job whose
+# lease (visibility timeout) expires goes back to queued, or to failed once it
+# has used up max_attempts.
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+LEASE_EXPIRED_ERROR = "visibility timeout exceeded"
+
+
+class JobQueue(ABC):
+    """
+    Durable queue of pipeline jobs shared by the API and worker processes.
+
+    The API ``enqueue``s requests; workers ``claim`` one job at a time, which
+    leases it for ``visibility_timeout`` seconds. A worker keeps its lease
+    with ``heartbeat`` and ends it with ``complete`` or ``fail``. A job whose
+    worker died becomes claimable again when the lease expires. ``fail``
+    retries with exponential backoff (``retry_delay`` * 2^(attempt-1)) until
+    ``max_attempts`` is reached. Every call is synchronous and short.
+    """
+
+    def __init__(self, max_attempts: int = None, retry_delay: float = None, clock=time.time):
+        self.max_attempts = int(max_attempts or os.getenv("JOB_MAX_ATTEMPTS", 3))
+        self.retry_delay = float(retry_delay if retry_delay is not None else os.getenv("JOB_RETRY_DELAY", 5))
+        self._clock = clock
+
+    def _backoff(self, attempts: int) -> float:
+        return self.retry_delay * (2 ** max(0, attempts - 1))
+
+    @staticmethod
+    def _new_id() -> str:
+        return uuid.uuid4().hex
+
+    @abstractmethod
+    def enqueue(self, payload: Dict[str, Any], max_attempts: int = None) -> str:
+        """Add a queued job and return its id."""
+        pass
+
+    @abstractmethod
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[Dict[str, Any]]:
+        """Lease the oldest visible job; returns {id, payload, attempts} or None."""
+        pass
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        """Extend a lease; False if the worker no longer holds it."""
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Store the result of a leased job; False if the worker no longer holds the lease."""
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Give the job back for a retry, or fail it for good after max_attempts."""
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status, attempts, result and error of a job, or None if it does not exist."""
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, int]:
+        """Number of jobs per status (see JOB_STATUSES)."""
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Job queue in a local SQLite file; safe across processes on one machine.
+
+    Claims run in ``BEGIN IMMEDIATE`` transactions, so two workers never
+    lease the same job.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    visible_at REAL NOT NULL,
+                    worker_id TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_status_visible_at ON jobs (status, visible_at)")
+            self._conn = conn
+        return self._conn
+
+    def _transaction(self, fn):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = fn(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return value
+
+    def enqueue(self, payload: Dict[str, Any], max_attempts: int = None) -> str:
+        job_id = self._new_id()
+        now = self._clock()
+        self._transaction(lambda conn: conn.execute(
+            "INSERT INTO jobs (id, payload, status, max_attempts, visible_at, created_at, updated_at) "
+            "VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, json.dumps(payload, default=str), max_attempts or self.max_attempts, now, now, now)))
+        return job_id
+
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[Dict[str, Any]]:
+        def claim_next(conn):
+            now = self._clock()
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, worker_id = NULL, updated_at = ? "
+                "WHERE status = 'running' AND visible_at <= ? AND attempts >= max_attempts",
+                (LEASE_EXPIRED_ERROR, now, now))
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM jobs WHERE status IN ('queued', 'running') "
+                "AND visible_at <= ? ORDER BY visible_at LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, visible_at = ?, "
+                "worker_id = ?, updated_at = ? WHERE id = ?",
+                (now + visibility_timeout, worker_id, now, row["id"]))
+            return {"id": row["id"], "payload": json.loads(row["payload"]), "attempts": row["attempts"] + 1}
+        return self._transaction(claim_next)
+
+    def heartbeat(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        now = self._clock()
+        return self._transaction(lambda conn: conn.execute(
+            "UPDATE jobs SET visible_at = ?, updated_at = ? WHERE id = ? AND worker_id = ? AND status = 'running'",
+            (now + visibility_timeout, now, job_id, worker_id)).rowcount == 1)
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        now = self._clock()
+        return self._transaction(lambda conn: conn.execute(
+            "UPDATE jobs SET status = 'succeeded', result = ?, error = NULL, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = 'running'",
+            (json.dumps(result, default=str), now, job_id, worker_id)).rowcount == 1)
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        def fail_job(conn):
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND worker_id = ? AND status = 'running'",
+                (job_id, worker_id)).fetchone()
+            if row is None:
+                return False
+            now = self._clock()
+            if row["attempts"] < row["max_attempts"]:
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', error = ?, worker_id = NULL, visible_at = ?, "
+                    "updated_at = ? WHERE id = ?", (error, now + self._backoff(row["attempts"]), now, job_id))
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, worker_id = NULL, updated_at = ? WHERE id = ?",
+                    (error, now, job_id))
+            return True
+        return self._transaction(fail_job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT id, status, attempts, max_attempts, result, error, created_at, updated_at "
+                "FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        stats = {status: 0 for status in JOB_STATUSES}
+        stats.update({status: count for status, count in rows})
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Lua scripts keep every Redis state transition atomic. Job hashes live at
+# <prefix>job:<id>; <prefix>ready is a list, <prefix>delayed (retry at) and
+# <prefix>leases (lease deadline) are sorted sets of job ids.
+_REDIS_CLAIM = """
+local prefix, now = ARGV[1], tonumber(ARGV[2])
+local ready, delayed, leases = prefix .. 'ready', prefix .. 'delayed', prefix .. 'leases'
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', delayed, '-inf', now)) do
+    redis.call('ZREM', delayed, id)
+    redis.call('LPUSH', ready, id)
+end
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', leases, '-inf', now)) do
+    redis.call('ZREM', leases, id)
+    local key = prefix .. 'job:' .. id
+    if tonumber(redis.call('HGET', key, 'attempts')) >= tonumber(redis.call('HGET', key, 'max_attempts')) then
+        redis.call('HSET', key, 'status', 'failed', 'error', ARGV[5], 'worker_id', '', 'updated_at', now)
+    else
+        redis.call('HSET', key, 'status', 'queued', 'worker_id', '')
+        redis.call('RPUSH', ready, id)
+    end
+end
+local id = redis.call('RPOP', ready)
+if not id then return false end
+local key = prefix .. 'job:' .. id
+local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+redis.call('HSET', key, 'status', 'running', 'worker_id', ARGV[4], 'updated_at', now)
+redis.call('ZADD', leases, now + tonumber(ARGV[3]), id)
+return {id, redis.call('HGET', key, 'payload'), attempts}
+"""
+
+_REDIS_HEARTBEAT = """
+local key = ARGV[1] .. 'job:' .. ARGV[2]
+if redis.call('HGET', key, 'worker_id') ~= ARGV[3] or redis.call('HGET', key, 'status') ~= 'running' then
+    return 0
+end
+redis.call('ZADD', ARGV[1] .. 'leases', tonumber(ARGV[4]), ARGV[2])
+return 1
+"""
+
+_REDIS_FINISH = """
+local prefix, id = ARGV[1], ARGV[2]
+local key = prefix .. 'job:' .. id
+if redis.call('HGET', key, 'worker_id') ~= ARGV[3] or redis.call('HGET', key, 'status') ~= 'running' then
+    return 0
+end
+redis.call('ZREM', prefix .. 'leases', id)
+local now, outcome = tonumber(ARGV[4]), ARGV[5]
+if outcome == 'succeeded' then
+    redis.call('HSET', key, 'status', 'succeeded', 'result', ARGV[6], 'error', '', 'updated_at', now)
+    redis.call('EXPIRE', key, tonumber(ARGV[8]))
+elseif tonumber(redis.call('HGET', key, 'attempts')) < tonumber(redis.call('HGET', key, 'max_attempts')) then
+    redis.call('HSET', key, 'status', 'queued', 'error', ARGV[6], 'worker_id', '', 'updated_at', now)
+    redis.call('ZADD', prefix .. 'delayed', now + tonumber(ARGV[7]), id)
+else
+    redis.call('HSET', key, 'status', 'failed', 'error', ARGV[6], 'worker_id', '', 'updated_at', now)
+    redis.call('EXPIRE', key, tonumber(ARGV[8]))
+end
+return 1
+"""
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Job queue in Redis, for workers spread over several machines. ``client``
+    is a synchronous Redis client (``redis.Redis`` or ``fakeredis.FakeRedis``).
+    Finished jobs expire after ``result_ttl`` seconds (JOB_RESULT_TTL).
+    """
+
+    def __init__(self, client, prefix: str = "governance-jobs:", result_ttl: int = None, **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+        self.prefix = prefix
+        self.result_ttl = int(result_ttl or os.getenv("JOB_RESULT_TTL", 86400))
+        self._claim = client.register_script(_REDIS_CLAIM)
+        self._heartbeat = client.register_script(_REDIS_HEARTBEAT)
+        self._finish = client.register_script(_REDIS_FINISH)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisJobQueue":
+        import redis
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}job:{job_id}"
+
+    def enqueue(self, payload: Dict[str, Any], max_attempts: int = None) -> str:
+        job_id = self._new_id()
+        now = self._clock()
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(self._key(job_id), mapping={
+            "payload": json.dumps(payload, default=str),
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": max_attempts or self.max_attempts,
+            "created_at": now,
+            "updated_at": now
+        })
+        pipe.lpush(f"{self.prefix}ready", job_id)
+        pipe.execute()
+        return job_id
+
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[Dict[str, Any]]:
+        claimed = self._claim(args=[self.prefix, self._clock(), visibility_timeout, worker_id, LEASE_EXPIRED_ERROR])
+        if not claimed:
+            return None
+        job_id, payload, attempts = claimed
+        return {"id": _text(job_id), "payload": json.loads(_text(payload)), "attempts": int(attempts)}
+
+    def heartbeat(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        return bool(self._heartbeat(args=[self.prefix, job_id, worker_id, self._clock() + visibility_timeout]))
+
+    def _finish_job(self, job_id: str, worker_id: str, outcome: str, value: str, retry_in: float = 0) -> bool:
+        return bool(self._finish(args=[self.prefix, job_id, worker_id, self._clock(), outcome, value,
+                                       retry_in, self.result_ttl]))
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        return self._finish_job(job_id, worker_id, "succeeded", json.dumps(result, default=str))
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        attempts = int(self.client.hget(self._key(job_id), "attempts") or 0)
+        return self._finish_job(job_id, worker_id, "failed", error, self._backoff(attempts))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        fields = {_text(k): _text(v) for k, v in self.client.hgetall(self._key(job_id)).items()}
+        if not fields:
+            return None
+        return {
+            "id": job_id,
+            "status": fields["status"],
+            "attempts": int(fields["attempts"]),
+            "max_attempts": int(fields["max_attempts"]),
+            "result": json.loads(fields["result"]) if fields.get("result") else None,
+            "error": fields.get("error") or None,
+            "created_at": float(fields["created_at"]),
+            "updated_at": float(fields["updated_at"])
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        """Backlog sizes; finished jobs are not counted (their hashes expire)."""
+        return {
+            "queued": self.client.llen(f"{self.prefix}ready") + self.client.zcard(f"{self.prefix}delayed"),
+            "running": self.client.zcard(f"{self.prefix}leases")
+        }
+
+    def close(self):
+        self.client.close()
+
+
+def _text(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+def open_job_queue(url: str = None, **kwargs) -> JobQueue:
+    """
+    Job queue for JOB_QUEUE_URL: ``redis://...`` or ``sqlite:///path``
+    (default ``sqlite:///.cache/jobs.sqlite3``).
+    """
+    url = url or os.getenv("JOB_QUEUE_URL", "sqlite:///.cache/jobs.sqlite3")
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisJobQueue.from_url(url, **kwargs)
+    if url.startswith("sqlite:///"):
+        return SQLiteJobQueue(url[len("sqlite:///"):], **kwargs)
+    raise ValueError(f"Unsupported job queue URL: {url}")
@@ -0,0 +1,198 @@
+# services/job_worker.py
+"""
+Worker processes for the durable job queue.
+
+The API only enqueues ContentRequests (POST /jobs). Each worker process
+holds one copy of the agents and runs up to ``--concurrency`` jobs at a
+time through generator -> ReviewWorkflow -> ConsensusAgent, writing the
+result back to the queue. Start them next to the API with:
+
+    JOB_QUEUE_URL=redis://localhost:6379/0 python services/job_worker.py --processes 4
+"""
+
+from typing import Dict, Any, Optional, Callable
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import traceback
+import uuid
+
+# Ensure the root directory is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.job_queue import JobQueue, open_job_queue
+
+
+class JobWorker:
+    """
+    Claims jobs from a JobQueue and runs them through a GovernancePipeline.
+
+    ``concurrency`` jobs run at once on one event loop (agent calls are
+    awaited). While a job runs its lease is renewed every third of
+    ``visibility_timeout`` (JOB_VISIBILITY_TIMEOUT), so only a worker that
+    dies or hangs loses its jobs to another worker. Any exception fails the
+    attempt; the queue decides whether it is retried.
+    """
+
+    def __init__(self, queue: JobQueue, pipeline, worker_id: str = None, concurrency: int = None,
+                 visibility_timeout: float = None, poll_interval: float = None):
+        self.queue = queue
+        self.pipeline = pipeline
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.concurrency = int(concurrency or os.getenv("JOB_WORKER_CONCURRENCY", 4))
+        self.visibility_timeout = float(visibility_timeout or os.getenv("JOB_VISIBILITY_TIMEOUT", 300))
+        self.poll_interval = float(poll_interval or os.getenv("JOB_POLL_INTERVAL", 0.5))
+        self.processed = 0
+        self.failed = 0
+        self._stopping: Optional[asyncio.Event] = None
+
+    def stop(self):
+        """Stop claiming new jobs; jobs already running are finished."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def run(self, max_jobs: int = None):
+        """Process jobs until ``stop`` is called (or ``max_jobs`` have been claimed)."""
+        self._stopping = asyncio.Event()
+        self._claimed = 0
+        self._max_jobs = max_jobs
+        await asyncio.gather(*(self._slot() for _ in range(self.concurrency)))
+
+    async def _call(self, method, *args):
+        # Queue calls are short but blocking (SQLite or Redis round trips)
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    async def _slot(self):
+        while not self._stopping.is_set():
+            if self._max_jobs is not None and self._claimed >= self._max_jobs:
+                return
+            job = await self._call(self.queue.claim, self.worker_id, self.visibility_timeout)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._claimed += 1
+            await self._process(job)
+
+    async def _process(self, job: Dict[str, Any]):
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            result = await self.pipeline.arun(job["payload"])
+        except Exception as e:
+            self.failed += 1
+            print(f"Job {job['id']} attempt {job['attempts']} failed: {e}")
+            traceback.print_exc()
+            await self._call(self.queue.fail, job["id"], self.worker_id, f"{type(e).__name__}: {e}")
+        else:
+            self.processed += 1
+            if not await self._call(self.queue.complete, job["id"], self.worker_id, result):
+                print(f"Job {job['id']} finished after its lease expired; result discarded")
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                if not await self._call(self.queue.heartbeat, job_id, self.worker_id, self.visibility_timeout):
+                    print(f"Lost the lease on job {job_id}")
+                    return
+            except Exception as e:
+                print(f"Heartbeat for job {job_id} failed: {e}")
+
+
+def build_pipeline(registry_factory: Callable = None):
+    """The pipeline one worker process runs: its own agents, history recorder and no result cache."""
+    from workflows.review_workflow import ReviewWorkflow
+    from workflows.governance_pipeline import GovernancePipeline
+    from agents.registry import agent_registry
+
+    registry = registry_factory() if registry_factory is not None else agent_registry
+    recorder = None
+    if registry_factory is None and os.getenv("DATABASE_URL"):
+        try:
+            from database.models import SessionLocal, init_engines
+            from services.history_writer import BackgroundWriter, PipelineRecorder
+            init_engines()
+            recorder = PipelineRecorder(BackgroundWriter(SessionLocal))
+        except ImportError as e:
+            print(f"Database components not available: {e}")
+    return GovernancePipeline(ReviewWorkflow(registry=registry), registry=registry, recorder=recorder)
+
+
+def run_worker_process(queue_url: str = None, concurrency: int = None, registry_factory: Callable = None,
+                       preload: bool = False, visibility_timeout: float = None, poll_interval: float = None):
+    """Entry point of one worker process; returns when it gets SIGTERM or SIGINT."""
+    pipeline = build_pipeline(registry_factory)
+    if preload:
+        pipeline.registry.preload()
+    queue = open_job_queue(queue_url)
+    worker = JobWorker(queue, pipeline, concurrency=concurrency, visibility_timeout=visibility_timeout,
+                       poll_interval=poll_interval)
+
+    async def serve():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, worker.stop)
+        await worker.run()
+
+    print(f"Worker {worker.worker_id} started ({worker.concurrency} concurrent jobs)")
+    try:
+        asyncio.run(serve())
+    finally:
+        recorder = pipeline.recorder
+        if recorder is not None:
+            recorder.writer.shutdown(float(os.getenv("HISTORY_WRITER_SHUTDOWN_TIMEOUT", 10)))
+        queue.close()
+    print(f"Worker {worker.worker_id} stopped: {worker.processed} processed, {worker.failed} failed attempts")
+
+
+def start_workers(processes: int, **kwargs) -> list:
+    """Start ``processes`` worker processes (spawned, so none inherits another's models)."""
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=run_worker_process, kwargs=kwargs, name=f"job-worker-{i}")
+               for i in range(processes)]
+    for process in workers:
+        process.start()
+    return workers
+
+
+def stop_workers(workers: list, timeout: float = None):
+    """Ask workers to finish their running jobs and exit; kill any that do not."""
+    for process in workers:
+        if process.is_alive():
+            process.terminate()
+    for process in workers:
+        process.join(timeout)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run governance pipeline workers for the job queue")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("JOB_WORKER_PROCESSES", 1)))
+    parser.add_argument("--concurrency", type=int, default=None, help="jobs in flight per process")
+    parser.add_argument("--queue", default=None, help="JOB_QUEUE_URL (redis://... or sqlite:///path)")
+    parser.add_argument("--preload", action="store_true", help="build every agent before claiming jobs")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    workers = start_workers(args.processes, queue_url=args.queue, concurrency=args.concurrency,
+                            preload=args.preload)
+    # Children get SIGINT from the terminal too; wait for them to drain
+    signal.signal(signal.SIGINT, lambda *_: None)
+    signal.signal(signal.SIGTERM, lambda *_: stop_workers(workers, float(os.getenv("JOB_WORKER_STOP_TIMEOUT", 60))))
+    for process in workers:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
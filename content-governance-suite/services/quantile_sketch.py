@@ -0,0 +1,105 @@
+from typing import List, Optional
+
+
+class TDigest:
+    """
+    Merging t-digest for streaming quantile estimates in bounded memory.
+
+    Values are buffered and periodically merged into a few times
+    ``compression`` centroids at most. Centroids near the tails stay small, so
+    p95/p99 remain accurate while the median tolerates coarser centroids.
+    While every value still has its own centroid, quantiles are exact and
+    interpolated like SQL's ``percentile_cont``.
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._centroids: List[List[float]] = []  # [mean, weight], sorted by mean
+        self._buffer: List[float] = []
+        self._buffer_size = compression * 5
+
+    def add(self, value: float):
+        self._buffer.append(float(value))
+        self.count += 1
+        if len(self._buffer) >= self._buffer_size:
+            self._compress()
+
+    def extend(self, values):
+        """Add many values at once; cheaper than calling ``add`` in a loop."""
+        before = len(self._buffer)
+        self._buffer.extend(map(float, values))
+        self.count += len(self._buffer) - before
+        if len(self._buffer) >= self._buffer_size:
+            self._compress()
+
+    def merge(self, other: "TDigest"):
+        """Fold another digest into this one."""
+        other._compress()
+        if not other.count:
+            return
+        self._compress()
+        self._centroids.extend([mean, weight] for mean, weight in other._centroids)
+        self._centroids.sort(key=lambda centroid: centroid[0])
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress(force=True)
+
+    def _compress(self, force: bool = False):
+        if not self._buffer and not force:
+            return
+        if self._buffer:
+            low, high = min(self._buffer), max(self._buffer)
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        points = self._centroids + [[value, 1.0] for value in self._buffer]
+        self._buffer = []
+        if not points:
+            return
+        points.sort(key=lambda centroid: centroid[0])
+
+        merged = [list(points[0])]
+        weight_before = 0.0
+        for mean, weight in points[1:]:
+            current = merged[-1]
+            q = (weight_before + current[1] + weight / 2) / self.count
+            # Centroid size limit 4*n*q*(1-q)/compression: tiny at the tails
+            limit = max(1.0, 4 * self.count * q * (1 - q) / self.compression)
+            if current[1] + weight <= limit:
+                current[0] += (mean - current[0]) * weight / (current[1] + weight)
+                current[1] += weight
+            else:
+                weight_before += current[1]
+                merged.append([mean, weight])
+        self._centroids = merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile (0..1); None if nothing was added."""
+        self._compress()
+        if not self.count:
+            return None
+        if len(self._centroids) == self.count:
+            position = q * (self.count - 1)
+            lower = int(position)
+            upper = min(lower + 1, self.count - 1)
+            low, high = self._centroids[lower][0], self._centroids[upper][0]
+            return low + (high - low) * (position - lower)
+
+        target = q * self.count
+        cumulative = 0.0
+        previous_center, previous_mean = None, self.min
+        for mean, weight in self._centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                if previous_center is None:
+                    return self.min if target <= 0 else previous_mean + (mean - previous_mean) * target / center
+                return previous_mean + (mean - previous_mean) * (target - previous_center) / (center - previous_center)
+            previous_center, previous_mean = center, mean
+            cumulative += weight
+        # Past the last centroid's center: interpolate towards the maximum
+        if cumulative == previous_center:
+            return self.max
+        return previous_mean + (self.max - previous_mean) * (target - previous_center) / (cumulative - previous_center)
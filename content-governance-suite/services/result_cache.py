@@ -0,0 +1,224 @@
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Awaitable
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+# Bump when the pipeline's output changes shape so old entries are ignored
+CACHE_VERSION = 1
+
+# ContentRequest fields that determine the pipeline result, with their defaults
+REQUEST_KEY_FIELDS = {
+    "type": "blog_post",
+    "topic": "",
+    "style_guide": {},
+    "target_audience": "general",
+}
+
+
+def is_cacheable_result(result: Dict[str, Any]) -> bool:
+    """
+    Whether a pipeline result may be stored: agents turn LLM and model
+    exceptions into ``{"status": "error"}`` results, and a retry must not
+    get such a transient failure back from the cache.
+    """
+    if not isinstance(result, dict):
+        return False
+    if result.get("generated_content", {}).get("status") in ("failed", "error"):
+        return False
+    return not any(step.get("result", {}).get("status") == "error" for step in result.get("review_pipeline", []))
+
+
+def request_cache_key(content_request: Dict[str, Any]) -> str:
+    """Canonical hash of a content request; field order and omitted defaults do not matter."""
+    canonical = {}
+    for field, default in REQUEST_KEY_FIELDS.items():
+        value = content_request.get(field)
+        if value is None:
+            value = default
+        if isinstance(value, str):
+            value = " ".join(value.split())
+        canonical[field] = value
+    payload = json.dumps(canonical, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{CACHE_VERSION}:{payload}".encode("utf-8")).hexdigest()
+
+
+class MemoryResultBackend:
+    """In-process LRU of serialized results with per-entry expiry."""
+
+    def __init__(self, max_entries: int = None, clock=time.monotonic):
+        self.max_entries = int(max_entries or os.getenv("RESULT_CACHE_MAX_ENTRIES", 1000))
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float):
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def aclose(self):
+        self._entries.clear()
+
+
+class RedisResultBackend:
+    """
+    Results in Redis, shared by every worker process. ``client`` is any
+    asyncio Redis client (``redis.asyncio.Redis``, ``fakeredis.aioredis``).
+    """
+
+    def __init__(self, client, prefix: str = "pipeline-result:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisResultBackend":
+        import redis.asyncio as redis
+        return cls(redis.Redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.client.get(self.prefix + key)
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str, ttl: float):
+        await self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    async def aclose(self):
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close is not None:
+            await close()
+
+
+class ResultCache:
+    """
+    Request-level cache of full pipeline results.
+
+    ``get_or_run`` returns a stored result if there is one; otherwise it runs
+    the pipeline, and concurrent calls for the same key in this process wait
+    for that one run instead of starting their own (single flight). Only
+    successful runs are stored, for ``ttl`` seconds: runs that raised or
+    whose generation or review steps reported an error are shared with the
+    callers waiting on them but not stored (see ``is_cacheable_result``).
+    A failing backend is treated as a miss, so the cache can never fail a
+    request.
+    """
+
+    def __init__(self, backend=None, ttl: float = None):
+        self.backend = backend or MemoryResultBackend()
+        self.ttl = float(ttl if ttl is not None else os.getenv("RESULT_CACHE_TTL", 600))
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.backend_errors = 0
+        self.uncacheable = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            self.backend_errors += 1
+            print(f"Result cache read failed: {e}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    async def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """``get`` that counts towards the hit/miss statistics."""
+        cached = await self.get(key)
+        if cached is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return cached
+
+    async def set(self, key: str, result: Dict[str, Any]):
+        if not is_cacheable_result(result):
+            self.uncacheable += 1
+            return
+        await self._write(key, json.dumps(result, default=str))
+
+    async def _write(self, key: str, serialized: str):
+        try:
+            await self.backend.set(key, serialized, self.ttl)
+        except Exception as e:
+            self.backend_errors += 1
+            print(f"Result cache write failed: {e}")
+
+    async def get_or_run(self, key: str, run: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return json.loads(await asyncio.shield(pending))
+
+        cached = await self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        # Another caller may have started the run while we were reading the backend
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return json.loads(await asyncio.shield(pending))
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._run_and_store(key, run))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # shield: a cancelled caller must not cancel the run other callers share
+        return json.loads(await asyncio.shield(task))
+
+    async def _run_and_store(self, key: str, run) -> str:
+        result = await run()
+        serialized = json.dumps(result, default=str)
+        if is_cacheable_result(result):
+            await self._write(key, serialized)
+        else:
+            self.uncacheable += 1
+        # Every caller decodes its own copy, so none can mutate another's result
+        return serialized
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "in_flight": len(self._in_flight),
+            "uncacheable": self.uncacheable,
+            "backend_errors": self.backend_errors
+        }
+
+    async def aclose(self):
+        await self.backend.aclose()
+
+
+def build_result_cache() -> Optional[ResultCache]:
+    """
+    Result cache configured from the environment: RESULT_CACHE_BACKEND is
+    ``memory`` (default), ``redis`` (uses REDIS_URL) or ``none``.
+    """
+    backend = os.getenv("RESULT_CACHE_BACKEND", "memory").lower()
+    if backend == "none":
+        return None
+    if backend == "redis":
+        return ResultCache(RedisResultBackend.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0")))
+    if backend == "memory":
+        return ResultCache(MemoryResultBackend())
+    raise ValueError(f"Unknown result cache backend: {backend}")
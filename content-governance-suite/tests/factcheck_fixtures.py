@@ -0,0 +1,70 @@
+"""
+Shared fixtures for the fact-check tests: the legacy claim extractor kept
+as a reference implementation, and a document generator.
+"""
+
+import random
+import re
+
+
+# The pattern list used by FactualityAgent._extract_claims before the
+# single-pass extractor, kept verbatim as the reference implementation.
+LEGACY_CLAIM_PATTERNS = [
+    r"(\d+% of .+)", r"(studies show .+)", r"(according to .+)", r"(research indicates .+)",
+    r"(\d+ out of \d+ .+)", r"(\d+x more .+)", r"(up to \d+% .+)", r"(over \d+.+ .+)",
+    r"(more than \d+ .+)", r"(\d+ times .+)", r"(nearly \d+% .+)", r"(approximately \d+ .+)",
+    r"(experts say .+)", r"(scientists found .+)", r"(researchers discovered .+)", r"(data shows .+)",
+    r"(analysis reveals .+)", r"(survey found .+)", r"(report shows .+)", r"(clinical trials .+)",
+    r"(peer-reviewed .+)", r"(in recent years .+)", r"(latest research .+)", r"(new study .+)",
+    r"(recent data .+)", r"(breakthrough study .+)", r"(compared to .+)", r"(better than .+)",
+    r"(faster than .+)", r"(more effective than .+)", r"(proven to be .+)", r"(proven fact .+)",
+    r"(guaranteed to .+)", r"(scientifically proven .+)", r"(clinically proven .+)",
+    r"(evidence suggests .+)", r"(shown to .+)", r"(published in .+)", r"(featured in .+)",
+    r"(as reported by .+)", r"(cited by .+)", r"(recommended by .+)", r"(doctors recommend .+)",
+    r"(fda approved .+)", r"(clinically tested .+)", r"(medical professionals .+)",
+    r"(market leader .+)", r"(industry standard .+)", r"(award-winning .+)", r"(bestselling .+)",
+    r"(top-rated .+)", r"(customers report .+)", r"(users experience .+)", r"(testimonials show .+)",
+    r"(reviews indicate .+)", r"(world's first .+)", r"(only .+ that .+)", r"(never before .+)",
+    r"(revolutionary .+)", r"(breakthrough .+)", r"(cutting-edge .+)",
+]
+
+
+def legacy_extract_claims(content):
+    """The original implementation: one full scan per pattern."""
+    claims = []
+    for pattern in LEGACY_CLAIM_PATTERNS:
+        for match in re.finditer(pattern, content, re.IGNORECASE):
+            claims.append(match.group(1))
+    return claims
+
+
+SAMPLE_SENTENCES = [
+    "Studies show that 45% of marketers now use AI tools daily.",
+    "According to a recent survey, remote work is here to stay.",
+    "Our platform is faster than any competing solution on the market.",
+    "Clinically proven ingredients support healthy skin.",
+    "The weather was pleasant and the team enjoyed the offsite.",
+    "Experts say the new approach reduces errors by up to 30% in production.",
+    "We shipped a new dashboard for the analytics team last week.",
+    "This is the only tool that integrates with every major CMS.",
+    "Customers report saving over 10 hours a week on reporting.",
+    "Good documentation helps new contributors get started quickly.",
+    "Revolutionary design meets everyday practicality.",
+    "Doctors recommend regular breaks from screens.",
+]
+
+
+def make_document(size_bytes, seed=0, sentences_per_line=6):
+    """Lines of SAMPLE_SENTENCES, cut to size_bytes."""
+    rng = random.Random(seed)
+    lines, line, total = [], [], 0
+    while total < size_bytes:
+        sentence = rng.choice(SAMPLE_SENTENCES)
+        line.append(sentence)
+        total += len(sentence) + 1
+        if len(line) == sentences_per_line:
+            lines.append(" ".join(line))
+            line = []
+    if line:
+        lines.append(" ".join(line))
+    return "\n".join(lines)[:size_bytes]
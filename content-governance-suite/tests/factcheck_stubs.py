@@ -0,0 +1,178 @@
+"""
+Stub fact-check LLMs for the FactualityAgent tests: they answer every
+prompt from LABELED_SENTENCES in the agent's JSON verdict format, so runs
+are deterministic and need no API key.
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from agents.factcheck.factuality_agent import FactualityAgent
+from agents.consensus.consensus_agent import ConsensusAgent
+
+# (sentence, rating of the claim it contains; None for sentences without claims)
+LABELED_SENTENCES = [
+    ("According to the WHO, regular exercise lowers the risk of heart disease.", "ACCURATE"),
+    ("Published in Nature, the study followed two thousand households for a year.", "ACCURATE"),
+    ("Data shows remote teams adopted video calls within months.", "ACCURATE"),
+    ("In recent years electric vehicle sales have grown every quarter.", "ACCURATE"),
+    ("Customers report shorter onboarding times after the redesign.", "ACCURATE"),
+    ("Recommended by the national library association for school reading lists.", "ACCURATE"),
+    ("Studies show that our app makes teams 3x more productive.", "QUESTIONABLE"),
+    ("Experts say this is the best time to invest in crypto.", "QUESTIONABLE"),
+    ("Our platform is the industry standard for content review.", "QUESTIONABLE"),
+    ("It is faster than any competing tool on the market.", "QUESTIONABLE"),
+    ("Award-winning support is available around the clock.", "QUESTIONABLE"),
+    ("Nearly 90% of readers prefer shorter articles.", "QUESTIONABLE"),
+    ("Research indicates that people read less online.", "QUESTIONABLE"),
+    ("Clinically proven to cure insomnia in a single night.", "INACCURATE"),
+    ("Doctors recommend drinking ten liters of water a day.", "INACCURATE"),
+    ("The world's first smartphone was released in 2015.", "INACCURATE"),
+    ("Scientifically proven results show vitamin C prevents every cold.", "INACCURATE"),
+    ("Over 100 countries have banned coal power entirely.", "INACCURATE"),
+    ("FDA approved for treating anxiety in pets.", "INACCURATE"),
+]
+COMPLIANCE_SENTENCES = [
+    "We store your email address to send product updates.",
+    "Results are guaranteed within a week.",
+    "Our filters never fails to catch spam.",
+]
+CONSENT_SENTENCE = "We only contact you with your explicit consent."
+NEUTRAL_SENTENCES = [
+    "Our team wrote this guide to help you get started.",
+    "Read on for practical tips and examples.",
+    "Each section ends with a short checklist.",
+    "Thanks for reading and sharing your feedback.",
+    "Contact us with any questions about the new features.",
+]
+
+
+def make_labeled_documents(count, seed=0):
+    """Documents of 3-9 sentences: 0-4 claims, sometimes compliance problems."""
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        sentences = rng.sample(NEUTRAL_SENTENCES, rng.randint(1, 3))
+        sentences += [sentence for sentence, _ in rng.sample(LABELED_SENTENCES, rng.choice([0, 1, 1, 2, 2, 3, 4]))]
+        if rng.random() < 0.45:
+            sentences += rng.sample(COMPLIANCE_SENTENCES, rng.randint(1, 3))
+        if rng.random() < 0.3:
+            sentences.append(CONSENT_SENTENCE)
+        rng.shuffle(sentences)
+        documents.append(" ".join(sentences))
+    return documents
+
+
+class StubFactCheckLLM:
+    """Answers fact-check prompts from LABELED_SENTENCES, like a perfectly consistent fact-checker."""
+
+    def __init__(self, delay_ms=0.0):
+        self.delay = delay_ms / 1000
+        self.calls = 0
+        self.runnable = RunnableLambda(self._answer, afunc=self._aanswer)
+
+    def rate(self, claim):
+        for sentence, rating in LABELED_SENTENCES:
+            if claim.rstrip(".!?").lower() in sentence.lower():
+                return rating
+        return "QUESTIONABLE"
+
+    @staticmethod
+    def prompt_claims(prompt):
+        """The [{"id", "claim"}] list the agent put into the prompt"""
+        text = prompt.to_string()
+        return json.JSONDecoder().raw_decode(text, text.index("Claims: ") + len("Claims: "))[0]
+
+    def _reply(self, prompt):
+        self.calls += 1
+        verdicts = [{"id": item["id"], "rating": self.rate(item["claim"]), "reasoning": "labeled fixture"}
+                    for item in self.prompt_claims(prompt)]
+        return AIMessage(content=json.dumps({"verdicts": verdicts}))
+
+    def _answer(self, prompt):
+        time.sleep(self.delay)
+        return self._reply(prompt)
+
+    async def _aanswer(self, prompt):
+        await asyncio.sleep(self.delay)
+        return self._reply(prompt)
+
+
+def make_agent(llm, **config):
+    os.environ.setdefault("PPLX_API_KEY", "test")
+    agent = FactualityAgent({"verdict_cache_path": "", "verdict_cache_ttl": 0, **config})
+    agent.llm = llm.runnable
+    agent.log_activity = lambda *args, **kwargs: None
+    return agent
+
+
+def consensus_decisions(results, style_scores):
+    """Final decisions for factuality results paired with a StyleAnalyzer score each"""
+    consensus = ConsensusAgent()
+    consensus.log_activity = lambda *args, **kwargs: None
+    return [consensus.process([
+        {"agent": "FactualityChecker", "result": result},
+        {"agent": "StyleAnalyzer", "result": {"style_score": style_score, "status": "approved"}},
+        {"agent": "MultimodalReviewer", "result": {"status": "skipped"}},
+    ])["final_decision"] for result, style_score in zip(results, style_scores)]
+
+
+_REPORT_SUFFIX = re.compile(r"\s*\(report \d+\)")
+
+
+def make_claim_document(claims):
+    """A document with `claims` distinct claims; the report number keeps them from being deduplicated."""
+    sentences = [LABELED_SENTENCES[k % len(LABELED_SENTENCES)][0] for k in range(claims)]
+    return " ".join(f"{sentence[:-1]} (report {k})." for k, sentence in enumerate(sentences))
+
+
+def expected_flags(claims):
+    return sum(LABELED_SENTENCES[k % len(LABELED_SENTENCES)][1] != "ACCURATE" for k in range(claims))
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+class TokenDelayLLM(StubFactCheckLLM):
+    """Labeled-fixture fact-checker whose latency grows with prompt and output tokens."""
+
+    def __init__(self, base_ms=200.0, prefill_ms=0.05, token_ms=10.0, context_tokens=8192):
+        super().__init__()
+        self.base_ms, self.prefill_ms, self.token_ms = base_ms, prefill_ms, token_ms
+        self.context_tokens = context_tokens
+        self.max_prompt_tokens = 0
+        self._lock = threading.Lock()
+
+    def rate(self, claim):
+        return super().rate(_REPORT_SUFFIX.sub("", claim))
+
+    def _timed_reply(self, prompt):
+        reply = self._reply(prompt)
+        prompt_tokens, output_tokens = estimate_tokens(prompt.to_string()), estimate_tokens(reply.content)
+        with self._lock:
+            self.max_prompt_tokens = max(self.max_prompt_tokens, prompt_tokens)
+        if prompt_tokens + output_tokens > self.context_tokens:
+            raise ValueError(f"context length exceeded: {prompt_tokens} + {output_tokens} > {self.context_tokens}")
+        return reply, (self.base_ms + prompt_tokens * self.prefill_ms + output_tokens * self.token_ms) / 1000
+
+    def _answer(self, prompt):
+        reply, delay = self._timed_reply(prompt)
+        time.sleep(delay)
+        return reply
+
+    async def _aanswer(self, prompt):
+        reply, delay = self._timed_reply(prompt)
+        await asyncio.sleep(delay)
+        return reply
+
+    def _reply(self, prompt):
+        with self._lock:
+            return super()._reply(prompt)
@@ -0,0 +1,132 @@
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, ContentHistory, AgentMetrics
+from services.analytics_service import AnalyticsService, DashboardCache
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def add_history(db, decision, score, age_days=0, generation_time=2.0):
+    db.add(ContentHistory(
+        content_type="blog_post", topic="AI", generated_content="text",
+        final_decision=decision, final_score=score, factuality_score=score, style_score=score,
+        generation_time=generation_time, created_at=datetime.utcnow() - timedelta(days=age_days)
+    ))
+    db.commit()
+
+
+def test_dashboard_stats_in_one_query():
+    db = make_session()
+    add_history(db, "Approved", 0.9)
+    add_history(db, "Approved", 0.8)
+    add_history(db, "Needs Revision", 0.6, generation_time=4.0)
+    add_history(db, "Rejected", 0.1)
+    add_history(db, "Approved", 1.0, age_days=60)  # outside the window
+
+    stats = AnalyticsService(db, cache=None).get_dashboard_stats(days=30)
+
+    assert stats["content_stats"] == {
+        "total": 4, "approved": 2, "needs_revision": 1, "rejected": 1, "approval_rate": 50.0
+    }
+    assert abs(stats["quality_scores"]["average_final"] - 0.6) < 1e-9
+    assert stats["performance"]["avg_generation_time"] == 2.5
+
+
+def test_empty_window_reports_zeros():
+    stats = AnalyticsService(make_session(), cache=None).get_dashboard_stats(days=7)
+    assert stats["content_stats"]["total"] == 0
+    assert stats["content_stats"]["approval_rate"] == 0
+    assert stats["quality_scores"]["average_final"] == 0.0
+
+
+def test_cache_is_keyed_by_days_and_invalidated_by_new_rows():
+    now = [0.0]
+    cache = DashboardCache(ttl_seconds=5, clock=lambda: now[0])
+    db = make_session()
+    service = AnalyticsService(db, cache=cache)
+    add_history(db, "Approved", 0.9)
+
+    assert service.get_dashboard_stats(30)["content_stats"]["total"] == 1
+    add_history(db, "Approved", 0.9)
+    assert service.get_dashboard_stats(30)["content_stats"]["total"] == 1  # cached
+    assert service.get_dashboard_stats(7)["content_stats"]["total"] == 2   # different key
+
+    cache.invalidate()
+    assert service.get_dashboard_stats(30)["content_stats"]["total"] == 2
+
+    add_history(db, "Rejected", 0.1)
+    now[0] = 6.0  # past the TTL
+    assert service.get_dashboard_stats(30)["content_stats"]["total"] == 3
+
+
+def test_results_computed_before_an_invalidation_are_not_cached():
+    cache = DashboardCache(ttl_seconds=60)
+    generation = cache.generation
+    cache.invalidate()
+    cache.set(30, {"stale": True}, generation)
+    assert cache.get(30) is None
+
+
+def add_metric(db, agent, operation, execution_time, success=True, age_days=0):
+    db.add(AgentMetrics(agent_name=agent, operation_type=operation, execution_time=execution_time,
+                        success=success, timestamp=datetime.utcnow() - timedelta(days=age_days)))
+
+
+def test_agent_performance_aggregates_per_agent_and_operation():
+    db = make_session()
+    for seconds in (1.0, 2.0, 3.0, 4.0):
+        add_metric(db, "ContentGenerator", "generate", seconds)
+    add_metric(db, "ContentGenerator", "generate", None, success=False)
+    add_metric(db, "FactualityChecker", "review", 0.5)
+    add_metric(db, "FactualityChecker", "review", 1.5, success=False)
+    add_metric(db, "FactualityChecker", "rescore", 10.0)
+    add_metric(db, "FactualityChecker", "review", 99.0, age_days=30)  # outside the window
+    db.commit()
+
+    stats = AnalyticsService(db, cache=None).get_agent_performance(days=7)
+
+    generator = stats["ContentGenerator"]
+    assert generator["total_operations"] == 5
+    assert generator["successful_operations"] == 4
+    assert generator["error_rate"] == 20.0
+    assert generator["avg_execution_time"] == 2.5
+    assert generator["p50_execution_time"] == 2.5
+    assert abs(generator["p95_execution_time"] - 3.85) < 1e-9
+    assert set(generator["operations"]) == {"generate"}
+
+    checker = stats["FactualityChecker"]
+    assert checker["total_operations"] == 3
+    assert abs(checker["avg_execution_time"] - 4.0) < 1e-9
+    assert checker["p50_execution_time"] == 1.5
+    assert checker["operations"]["review"]["p50_execution_time"] == 1.0
+    assert checker["operations"]["review"]["success_rate"] == 50.0
+    assert checker["operations"]["rescore"]["p99_execution_time"] == 10.0
+
+
+def test_agent_performance_without_timings():
+    db = make_session()
+    add_metric(db, "ConsensusAgent", "consensus", None)
+    db.commit()
+    stats = AnalyticsService(db, cache=None).get_agent_performance()
+    assert stats["ConsensusAgent"]["avg_execution_time"] == 0.0
+    assert stats["ConsensusAgent"]["p95_execution_time"] is None
+
+
+if __name__ == "__main__":
+    test_dashboard_stats_in_one_query()
+    test_empty_window_reports_zeros()
+    test_cache_is_keyed_by_days_and_invalidated_by_new_rows()
+    test_results_computed_before_an_invalidation_are_not_cached()
+    test_agent_performance_aggregates_per_agent_and_operation()
+    test_agent_performance_without_timings()
+    print("✅ Analytics service tests passed!")
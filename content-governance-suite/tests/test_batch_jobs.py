@@ -0,0 +1,87 @@
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.batch_jobs import BatchJobManager
+
+
+class StubPipeline:
+    """Records peak concurrency; topics starting with "fail" raise."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.warmed = []
+
+    async def awarm(self, requests):
+        self.warmed = [request["topic"] for request in requests]
+
+    async def arun(self, request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if request["topic"].startswith("fail"):
+                raise RuntimeError("generation failed")
+            return {"topic": request["topic"]}
+        finally:
+            self.in_flight -= 1
+
+
+def test_job_respects_concurrency_and_records_failures():
+    pipeline = StubPipeline()
+    manager = BatchJobManager(pipeline, max_concurrency=8)
+    requests = [{"topic": f"topic {i}"} for i in range(9)] + [{"topic": "fail me"}]
+
+    async def run():
+        job = manager.submit(requests, concurrency=3)
+        await job.task
+        return job
+
+    job = asyncio.run(run())
+
+    assert pipeline.peak == 3
+    assert pipeline.warmed == [r["topic"] for r in requests]
+    summary = job.to_dict()
+    assert summary["status"] == "completed"
+    assert (summary["succeeded"], summary["failed"]) == (9, 1)
+    assert sorted(r["index"] for r in summary["results"]) == list(range(10))
+    assert [r for r in summary["results"] if r["status"] == "failed"][0]["topic"] == "fail me"
+
+
+def test_stream_yields_each_result_then_ends():
+    manager = BatchJobManager(StubPipeline(), max_concurrency=8)
+
+    async def run():
+        job = manager.submit([{"topic": f"t{i}"} for i in range(5)], concurrency=2)
+        return [result async for result in job.stream()]
+
+    streamed = asyncio.run(run())
+
+    assert sorted(result["index"] for result in streamed) == list(range(5))
+
+
+def test_concurrency_is_capped_and_jobs_can_be_cancelled():
+    manager = BatchJobManager(StubPipeline(delay=1), max_concurrency=4)
+
+    async def run():
+        job = manager.submit([{"topic": "slow"}] * 3, concurrency=100)
+        await asyncio.sleep(0)
+        assert manager.cancel(job.job_id)
+        await asyncio.gather(job.task, return_exceptions=True)
+        return job
+
+    job = asyncio.run(run())
+
+    assert job.concurrency == 4
+    assert job.status == "cancelled"
+    assert manager.get(job.job_id) is job
+
+
+if __name__ == "__main__":
+    test_job_respects_concurrency_and_records_failures()
+    test_stream_yields_each_result_then_ends()
+    test_concurrency_is_capped_and_jobs_can_be_cancelled()
+    print("✅ Batch job tests passed!")
@@ -0,0 +1,106 @@
+import sys
+import os
+import threading
+import time
+from concurrent.futures import TimeoutError
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.sentiment.batch_scheduler import MicroBatchScheduler
+
+
+def test_concurrent_callers_share_batches_and_get_their_own_results():
+    batch_sizes = []
+
+    def infer(items):
+        batch_sizes.append(len(items))
+        time.sleep(0.01)
+        return [item.upper() for item in items]
+
+    scheduler = MicroBatchScheduler(infer, max_batch_size=16, max_wait_ms=20)
+    results = {}
+
+    def caller(index):
+        chunks = [f"req{index}-chunk{i}" for i in range(3)]
+        results[index] = scheduler.infer(chunks)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    scheduler.shutdown()
+
+    for index in range(8):
+        assert results[index] == [f"REQ{index}-CHUNK{i}" for i in range(3)]
+    assert sum(batch_sizes) == 24
+    assert max(batch_sizes) > 3  # chunks from different requests were coalesced
+    assert all(size <= 16 for size in batch_sizes)
+
+    metrics = scheduler.get_metrics()
+    assert metrics["items"] == 24
+    assert metrics["batches"] == len(batch_sizes)
+    assert 0 < metrics["batch_fill_ratio"] <= 1
+    assert metrics["max_queue_wait_ms"] >= metrics["avg_queue_wait_ms"] >= 0
+
+
+def test_full_batch_flushes_before_deadline():
+    scheduler = MicroBatchScheduler(lambda items: items, max_batch_size=4, max_wait_ms=10000)
+    start = time.perf_counter()
+    assert scheduler.infer([1, 2, 3, 4]) == [1, 2, 3, 4]
+    assert time.perf_counter() - start < 1
+    scheduler.shutdown()
+
+
+def test_inference_errors_reach_every_caller():
+    def infer(items):
+        raise ValueError("model crashed")
+
+    scheduler = MicroBatchScheduler(infer, max_batch_size=8, max_wait_ms=1)
+    futures = scheduler.submit(["a", "b"])
+    for future in futures:
+        try:
+            future.result(timeout=5)
+            assert False, "expected the inference error"
+        except ValueError as e:
+            assert "model crashed" in str(e)
+    assert scheduler.get_metrics()["failed_batches"] == 1
+    scheduler.shutdown()
+
+
+def test_shutdown_during_submit_does_not_strand_the_items():
+    started = threading.Event()
+
+    class SlowSubmit(MicroBatchScheduler):
+        """Widens the gap between submit's stopped check and its puts."""
+
+        def _ensure_worker(self):
+            super()._ensure_worker()
+            started.set()
+            time.sleep(0.1)
+
+    scheduler = SlowSubmit(lambda items: items, max_batch_size=4, max_wait_ms=1)
+    futures = []
+    submitter = threading.Thread(target=lambda: futures.extend(scheduler.submit(["late"])))
+    submitter.start()
+    started.wait(5)
+    scheduler.shutdown()
+    submitter.join()
+
+    try:
+        assert futures[0].result(timeout=2) == "late"
+    except TimeoutError:
+        assert False, "item queued behind the shutdown sentinel was never answered"
+    try:
+        scheduler.submit(["after"])
+        assert False, "expected submit after shutdown to fail"
+    except RuntimeError as e:
+        assert "shut down" in str(e)
+    scheduler.shutdown()  # a second shutdown is a no-op
+
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_batches_and_get_their_own_results()
+    test_full_batch_flushes_before_deadline()
+    test_inference_errors_reach_every_caller()
+    test_shutdown_during_submit_does_not_strand_the_items()
+    print("✅ Batch scheduler tests passed!")
@@ -0,0 +1,55 @@
+import re
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.sentiment.chunking import chunk_text, split_sentences
+
+
+class WhitespaceTokenizer:
+    """Minimal stand-in for a fast HuggingFace tokenizer: one token per word."""
+
+    def __call__(self, text, add_special_tokens=True, return_offsets_mapping=False):
+        if isinstance(text, list):
+            return {"input_ids": [self(t)["input_ids"] for t in text]}
+        spans = [m.span() for m in re.finditer(r"\S+", text)]
+        encoded = {"input_ids": list(range(len(spans)))}
+        if return_offsets_mapping:
+            encoded["offset_mapping"] = spans
+        return encoded
+
+
+def test_split_sentences():
+    text = "First sentence. Second one!\nThird line without punctuation\n\nFourth? "
+    assert split_sentences(text) == [
+        "First sentence.", "Second one!", "Third line without punctuation", "Fourth?"
+    ]
+
+
+def test_chunks_pack_whole_sentences_within_token_budget():
+    text = "One two three. Four five six. Seven eight. Nine ten eleven twelve."
+    chunks = chunk_text(text, WhitespaceTokenizer(), max_tokens=6)
+
+    assert chunks == ["One two three. Four five six.", "Seven eight. Nine ten eleven twelve."]
+    assert all(len(chunk.split()) <= 6 for chunk in chunks)
+
+
+def test_long_sentence_is_split_on_token_boundaries():
+    sentence = " ".join(f"word{i}" for i in range(10)) + "."
+    chunks = chunk_text("Short intro. " + sentence, WhitespaceTokenizer(), max_tokens=4)
+
+    assert chunks[0] == "Short intro."
+    assert " ".join(chunks[1:]) == sentence
+    assert all(len(chunk.split()) <= 4 for chunk in chunks)
+
+
+def test_empty_content_has_no_chunks():
+    assert chunk_text("   ", WhitespaceTokenizer(), max_tokens=8) == []
+
+
+if __name__ == "__main__":
+    test_split_sentences()
+    test_chunks_pack_whole_sentences_within_token_budget()
+    test_long_sentence_is_split_on_token_boundaries()
+    test_empty_content_has_no_chunks()
+    print("✅ Chunking tests passed!")
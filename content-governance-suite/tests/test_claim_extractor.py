@@ -0,0 +1,70 @@
+import re
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.factcheck.claim_extractor import ClaimExtractor
+from factcheck_fixtures import LEGACY_CLAIM_PATTERNS, legacy_extract_claims, make_document
+
+SAMPLE_TEXT = (
+    "AI in healthcare offers numerous benefits. Studies show that AI can reduce "
+    "diagnostic errors by up to 30% in hospitals. According to the WHO, adoption is growing!\n"
+    "Our tool is faster than manual review. It is the only platform that audits every claim.\n"
+    "Nothing to see in this sentence. Clinically proven results follow."
+)
+
+
+def _first_sentence(claim):
+    """Cut a legacy (rest-of-line) claim at its first sentence boundary."""
+    match = re.search(r"[.!?](?=\s|$)", claim)
+    return claim[:match.end()] if match else claim
+
+
+def test_extracts_sentence_bounded_claims_with_categories():
+    claims = ClaimExtractor().extract(SAMPLE_TEXT)
+    texts = [claim["text"] for claim in claims]
+
+    assert texts == [
+        "Studies show that AI can reduce diagnostic errors by up to 30% in hospitals.",
+        "According to the WHO, adoption is growing!",
+        "faster than manual review.",
+        "only platform that audits every claim.",
+        "Clinically proven results follow.",
+    ]
+    # "up to 30%" sits inside the research claim and is merged into it
+    assert claims[0]["categories"] == ["authority", "statistical"]
+    assert claims[1]["categories"] == ["attribution"]
+    assert claims[4]["categories"] == ["certainty"]
+
+
+def test_repeated_and_overlapping_claims_are_deduplicated():
+    text = "Studies show 45% of teams ship faster. Studies show 45% of teams ship faster."
+    claims = ClaimExtractor().extract(text)
+
+    assert len(claims) == 1
+    assert sorted(claims[0]["categories"]) == ["authority", "statistical"]
+
+
+def test_claim_set_matches_legacy_implementation():
+    extractor = ClaimExtractor()
+    legacy_patterns = [re.compile(p, re.IGNORECASE) for p in LEGACY_CLAIM_PATTERNS]
+
+    for text in (SAMPLE_TEXT, make_document(64 * 1024, seed=7)):
+        claims = extractor.extract(text)
+        claim_texts = [claim["text"].lower() for claim in claims]
+
+        # Every claim starts exactly where one of the legacy patterns matches
+        for claim in claims:
+            assert any(p.match(text, claim["start"]) for p in legacy_patterns), claim
+
+        # Every legacy claim is covered by a claim, up to its sentence boundary
+        for legacy_claim in legacy_extract_claims(text):
+            head = _first_sentence(legacy_claim).strip().lower()
+            assert any(head in claim_text for claim_text in claim_texts), legacy_claim
+
+
+if __name__ == "__main__":
+    test_extracts_sentence_bounded_claims_with_categories()
+    test_repeated_and_overlapping_claims_are_deduplicated()
+    test_claim_set_matches_legacy_implementation()
+    print("✅ Claim extractor tests passed!")
@@ -0,0 +1,111 @@
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert, inspect
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, ContentHistory, DailyContentRollup
+from services.analytics_service import AnalyticsService
+from services.content_rollup import (
+    accumulate_rows, apply_rollup_deltas, rebuild_daily_rollup, ensure_daily_rollup
+)
+from services.history_writer import BackgroundWriter
+
+
+def make_session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rollup.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def history_row(decision, score, days_ago=0, generation_time=2.0):
+    created = datetime.utcnow() - timedelta(days=days_ago)
+    return {
+        "content_type": "blog_post", "topic": "AI", "generated_content": "text",
+        "final_decision": decision, "final_score": score, "generation_time": generation_time,
+        "created_at": created, "updated_at": created
+    }
+
+
+def rollup_snapshot(db):
+    return {
+        row.day: (row.total, row.approved, row.needs_revision, row.rejected,
+                  round(row.final_score_sum, 6), row.final_score_count)
+        for row in db.query(DailyContentRollup).all()
+    }
+
+
+ROWS = [
+    history_row("Approved", 0.9),
+    history_row("Rejected", 0.2),
+    history_row("Approved", None, days_ago=1),
+    history_row("Needs Revision", 0.5, days_ago=1),
+    history_row("Approved", 0.8, days_ago=3),
+    history_row("Approved", 0.7, days_ago=45),
+]
+
+
+def test_indexes_on_analytics_columns():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    indexes = {tuple(ix["column_names"]) for ix in inspect(engine).get_indexes("content_history")}
+    assert ("created_at", "final_decision") in indexes
+
+
+def test_incremental_rollup_matches_rebuild(tmp_path):
+    Session = make_session_factory(tmp_path)
+    with Session() as db:
+        # Two separate batches touching the same days exercise the upsert path
+        for batch in (ROWS[:3], ROWS[3:]):
+            db.execute(insert(ContentHistory), batch)
+            apply_rollup_deltas(db, accumulate_rows(batch))
+        db.commit()
+        incremental = rollup_snapshot(db)
+
+        assert rebuild_daily_rollup(db) == 4
+        db.commit()
+        assert rollup_snapshot(db) == incremental
+
+    today = datetime.utcnow().date()
+    assert incremental[today][:4] == (2, 1, 0, 1)
+    assert incremental[today - timedelta(days=1)][5] == 1  # the None score is not counted
+
+
+def test_writer_updates_rollup_and_trends_read_it(tmp_path):
+    Session = make_session_factory(tmp_path)
+    writer = BackgroundWriter(Session, batch_size=2, flush_interval=0.05)
+    for row in ROWS:
+        writer.record(ContentHistory, row)
+    writer.shutdown(timeout=5)
+
+    with Session() as db:
+        trends = AnalyticsService(db, cache=None).get_content_trends(days=30)
+
+    today = datetime.utcnow().date()
+    assert [t["date"] for t in trends] == [
+        (today - timedelta(days=d)).isoformat() for d in (3, 1, 0)
+    ]
+    assert trends[-1] == {"date": today.isoformat(), "total": 2, "approved": 1, "approval_rate": 50.0}
+
+
+def test_ensure_backfills_only_an_empty_rollup(tmp_path):
+    Session = make_session_factory(tmp_path)
+    with Session() as db:
+        assert ensure_daily_rollup(db) == 0
+        db.execute(insert(ContentHistory), ROWS)
+        db.commit()
+        assert ensure_daily_rollup(db) == 4
+        assert ensure_daily_rollup(db) == 0
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_indexes_on_analytics_columns()
+    for test in (test_incremental_rollup_matches_rebuild, test_writer_updates_rollup_and_trends_read_it,
+                 test_ensure_backfills_only_an_empty_rollup):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Content rollup tests passed!")
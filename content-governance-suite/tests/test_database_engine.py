@@ -0,0 +1,83 @@
+import sys
+import os
+import asyncio
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import exc, text
+import database.models as models
+
+
+@pytest.fixture
+def database_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'engine.db'}")
+    monkeypatch.setenv("DB_POOL_SIZE", "1")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "0.1")
+    asyncio.run(models.dispose_engines())
+    yield tmp_path
+    asyncio.run(models.dispose_engines())
+
+
+def test_engine_is_created_lazily_and_needs_a_url(monkeypatch):
+    asyncio.run(models.dispose_engines())
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    assert models.get_pool_stats() == {"sync": None, "async": None}
+    with pytest.raises(RuntimeError):
+        models.get_engine()
+
+
+def test_pool_settings_come_from_the_environment(database_env, monkeypatch):
+    monkeypatch.setenv("DB_POOL_RECYCLE", "60")
+    engine = models.get_engine()
+    assert isinstance(engine.pool, models.TimedQueuePool)
+    assert engine.pool.size() == 1
+    assert engine.pool._recycle == 60
+    assert engine.pool._pre_ping
+
+    with models.SessionLocal() as db:
+        assert db.execute(text("select 1")).scalar() == 1
+
+
+def test_checkout_waits_and_timeouts_are_recorded(database_env):
+    engine = models.get_engine()
+    before = models.TimedQueuePool.metrics.get_stats()
+
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    held.close()
+
+    stats = models.get_pool_stats()["sync"]
+    assert stats["timeouts"] == before["timeouts"] + 1
+    assert stats["checkouts"] == before["checkouts"] + 2
+    assert stats["max_wait_ms"] >= 100
+    assert stats["checked_out"] == 0
+
+
+def test_dispose_drops_the_engines(database_env):
+    models.init_engines()
+    assert models.get_pool_stats()["sync"] is not None
+    asyncio.run(models.dispose_engines())
+    assert models.get_pool_stats()["sync"] is None
+
+
+def test_async_session_uses_the_matching_driver(database_env):
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("greenlet")
+
+    async def query():
+        async with models.AsyncSessionLocal() as db:
+            value = (await db.execute(text("select 41 + 1"))).scalar()
+        stats = models.get_pool_stats()["async"]
+        await models.dispose_engines()
+        return value, stats
+
+    value, stats = asyncio.run(query())
+    assert value == 42
+    assert stats["checkouts"] >= 1
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Database engine tests passed!")
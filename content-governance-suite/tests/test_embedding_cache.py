@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.embeddings import Embeddings
+from agents.generator.embedding_cache import CachedEmbeddings, normalize_text
+
+
+class RecordingEmbeddings(Embeddings):
+    """Embeds text as [len(text)] and records every batch it receives."""
+
+    def __init__(self):
+        self.document_batches = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.document_batches.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text))]
+
+
+def test_normalized_text_shares_cache_entry():
+    underlying = RecordingEmbeddings()
+    cache = CachedEmbeddings(underlying)
+
+    assert normalize_text("  AI   in\nhealthcare ") == "AI in healthcare"
+    first = cache.embed_query("AI in healthcare")
+    second = cache.embed_query("  AI  in healthcare\n")
+
+    assert first == second
+    assert underlying.queries == ["AI in healthcare"]
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_document_misses_are_deduplicated_into_one_batch():
+    underlying = RecordingEmbeddings()
+    cache = CachedEmbeddings(underlying)
+    cache.embed_documents(["alpha"])
+
+    vectors = cache.embed_documents(["alpha", "beta", "beta", "gamma!"])
+
+    assert vectors == [[5.0], [4.0], [4.0], [6.0]]
+    assert underlying.document_batches == [["alpha"], ["beta", "gamma!"]]
+
+
+def test_bulk_topics_warm_the_query_cache():
+    underlying = RecordingEmbeddings()
+    cache = CachedEmbeddings(underlying)
+
+    cache.embed_queries(["topic one", "topic two"])
+    cache.embed_query("topic two")
+
+    assert underlying.document_batches == [["topic one", "topic two"]]
+    assert underlying.queries == []
+
+
+def test_asymmetric_models_cache_queries_separately():
+    underlying = RecordingEmbeddings()
+    cache = CachedEmbeddings(underlying, symmetric=False)
+
+    cache.embed_documents(["same text"])
+    cache.embed_query("same text")
+
+    assert underlying.queries == ["same text"]
+
+
+def test_least_recently_used_entry_is_evicted():
+    underlying = RecordingEmbeddings()
+    cache = CachedEmbeddings(underlying, max_entries=2)
+    cache.embed_query("a")
+    cache.embed_query("bb")
+    cache.embed_query("a")
+    cache.embed_query("ccc")
+
+    cache.embed_query("a")
+    cache.embed_query("bb")
+
+    assert underlying.queries == ["a", "bb", "ccc", "bb"]
+
+
+if __name__ == "__main__":
+    test_normalized_text_shares_cache_entry()
+    test_document_misses_are_deduplicated_into_one_batch()
+    test_bulk_topics_warm_the_query_cache()
+    test_asymmetric_models_cache_queries_separately()
+    test_least_recently_used_entry_is_evicted()
+    print("✅ Embedding cache tests passed!")
@@ -0,0 +1,104 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.export_service import ExportService
+
+PAYLOAD = {
+    "generated_content": {"content": "Solar capacity grew.", "metadata": {"topic": "Energy"}},
+    "final_decision": {"final_decision": "Approved", "final_score": 0.91, "summary": ["Accurate"]},
+}
+
+
+def test_cache_key_ignores_key_order_but_not_format():
+    service = ExportService(cache_dir="unused", max_workers=0)
+    reordered = {"final_decision": PAYLOAD["final_decision"], "generated_content": PAYLOAD["generated_content"]}
+    assert service.cache_key("pdf", PAYLOAD) == service.cache_key("pdf", reordered)
+    assert service.cache_key("pdf", PAYLOAD) != service.cache_key("word", PAYLOAD)
+
+
+def test_render_caches_artifacts_and_shares_concurrent_renders(tmp_path):
+    service = ExportService(cache_dir=str(tmp_path), max_workers=0)
+
+    async def run():
+        first = await asyncio.gather(*(service.render("pdf", PAYLOAD) for _ in range(4)))
+        again = await service.render("pdf", PAYLOAD)
+        word = await service.render("word", PAYLOAD)
+        return first, again, word
+
+    first, again, word = asyncio.run(run())
+    assert len(set(first)) == 1 and again == first[0]
+    assert service.renders == 2 and service.cache_hits == 4  # one PDF and one Word render
+    with open(again, "rb") as f:
+        assert f.read(5) == b"%PDF-"
+    assert word.endswith(".docx")
+
+
+def test_cache_is_pruned_to_the_newest_files(tmp_path):
+    service = ExportService(cache_dir=str(tmp_path), max_workers=0, max_cached_files=2)
+
+    async def run():
+        paths = []
+        for i in range(3):
+            payload = dict(PAYLOAD, generated_content={"content": f"Report {i}", "metadata": {}})
+            paths.append(await service.render("word", payload))
+            os.utime(paths[-1], (i, i))
+        return paths
+
+    paths = asyncio.run(run())
+    for path in paths:
+        service.release(path)
+    service._prune_cache()
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in paths[1:])
+
+
+def test_pruning_keeps_a_returned_path_until_it_is_released(tmp_path):
+    service = ExportService(cache_dir=str(tmp_path), max_workers=0, max_cached_files=1)
+    payloads = [dict(PAYLOAD, generated_content={"content": f"Report {i}", "metadata": {}}) for i in range(2)]
+
+    async def run():
+        returned = await service.render("word", payloads[0])  # not streamed yet
+        os.utime(returned, (0, 0))
+        service.release(await service.render("word", payloads[1]))  # prunes after rendering
+        return returned
+
+    returned = asyncio.run(run())
+    assert os.path.exists(returned) and service.get_stats()["leased"] == 1
+
+    service.release(returned)
+    service._prune_cache()
+    assert not os.path.exists(returned) and service.get_stats()["leased"] == 0
+
+
+def test_failed_render_releases_its_lease(tmp_path):
+    service = ExportService(cache_dir=str(tmp_path), max_workers=0)
+    try:
+        asyncio.run(service.render("pdf", {"final_decision": {"final_score": "not a number"}}))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("render should fail on a non-numeric score")
+    assert service.get_stats()["leased"] == 0
+
+
+def test_render_in_worker_process(tmp_path):
+    service = ExportService(cache_dir=str(tmp_path), max_workers=1)
+    try:
+        path = asyncio.run(service.render("pdf", PAYLOAD))
+    finally:
+        service.shutdown()
+    assert os.path.getsize(path) > 0
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_cache_key_ignores_key_order_but_not_format()
+    for test in (test_render_caches_artifacts_and_shares_concurrent_renders,
+                 test_cache_is_pruned_to_the_newest_files,
+                 test_pruning_keeps_a_returned_path_until_it_is_released,
+                 test_failed_render_releases_its_lease, test_render_in_worker_process):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Export service tests passed!")
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import random
+import sys
+import threading
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("langchain_perplexity")
+
+from langchain_core.messages import AIMessage
+from agents.factcheck import factuality_agent
+from factcheck_stubs import TokenDelayLLM, make_agent, make_claim_document, expected_flags
+
+
+class ConcurrencyProbe(TokenDelayLLM):
+    """Records batch sizes and the most prompts in flight; replies in shuffled order after a random delay."""
+
+    def __init__(self):
+        super().__init__(base_ms=0, prefill_ms=0, token_ms=0)
+        self.batch_sizes = []
+        self.in_flight = self.max_in_flight = 0
+        self.rng = random.Random(7)
+
+    def _timed_reply(self, prompt):
+        with self._lock:
+            self.batch_sizes.append(len(self.prompt_claims(prompt)))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            delay = self.rng.uniform(0.005, 0.03)
+        reply, _ = super()._timed_reply(prompt)
+        return reply, delay
+
+    def _reply(self, prompt):
+        verdicts = json.loads(super()._reply(prompt).content)["verdicts"]
+        with self._lock:
+            self.rng.shuffle(verdicts)
+        return AIMessage(content=json.dumps({"verdicts": verdicts}))
+
+    def _answer(self, prompt):
+        try:
+            return super()._answer(prompt)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    async def _aanswer(self, prompt):
+        try:
+            return await super()._aanswer(prompt)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_claims_are_checked_in_bounded_concurrent_batches():
+    llm = ConcurrencyProbe()
+    agent = make_agent(llm, cascade=False, claim_batch_size=4, max_concurrency=3)
+    result = agent.process({"content": make_claim_document(22)})
+
+    assert sorted(llm.batch_sizes) == [2, 4, 4, 4, 4, 4]
+    assert 1 < llm.max_in_flight <= 3
+    assert result["fact_check"]["llm"] == {"batches": 6, "unrated_claims": 0}
+    assert len(result["fact_check"]["flagged_claims"]) == expected_flags(22)
+
+
+def test_async_batches_respect_the_semaphore():
+    llm = ConcurrencyProbe()
+    agent = make_agent(llm, cascade=False, claim_batch_size=3, max_concurrency=2)
+    result = asyncio.run(agent.aprocess({"content": make_claim_document(15)}))
+
+    assert llm.calls == 5 and llm.max_in_flight == 2
+    assert len(result["fact_check"]["flagged_claims"]) == expected_flags(15)
+
+
+def test_merged_verdicts_do_not_depend_on_batching_or_completion_order():
+    document = make_claim_document(30)
+    single = make_agent(TokenDelayLLM(0, 0, 0), cascade=False, claim_batch_size=100).process({"content": document})
+    for batch_size, concurrency in [(1, 8), (7, 3), (10, 1)]:
+        batched = make_agent(ConcurrencyProbe(), cascade=False, claim_batch_size=batch_size,
+                             max_concurrency=concurrency).process({"content": document})
+        assert batched["fact_check"]["flagged_claims"] == single["fact_check"]["flagged_claims"]
+        assert batched["overall_score"] == single["overall_score"]
+
+
+def test_every_batch_waits_for_the_provider_rate_limit(monkeypatch):
+    acquired = []
+    monkeypatch.setattr(factuality_agent.provider_limits, "acquire", lambda provider: acquired.append(provider))
+    make_agent(TokenDelayLLM(0, 0, 0), cascade=False, claim_batch_size=5).process(
+        {"content": make_claim_document(12)})
+    assert acquired == ["perplexity"] * 3
+
+
+def test_parse_verdicts_handles_fences_fallback_and_stray_ids():
+    agent = make_agent(TokenDelayLLM(0, 0, 0))
+    fenced = ('Here you go [as requested]:\n```json\n{"verdicts": [{"id": 3, "rating": "inaccurate", '
+              '"reasoning": "No such study"}, {"id": 9, "rating": "QUESTIONABLE"}, {"id": 3, "rating": "ACCURATE"}, '
+              '{"id": "x"}, {"id": 4, "rating": "MAYBE"}]}\n```')
+    assert agent._parse_verdicts(fenced, [2, 3]) == {2: {"rating": "INACCURATE", "reasoning": "No such study"}}
+
+    lines = "Claim 3: **QUESTIONABLE** - vague\nClaim 4: [ACCURATE] - ok"
+    assert agent._parse_verdicts(lines, [2, 3]) == {2: {"rating": "QUESTIONABLE", "reasoning": "vague"},
+                                                    3: {"rating": "ACCURATE", "reasoning": "ok"}}
+    assert agent._parse_verdicts("I cannot verify these claims.", [0, 1]) == {}
+
+
+def test_claims_without_a_verdict_count_as_questionable():
+    class Unhelpful(TokenDelayLLM):
+        def _reply(self, prompt):
+            self.calls += 1
+            return AIMessage(content="Sorry, I can't help with that.")
+
+    agent = make_agent(Unhelpful(0, 0, 0), cascade=False, claim_batch_size=2, verdict_cache_ttl=3600)
+    result = agent.process({"content": make_claim_document(5)})
+    assert result["fact_check"]["llm"] == {"batches": 3, "unrated_claims": 5}
+    assert len(result["fact_check"]["flagged_claims"]) == 5
+    assert all(flag.startswith("QUESTIONABLE") for flag in result["fact_check"]["flagged_claims"])
+    assert result["status"] == "failed"
+    assert agent.get_cache_stats()["memory_entries"] == 0
+
+
+class FailsOnce(TokenDelayLLM):
+    """Raises for the first prompt that contains claim id 3."""
+
+    def __init__(self):
+        super().__init__(0, 0, 0)
+        self.failed = False
+
+    def _timed_reply(self, prompt):
+        if not self.failed and any(item["id"] == 3 for item in self.prompt_claims(prompt)):
+            self.failed = True
+            raise ConnectionError("provider unavailable")
+        return super()._timed_reply(prompt)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_failed_batch_keeps_the_verdicts_of_the_others(use_async):
+    llm = FailsOnce()
+    agent = make_agent(llm, cascade=False, claim_batch_size=2, verdict_cache_ttl=3600)
+    document = {"content": make_claim_document(6)}
+    run = (lambda: asyncio.run(agent.aprocess(document))) if use_async else (lambda: agent.process(document))
+
+    failed = run()
+    assert failed["status"] == "error" and "provider unavailable" in failed["error"]
+    assert llm.calls == 2
+
+    retried = run()
+    assert llm.calls == 3  # only the failed batch is checked again
+    assert retried["fact_check"]["cache"] == {"hits": 4, "misses": 2}
+    assert len(retried["fact_check"]["flagged_claims"]) == expected_flags(6)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_cached_verdicts_are_merged_into_flagged_claims_in_claim_order(use_async):
+    llm = TokenDelayLLM(0, 0, 0)
+    agent = make_agent(llm, cascade=False, verdict_cache_ttl=3600)
+    document = make_claim_document(6)
+    claims = [claim["text"] for claim in agent.claim_extractor.extract(document)]
+    seeded = {0: {"rating": "INACCURATE", "reasoning": "cached verdict"},
+              3: {"rating": "QUESTIONABLE", "reasoning": "cached verdict"}}
+    for index, verdict in seeded.items():
+        agent.verdict_cache.set(claims[index], verdict)
+
+    if use_async:
+        result = asyncio.run(agent.aprocess({"content": document}))
+    else:
+        result = agent.process({"content": document})
+
+    verdicts = [seeded.get(index) or {"rating": llm.rate(claim), "reasoning": "labeled fixture"}
+                for index, claim in enumerate(claims)]
+    assert result["fact_check"]["flagged_claims"] == [
+        f"{verdict['rating']}: \"{claim}\" - {verdict['reasoning']}"
+        for claim, verdict in zip(claims, verdicts) if verdict["rating"] != "ACCURATE"]
+    assert result["fact_check"]["cache"] == {"hits": 2, "misses": 4}
+    assert llm.calls == 1
+
+
+def test_async_path_keeps_verdict_cache_io_off_the_event_loop():
+    agent = make_agent(TokenDelayLLM(0, 0, 0), cascade=False, verdict_cache_ttl=3600)
+    on_loop_thread = []
+    for name in ("get_many", "set"):
+        method = getattr(agent.verdict_cache, name)
+
+        def recorded(*args, _method=method, _name=name):
+            on_loop_thread.append((_name, threading.current_thread() is threading.main_thread()))
+            return _method(*args)
+        setattr(agent.verdict_cache, name, recorded)
+
+    result = asyncio.run(agent.aprocess({"content": make_claim_document(4)}))
+    assert result["status"] != "error"
+    assert {name for name, _ in on_loop_thread} == {"get_many", "set"}
+    assert not any(on_loop for _, on_loop in on_loop_thread)
+
+
+def test_prompt_that_overflows_the_context_fails_but_batches_fit():
+    document = make_claim_document(120)
+    single = make_agent(TokenDelayLLM(0, 0, 0, context_tokens=2000), cascade=False, claim_batch_size=500)
+    assert single.process({"content": document})["status"] == "error"
+
+    batched = make_agent(TokenDelayLLM(0, 0, 0, context_tokens=2000), cascade=False, claim_batch_size=10)
+    result = batched.process({"content": document})
+    assert len(result["fact_check"]["flagged_claims"]) == expected_flags(120)
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Fact-check batching tests passed!")
@@ -0,0 +1,93 @@
+import asyncio
+import sys
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("langchain_perplexity")
+
+from factcheck_stubs import StubFactCheckLLM, make_agent, make_labeled_documents, consensus_decisions
+
+NON_COMPLIANT = ("We store your email address to send product updates. Results are guaranteed within a week. "
+                 "Research indicates that people read less online. ")
+
+
+def check(content, **config):
+    llm = StubFactCheckLLM()
+    agent = make_agent(llm, **config)
+    return agent.process({"content": content}), llm.calls, agent
+
+
+def test_content_that_fails_compliance_skips_the_llm():
+    result, calls, _ = check(NON_COMPLIANT + "Nearly 90% of readers prefer shorter articles.")
+    assert calls == 0
+    assert result["status"] == "failed"
+    assert result["fact_check"]["cascade"] == {"outcome": "guaranteed_fail", "escalated_claims": 0,
+                                               "unverified_claims": 2}
+
+    always, always_calls, _ = check(NON_COMPLIANT + "Nearly 90% of readers prefer shorter articles.", cascade=False)
+    assert always_calls == 1 and always["status"] == "failed"
+
+
+def test_content_that_could_pass_is_escalated_for_its_score():
+    # One flag cannot fail this content, but it lowers the score the consensus weighs
+    content = "Read on for practical tips. Doctors recommend drinking ten liters of water a day."
+    result, calls, _ = check(content)
+    always, _, _ = check(content, cascade=False)
+    assert calls == 1
+    assert result["fact_check"]["cascade"]["outcome"] == "escalated"
+    assert result["overall_score"] == always["overall_score"] == 0.85
+    assert result["fact_check"]["flagged_claims"] == always["fact_check"]["flagged_claims"]
+
+
+def test_ambiguous_content_escalates_risky_claims_only():
+    content = ("Doctors recommend drinking ten liters of water a day. Nearly 90% of readers prefer shorter "
+               "articles. According to the WHO, regular exercise lowers the risk of heart disease.")
+    result, calls, _ = check(content, min_claim_risk=0.5)
+    assert calls == 1
+    assert result["fact_check"]["cascade"] == {"outcome": "escalated", "escalated_claims": 2,
+                                               "unverified_claims": 1}
+    assert len(result["fact_check"]["flagged_claims"]) == 2
+    assert result["status"] == "failed"
+
+
+def test_low_risk_claims_threshold():
+    content = ("According to the WHO, regular exercise lowers the risk of heart disease. Published in Nature, "
+               "the study followed two thousand households for a year.")
+    _, calls, _ = check(content)
+    assert calls == 1  # two flags would fail the content, so the LLM decides by default
+
+    result, calls, agent = check(content, min_claim_risk=0.5)
+    assert calls == 0
+    assert result["fact_check"]["cascade"]["outcome"] == "low_risk_claims"
+    assert agent.get_cascade_stats()["llm_avoided_fraction"] == 1.0
+
+
+def test_async_path_uses_the_cascade():
+    llm = StubFactCheckLLM()
+    agent = make_agent(llm)
+    result = asyncio.run(agent.aprocess({"content": NON_COMPLIANT + "Over 100 countries have banned coal power."}))
+    assert llm.calls == 0 and result["fact_check"]["cascade"]["outcome"] == "guaranteed_fail"
+
+
+def test_default_cascade_agrees_with_always_llm_on_fixture_set():
+    documents = make_labeled_documents(80, seed=3)
+    always_llm, cascade_llm = StubFactCheckLLM(), StubFactCheckLLM()
+    always, cascade = make_agent(always_llm, cascade=False), make_agent(cascade_llm)
+
+    cascade_results = [cascade.process({"content": document}) for document in documents]
+    always_results = [always.process({"content": document}) for document in documents]
+    assert [r["status"] for r in cascade_results] == [r["status"] for r in always_results]
+    for style_score in (0.7, 1.0):
+        styles = [style_score] * len(documents)
+        assert consensus_decisions(cascade_results, styles) == consensus_decisions(always_results, styles)
+    assert cascade_llm.calls < always_llm.calls
+
+    stats = cascade.get_cascade_stats()
+    assert stats["llm_calls"] == cascade_llm.calls
+    assert stats["llm_calls"] + stats["llm_calls_avoided"] == always_llm.calls
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Factuality cascade tests passed!")
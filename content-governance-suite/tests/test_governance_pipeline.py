@@ -0,0 +1,109 @@
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.base_agent import BaseAgent
+from agents.registry import AgentRegistry
+from workflows.governance_pipeline import GovernancePipeline
+from workflows.review_workflow import ReviewWorkflow
+
+
+class StubAgent(BaseAgent):
+    def __init__(self, name, delay, result):
+        super().__init__(name)
+        self.delay = delay
+        self.result = result
+        self.cancelled = False
+
+    def process(self, content):
+        return dict(self.result)
+
+    async def aprocess(self, content):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return dict(self.result)
+
+
+class StreamingGenerator(StubAgent):
+    async def astream(self, content_request):
+        for token in ["Hello", " world"]:
+            yield {"type": "token", "content": token}
+        yield {"type": "generated", "data": {"content": "Hello world", "status": "generated"}}
+
+
+def make_registry(factuality_status="approved", factuality_delay=0.03):
+    agents = {
+        "content_generator": StreamingGenerator("ContentGenerator", 0, {}),
+        "factuality": StubAgent("FactualityChecker", factuality_delay, {"status": factuality_status}),
+        "style_analyzer": StubAgent("StyleAnalyzer", 0.01, {"status": "approved"}),
+        "multimodal_reviewer": StubAgent("MultimodalReviewer", 0.02, {"status": "approved"}),
+        "consensus": StubAgent("ConsensusAgent", 0, {"final_decision": "approved"}),
+    }
+    registry = AgentRegistry()
+    for name, agent in agents.items():
+        registry.register(name, lambda agent=agent: agent)
+    return registry, agents
+
+
+def collect(pipeline):
+    async def run():
+        return [event async for event in pipeline.astream({"topic": "AI"})]
+    return asyncio.run(run())
+
+
+def test_stream_emits_tokens_then_reviews_as_they_finish_then_consensus():
+    registry, _ = make_registry()
+    pipeline = GovernancePipeline(ReviewWorkflow({"execution_mode": "concurrent"}, registry), registry)
+
+    events = [e for e in collect(pipeline) if e["type"] != "generation_update"]
+
+    assert [e["type"] for e in events] == [
+        "token", "token", "generated_content",
+        "review_result", "review_result", "review_result", "consensus"
+    ]
+    # Completion order, not reporting order
+    assert [e["data"]["agent"] for e in events if e["type"] == "review_result"] == [
+        "StyleAnalyzer", "MultimodalReviewer", "FactualityChecker"
+    ]
+
+
+def test_speculative_stream_holds_reviews_until_factuality_passes():
+    registry, _ = make_registry()
+    pipeline = GovernancePipeline(ReviewWorkflow({"execution_mode": "speculative"}, registry), registry)
+
+    reviews = [e["data"]["agent"] for e in collect(pipeline) if e["type"] == "review_result"]
+
+    assert reviews[0] == "FactualityChecker"
+    assert sorted(reviews[1:]) == ["MultimodalReviewer", "StyleAnalyzer"]
+
+
+def test_speculative_failure_cancels_other_reviewers():
+    registry, agents = make_registry(factuality_status="failed", factuality_delay=0.001)
+    agents["style_analyzer"].delay = agents["multimodal_reviewer"].delay = 1
+    workflow = ReviewWorkflow({"execution_mode": "speculative"}, registry)
+
+    steps = asyncio.run(workflow.aexecute({"content": "text"}))
+
+    assert [step["agent"] for step in steps] == ["FactualityChecker"]
+    assert agents["style_analyzer"].cancelled and agents["multimodal_reviewer"].cancelled
+
+
+def test_aexecute_returns_steps_in_reporting_order():
+    registry, _ = make_registry()
+    workflow = ReviewWorkflow({"execution_mode": "concurrent"}, registry)
+
+    steps = asyncio.run(workflow.aexecute({"content": "text"}))
+
+    assert [step["agent"] for step in steps] == ["FactualityChecker", "StyleAnalyzer", "MultimodalReviewer"]
+
+
+if __name__ == "__main__":
+    test_stream_emits_tokens_then_reviews_as_they_finish_then_consensus()
+    test_speculative_stream_holds_reviews_until_factuality_passes()
+    test_speculative_failure_cancels_other_reviewers()
+    test_aexecute_returns_steps_in_reporting_order()
+    print("✅ Governance pipeline tests passed!")
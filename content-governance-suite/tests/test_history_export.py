@@ -0,0 +1,92 @@
+import sys
+import os
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert
+from database.models import Base, ContentHistory
+from services.history_export import HistoryExportService, PYARROW_AVAILABLE
+from services.export_service import ExportService
+
+
+def make_engine(tmp_path, rows=25):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(ContentHistory), [
+            {
+                "content_type": "blog_post", "topic": f"Topic, {i}", "generated_content": f"Body {i}\nline two",
+                "final_decision": "Approved" if i % 2 else "Rejected", "final_score": i / 100,
+                "factuality_score": 0.5, "style_score": 0.25 if i else None, "generation_time": 1.5,
+                "created_at": now - timedelta(days=i), "updated_at": now
+            }
+            for i in range(rows)
+        ])
+    return engine
+
+
+def test_csv_streams_one_chunk_per_batch(tmp_path):
+    service = HistoryExportService(engine=make_engine(tmp_path), batch_size=10)
+    chunks = list(service.stream("csv"))
+    assert len(chunks) == 3
+
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert len(rows) == 25
+    assert rows[1]["topic"] == "Topic, 1"
+    assert rows[1]["factuality_score"] == "0.5" and rows[1]["style_score"] == "0.25"
+    assert rows[0]["style_score"] == ""
+    assert "generated_content" not in rows[0]
+
+
+def test_ndjson_filters_and_includes_content(tmp_path):
+    service = HistoryExportService(engine=make_engine(tmp_path), batch_size=4)
+    data = b"".join(service.stream("ndjson", days=10, decision="Approved", include_content=True))
+    records = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+    assert [r["topic"] for r in records] == [f"Topic, {i}" for i in (1, 3, 5, 7, 9)]
+    assert records[0]["generated_content"] == "Body 1\nline two"
+    datetime.fromisoformat(records[0]["created_at"])
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+def test_parquet_and_arrow_round_trip(tmp_path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    service = HistoryExportService(engine=make_engine(tmp_path), batch_size=10)
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(service.stream("parquet"))))
+    assert parquet.metadata.num_rows == 25 and parquet.num_row_groups == 3
+    table = parquet.read()
+    assert table.column("style_score").null_count == 1
+    assert table.schema.field("created_at").type == pa.timestamp("us")
+
+    arrow = pa.ipc.open_stream(b"".join(service.stream("arrow"))).read_all()
+    assert arrow.num_rows == 25
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        HistoryExportService(engine=None).check_format("xlsx")
+
+
+def test_export_to_csv_fills_review_scores():
+    content = {
+        "generated_content": {"metadata": {"topic": "AI"}},
+        "review_pipeline": [
+            {"agent": "FactualityChecker", "result": {"overall_score": 0.8}},
+            {"agent": "StyleAnalyzer", "result": {"style_score": 0.7}},
+        ],
+        "final_decision": {"final_decision": "Approved", "final_score": 0.75},
+    }
+    rows = list(csv.DictReader(ExportService().export_to_csv([content])))
+    assert rows[0]["Factuality Score"] == "0.8" and rows[0]["Style Score"] == "0.7"
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ History export tests passed!")
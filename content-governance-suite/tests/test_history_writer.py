@@ -0,0 +1,124 @@
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, ContentHistory, AgentMetrics, DailyContentRollup
+from services.history_writer import BackgroundWriter, PipelineRecorder
+
+
+def make_session_factory():
+    path = os.path.join(tempfile.mkdtemp(), "history.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+REVIEWS = [
+    {"agent": "FactualityChecker", "result": {"overall_score": 0.9, "status": "approved", "agent_id": "f"},
+     "execution_time": 0.5},
+    {"agent": "StyleAnalyzer", "result": {"status": "error", "error": "model missing"}, "execution_time": 0.1},
+]
+
+
+def test_pipeline_run_is_written_as_history_and_agent_metrics():
+    session_factory = make_session_factory()
+    writer = BackgroundWriter(session_factory, batch_size=100, flush_interval=0.05)
+    recorder = PipelineRecorder(writer)
+
+    recorder.record_run(
+        {"topic": "AI", "type": "blog_post", "target_audience": "general"},
+        {"content": "Generated.", "metadata": {"agent_id": "g"}},
+        REVIEWS,
+        {"final_decision": "Approved", "final_score": 0.8, "agent_id": "c"},
+        generation_time=1.5, consensus_time=0.01
+    )
+    recorder.record_generation_failure("LLM timeout", generation_time=2.0)
+    writer.shutdown()
+
+    session = session_factory()
+    history = session.query(ContentHistory).one()
+    assert (history.topic, history.final_decision, history.generation_time) == ("AI", "Approved", 1.5)
+    assert (history.factuality_score, history.style_score, history.multimodal_score) == (0.9, None, None)
+    assert history.agent_ids == ["g", "f", None, "c"]
+
+    metrics = {(m.agent_name, m.success) for m in session.query(AgentMetrics)}
+    assert metrics == {("ContentGenerator", True), ("FactualityChecker", True), ("StyleAnalyzer", False),
+                       ("ConsensusAgent", True), ("ContentGenerator", False)}
+
+
+def test_rows_are_flushed_in_batches_by_size_and_time():
+    session_factory = make_session_factory()
+    writer = BackgroundWriter(session_factory, batch_size=10, flush_interval=0.05)
+    recorder = PipelineRecorder(writer)
+
+    for i in range(25):
+        recorder.record_agent_call("StyleAnalyzer", "review", i / 100)
+    time.sleep(0.3)
+
+    metrics = writer.get_metrics()
+    assert metrics["rows_written"] == 25
+    assert metrics["flushes"] == 3
+    assert metrics["buffer_depth"] == 0
+    writer.shutdown()
+
+
+def test_shutdown_drains_the_buffer_and_rejects_new_rows():
+    session_factory = make_session_factory()
+    writer = BackgroundWriter(session_factory, batch_size=1000, flush_interval=60)
+    recorder = PipelineRecorder(writer)
+    for _ in range(50):
+        recorder.record_agent_call("ConsensusAgent", "consensus", 0.01)
+
+    writer.shutdown()
+
+    assert session_factory().query(AgentMetrics).count() == 50
+    assert writer.record(AgentMetrics, {}) is False
+
+
+def test_long_topic_is_truncated_to_the_column_length():
+    session_factory = make_session_factory()
+    writer = BackgroundWriter(session_factory, batch_size=100, flush_interval=0.05)
+    PipelineRecorder(writer).record_run({"topic": "x" * 500}, {"content": "Generated."}, [],
+                                        {"final_decision": "Approved", "final_score": 0.8},
+                                        generation_time=1.0, consensus_time=0.01)
+    writer.shutdown()
+
+    history = session_factory().query(ContentHistory).one()
+    assert history.topic == "x" * 200
+    assert history.created_at.tzinfo is None
+
+
+def test_a_rejected_row_does_not_drop_the_rest_of_the_batch():
+    session_factory = make_session_factory()
+    writer = BackgroundWriter(session_factory, batch_size=100, flush_interval=0.05)
+    flushed = []
+    writer.add_flush_listener(flushed.append)
+    recorder = PipelineRecorder(writer)
+    for topic in ("first", "second"):
+        recorder.record_run({"topic": topic}, {"content": "Generated."}, [],
+                            {"final_decision": "Approved", "final_score": 0.8},
+                            generation_time=1.0, consensus_time=0.01)
+    writer.record(ContentHistory, {"content_type": None, "topic": "bad", "generated_content": ""})
+    writer.shutdown()
+
+    session = session_factory()
+    assert sorted(h.topic for h in session.query(ContentHistory)) == ["first", "second"]
+    assert session.query(DailyContentRollup).one().total == 2
+    metrics = writer.get_metrics()
+    assert metrics["rows_written"] == 6 and metrics["rows_failed"] == 1
+    assert "NOT NULL" in metrics["last_error"]
+    assert flushed and set().union(*flushed) == {ContentHistory, AgentMetrics}
+
+
+if __name__ == "__main__":
+    test_pipeline_run_is_written_as_history_and_agent_metrics()
+    test_rows_are_flushed_in_batches_by_size_and_time()
+    test_shutdown_drains_the_buffer_and_rejects_new_rows()
+    test_long_topic_is_truncated_to_the_column_length()
+    test_a_rejected_row_does_not_drop_the_rest_of_the_batch()
+    print("✅ History writer tests passed!")
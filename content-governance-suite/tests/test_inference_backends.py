@@ -0,0 +1,92 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.sentiment.style_analyzer import StyleAnalyzerAgent
+from agents.sentiment.inference_backends import load_classifier, INFERENCE_BACKENDS
+
+TEXTS = [
+    "The launch went well and customers are happy.",
+    "Support was slow.",
+    "We will share an update next week after the review of the onboarding flow is finished.",
+    "Thanks for the feedback.",
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    """A small random-weight RoBERTa classifier saved with a word-level fast tokenizer."""
+    pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    pytest.importorskip("onnxruntime")
+    from tokenizers import Tokenizer, models, pre_tokenizers
+
+    specials = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    words = sorted({word for text in TEXTS for word in text.split()})
+    tokenizer = Tokenizer(models.WordLevel({w: i for i, w in enumerate(specials + words)}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    fast_tokenizer = transformers.PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, unk_token="[UNK]", pad_token="[PAD]", cls_token="[CLS]", sep_token="[SEP]",
+        mask_token="[MASK]", model_max_length=64)
+    model = transformers.RobertaForSequenceClassification(transformers.RobertaConfig(
+        vocab_size=len(specials) + len(words), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=64, max_position_embeddings=70, pad_token_id=0, num_labels=3,
+        id2label={0: "NEGATIVE", 1: "NEUTRAL", 2: "POSITIVE"}))
+    path = str(tmp_path_factory.mktemp("models") / "sentiment")
+    model.save_pretrained(path)
+    fast_tokenizer.save_pretrained(path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def onnx_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("STYLE_ONNX_CACHE_DIR", str(tmp_path / "onnx"))
+    return tmp_path / "onnx"
+
+
+def test_onnx_backend_matches_pytorch_pipeline(tiny_model):
+    reference = load_classifier("sentiment-analysis", tiny_model, "pytorch")(TEXTS, batch_size=3, truncation=True)
+    onnx = load_classifier("sentiment-analysis", tiny_model, "onnx")(TEXTS, batch_size=3, truncation=True)
+
+    assert [r["label"] for r in onnx] == [r["label"] for r in reference]
+    for ours, theirs in zip(onnx, reference):
+        assert ours["score"] == pytest.approx(theirs["score"], abs=1e-4)
+
+
+@pytest.mark.parametrize("backend", ["int8", "onnx-int8"])
+def test_quantized_backends_classify_every_text(tiny_model, backend):
+    results = load_classifier("sentiment-analysis", tiny_model, backend)(TEXTS, batch_size=2, truncation=True)
+    assert len(results) == len(TEXTS)
+    assert all(r["label"] in ("NEGATIVE", "NEUTRAL", "POSITIVE") and 0 <= r["score"] <= 1 for r in results)
+
+
+def test_onnx_export_is_cached(tiny_model, onnx_cache):
+    load_classifier("sentiment-analysis", tiny_model, "onnx-int8")
+    exported = sorted(p for p in onnx_cache.rglob("*.onnx"))
+    assert [p.name for p in exported] == ["model.int8.onnx", "model.onnx"]
+    mtimes = [p.stat().st_mtime_ns for p in exported]
+
+    load_classifier("sentiment-analysis", tiny_model, "onnx-int8")
+    assert [p.stat().st_mtime_ns for p in exported] == mtimes
+
+
+def test_agent_uses_configured_backend(tiny_model):
+    agent = StyleAnalyzerAgent({"model_server": "", "inference_backend": "onnx", "micro_batching": False,
+                                "sentiment_model": tiny_model, "toxicity_model": tiny_model})
+    result = agent.process({"content": " ".join(TEXTS)})
+    assert result["status"] in ("approved", "needs_revision")
+    assert type(agent.sentiment_analyzer).__name__ == "OnnxTextClassifier"
+
+
+def test_unknown_backend_is_rejected():
+    assert "onnx" in INFERENCE_BACKENDS
+    with pytest.raises(ValueError, match="Unknown inference backend"):
+        StyleAnalyzerAgent({"inference_backend": "tensorrt"})
+    with pytest.raises(ValueError, match="Unknown inference backend"):
+        load_classifier("sentiment-analysis", "any-model", "tensorrt")
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Inference backend tests passed!")
@@ -0,0 +1,169 @@
+import asyncio
+import sys
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.base_agent import BaseAgent
+from agents.registry import AgentRegistry
+from services.job_queue import SQLiteJobQueue, RedisJobQueue, LEASE_EXPIRED_ERROR, open_job_queue
+from services.job_worker import JobWorker
+from workflows.governance_pipeline import GovernancePipeline
+from workflows.review_workflow import ReviewWorkflow
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def make_queue(request, tmp_path):
+    def make(clock=None, **kwargs):
+        kwargs.setdefault("max_attempts", 3)
+        kwargs.setdefault("retry_delay", 10)
+        if clock is not None:
+            kwargs["clock"] = clock
+        if request.param == "sqlite":
+            return SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), **kwargs)
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        return RedisJobQueue(fakeredis.FakeRedis(), **kwargs)
+    return make
+
+
+def test_jobs_are_claimed_once_in_fifo_order(make_queue):
+    queue = make_queue()
+    first = queue.enqueue({"topic": "Solar"})
+    second = queue.enqueue({"topic": "Wind"})
+
+    job = queue.claim("w1", 30)
+    assert job == {"id": first, "payload": {"topic": "Solar"}, "attempts": 1}
+    assert queue.claim("w2", 30)["id"] == second
+    assert queue.claim("w3", 30) is None
+
+    assert queue.complete(first, "w1", {"final_decision": "Approved"})
+    stored = queue.get(first)
+    assert stored["status"] == "succeeded"
+    assert stored["result"] == {"final_decision": "Approved"}
+    assert queue.get("missing") is None
+
+
+def test_expired_lease_is_reclaimed_and_late_result_rejected(make_queue):
+    clock = FakeClock()
+    queue = make_queue(clock)
+    job_id = queue.enqueue({"topic": "Tides"})
+    assert queue.claim("w1", 30)["id"] == job_id
+
+    clock.now += 20
+    assert queue.heartbeat(job_id, "w1", 30)
+    clock.now += 20
+    assert queue.claim("w2", 30) is None  # heartbeat extended the lease
+
+    clock.now += 15
+    reclaimed = queue.claim("w2", 30)
+    assert reclaimed["id"] == job_id and reclaimed["attempts"] == 2
+    assert not queue.complete(job_id, "w1", {"stale": True})
+    assert not queue.heartbeat(job_id, "w1", 30)
+    assert queue.complete(job_id, "w2", {"fresh": True})
+    assert queue.get(job_id)["result"] == {"fresh": True}
+
+
+def test_failures_retry_with_backoff_then_fail(make_queue):
+    clock = FakeClock()
+    queue = make_queue(clock)
+    job_id = queue.enqueue({"topic": "Geothermal"})
+
+    for attempt, backoff in ((1, 10), (2, 20)):
+        assert queue.claim("w1", 30)["attempts"] == attempt
+        assert queue.fail(job_id, "w1", "LLM timeout")
+        assert queue.get(job_id)["status"] == "queued"
+        clock.now += backoff - 1
+        assert queue.claim("w1", 30) is None
+        clock.now += 1
+
+    assert queue.claim("w1", 30)["attempts"] == 3
+    assert queue.fail(job_id, "w1", "LLM timeout")
+    job = queue.get(job_id)
+    assert job["status"] == "failed" and job["error"] == "LLM timeout"
+    clock.now += 1000
+    assert queue.claim("w1", 30) is None
+
+
+def test_lease_expiry_counts_as_an_attempt(make_queue):
+    clock = FakeClock()
+    queue = make_queue(clock, max_attempts=1)
+    job_id = queue.enqueue({"topic": "Hydro"})
+    queue.claim("w1", 30)
+    clock.now += 31
+    assert queue.claim("w2", 30) is None
+    job = queue.get(job_id)
+    assert job["status"] == "failed" and job["error"] == LEASE_EXPIRED_ERROR
+
+
+def test_sqlite_queue_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    producer = open_job_queue(f"sqlite:///{path}")
+    consumer = SQLiteJobQueue(path)
+    job_id = producer.enqueue({"topic": "Biomass"})
+    assert consumer.claim("w1", 30)["id"] == job_id
+    assert producer.get_stats()["running"] == 1
+    producer.close()
+    consumer.close()
+
+
+class StubAgent(BaseAgent):
+    def __init__(self, name, result, fail_times=0):
+        super().__init__(name)
+        self.result = result
+        self.fail_times = fail_times
+
+    def process(self, content):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("provider unavailable")
+        return dict(self.result)
+
+
+def make_pipeline(generator_failures=0):
+    agents = {
+        "content_generator": StubAgent("ContentGenerator", {"content": "Text", "status": "generated"},
+                                       generator_failures),
+        "factuality": StubAgent("FactualityChecker", {"status": "approved"}),
+        "style_analyzer": StubAgent("StyleAnalyzer", {"status": "approved"}),
+        "multimodal_reviewer": StubAgent("MultimodalReviewer", {"status": "approved"}),
+        "consensus": StubAgent("ConsensusAgent", {"final_decision": "Approved"}),
+    }
+    registry = AgentRegistry()
+    for name, agent in agents.items():
+        registry.register(name, lambda agent=agent: agent)
+    return GovernancePipeline(ReviewWorkflow({"execution_mode": "concurrent"}, registry), registry)
+
+
+def test_worker_runs_jobs_and_retries_failures(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=3, retry_delay=0)
+    job_ids = [queue.enqueue({"topic": f"Topic {i}"}) for i in range(5)]
+    worker = JobWorker(queue, make_pipeline(generator_failures=1), worker_id="w1", concurrency=2,
+                       visibility_timeout=30, poll_interval=0.01)
+
+    async def run():
+        task = asyncio.create_task(worker.run())
+        while queue.get_stats()["succeeded"] < len(job_ids):
+            await asyncio.sleep(0.01)
+        worker.stop()
+        await task
+
+    asyncio.run(asyncio.wait_for(run(), 10))
+    assert worker.processed == 5 and worker.failed == 1
+    for job_id in job_ids:
+        job = queue.get(job_id)
+        assert job["result"]["final_decision"] == {"final_decision": "Approved"}
+    assert sum(queue.get(job_id)["attempts"] for job_id in job_ids) == 6
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Job queue tests passed!")
@@ -0,0 +1,103 @@
+import asyncio
+import sys
+import os
+import threading
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("faiss")
+
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from agents.generator.knowledge_base import KnowledgeBase
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings that record how many texts were embedded."""
+    embedded: int = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def make_kb(index_dir):
+    return KnowledgeBase(CountingEmbeddings(size=16), index_dir, chunk_size=20, chunk_overlap=0)
+
+
+def test_unchanged_documents_are_not_re_embedded(tmp_path):
+    kb = make_kb(str(tmp_path))
+    docs = [{"id": "tone", "text": "Keep a professional tone."},
+            {"id": "facts", "text": "Always fact-check claims before publishing."}]
+
+    first = kb.add_documents(docs)
+    embedded = kb.embeddings.embedded
+    second = kb.add_documents(docs)
+
+    assert first["added"] == 2 and first["chunks_embedded"] == embedded
+    assert second["unchanged"] == 2 and second["chunks_embedded"] == 0
+    assert kb.embeddings.embedded == embedded
+
+
+def test_update_embeds_only_changed_chunks_and_drops_stale_ones(tmp_path):
+    kb = make_kb(str(tmp_path))
+    kb.add_documents([{"id": "guide", "text": "Use clear language.\n\nCite your sources."}])
+
+    stats = kb.add_documents([{"id": "guide", "text": "Use clear language.\n\nAvoid jargon."}])
+    texts = [doc.page_content for doc in kb.vectorstore.docstore._dict.values()]
+
+    assert stats["updated"] == 1
+    assert stats["chunks_embedded"] == 1
+    assert stats["chunks_removed"] == 1
+    assert sorted(texts) == ["Avoid jargon.", "Use clear language."]
+
+
+def test_saved_index_reloads_and_supports_removal(tmp_path):
+    index_dir = str(tmp_path)
+    kb = make_kb(index_dir)
+    kb.add_documents([{"id": "a", "text": "Include relevant examples."},
+                      {"id": "b", "text": "Write for the target audience."}])
+    kb.save()
+
+    reloaded = make_kb(index_dir)
+    assert reloaded.get_stats()["documents"] == 2
+    assert reloaded.embeddings.embedded == 0
+
+    assert reloaded.remove_documents(["a"]) == 1
+    results = reloaded.vectorstore.similarity_search("examples", k=5)
+    assert {doc.metadata["source"] for doc in results} == {"b"}
+
+
+def test_retriever_searches_the_current_index_and_waits_for_writes(tmp_path):
+    kb = make_kb(str(tmp_path))
+    kb.add_documents([{"id": "a", "text": "Include relevant examples."}])
+    retriever = kb.as_retriever(search_kwargs={"k": 5})
+    kb.add_documents([{"id": "b", "text": "Write for the target audience."}])
+    assert {doc.metadata["source"] for doc in retriever.invoke("audience")} == {"a", "b"}
+
+    results = []
+    with kb._lock:  # a write in progress
+        searcher = threading.Thread(target=lambda: results.append(retriever.invoke("examples")))
+        searcher.start()
+        searcher.join(0.2)
+        assert searcher.is_alive() and not results
+    searcher.join(5)
+    assert len(results) == 1 and {doc.metadata["source"] for doc in results[0]} == {"a", "b"}
+
+    assert {doc.metadata["source"] for doc in asyncio.run(retriever.ainvoke("examples"))} == {"a", "b"}
+
+
+def test_memory_mapped_index_is_copied_before_an_update(tmp_path):
+    kb = make_kb(str(tmp_path))
+    kb.add_documents([{"id": "a", "text": "Include relevant examples."},
+                      {"id": "b", "text": "Write for the target audience."}])
+    kb.save()
+
+    reloaded = make_kb(str(tmp_path))
+    reloaded.add_documents([{"id": "c", "text": "Prefer active voice."}])
+    assert reloaded.get_stats()["memory_mapped"] is False
+    assert {doc.metadata["source"] for doc in reloaded.similarity_search("voice", k=10)} == {"a", "b", "c"}
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Knowledge base tests passed!")
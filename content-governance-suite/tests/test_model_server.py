@@ -0,0 +1,114 @@
+import re
+import sys
+import os
+import threading
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.sentiment.style_analyzer import StyleAnalyzerAgent
+from agents.sentiment.model_server import StyleModelServer, StyleModelClient
+
+
+class WhitespaceTokenizer:
+    model_max_length = 512
+
+    def __call__(self, text, add_special_tokens=True, return_offsets_mapping=False):
+        if isinstance(text, list):
+            return {"input_ids": [self(t)["input_ids"] for t in text]}
+        spans = [m.span() for m in re.finditer(r"\S+", text)]
+        encoded = {"input_ids": list(range(len(spans)))}
+        if return_offsets_mapping:
+            encoded["offset_mapping"] = spans
+        return encoded
+
+
+class KeywordPipeline:
+    """Stand-in for a transformers pipeline: labels a chunk by whether it contains a keyword."""
+
+    def __init__(self, keyword, hit, miss):
+        self.tokenizer = WhitespaceTokenizer()
+        self.keyword, self.hit, self.miss = keyword, hit, miss
+        self.calls = 0
+
+    def __call__(self, chunks, batch_size=None, truncation=None):
+        self.calls += 1
+        return [{"label": self.hit if self.keyword in chunk else self.miss, "score": 0.9} for chunk in chunks]
+
+
+class LocalModelsAgent(StyleAnalyzerAgent):
+    def _load_pipeline(self, task, model):
+        if task == "sentiment-analysis":
+            return KeywordPipeline("great", "POSITIVE", "NEUTRAL")
+        return KeywordPipeline("idiot", "TOXIC", "NON_TOXIC")
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = StyleModelServer(str(tmp_path / "style.sock"),
+                              LocalModelsAgent({"model_server": "", "max_chunk_tokens": 6}))
+    server.preload()
+    server.serve_in_thread()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def strip_volatile(result):
+    return {key: value for key, value in result.items() if key not in ("agent_id", "timestamp")}
+
+
+def test_remote_agent_matches_local_agent_without_loading_models(server):
+    text = "This is a great product. Only an idiot would miss it. Plain closing line."
+    # Chunking happens in the server, with the server agent's settings
+    remote = StyleAnalyzerAgent({"model_server": server.socket_path})
+    local = LocalModelsAgent({"model_server": "", "max_chunk_tokens": 6})
+
+    assert strip_volatile(remote.process({"content": text})) == strip_volatile(local.process({"content": text}))
+    assert remote.process({"content": text})["readability"]["toxic_chunks"] == 1
+    assert remote._sentiment_analyzer is None and remote._readability_analyzer is None
+    assert set(remote.get_inference_metrics()) == {"sentiment", "toxicity"}
+
+
+def test_concurrent_workers_share_the_server_models(server):
+    remote = StyleAnalyzerAgent({"model_server": server.socket_path})
+    results = []
+
+    def worker(i):
+        results.append(remote.classify_text("toxicity", f"Sentence {i} from a polite writer."))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [[{"label": "NON_TOXIC", "score": 0.9}]] * 16
+    assert server.agent.readability_analyzer.calls <= 16
+    assert server.agent.get_inference_metrics()["toxicity"]["items"] == 16
+
+
+def test_server_errors_are_raised_and_connections_recover(tmp_path, server):
+    client = StyleModelClient(server.socket_path)
+    with pytest.raises(RuntimeError, match="Unknown model"):
+        client.classify("emotion", "text")
+    assert client.request({"op": "ping"}) == "pong"
+
+    # The idle connection dies with the server; a new server is reached on the next call
+    server.shutdown()
+    server.server_close()
+    restarted = StyleModelServer(server.socket_path, LocalModelsAgent({"model_server": ""}))
+    restarted.serve_in_thread()
+    try:
+        assert client.request({"op": "ping"}) == "pong"
+    finally:
+        client.close()
+        restarted.shutdown()
+        restarted.server_close()
+
+    with pytest.raises(ConnectionError):
+        StyleModelClient(str(tmp_path / "missing.sock")).request({"op": "ping"})
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Model server tests passed!")
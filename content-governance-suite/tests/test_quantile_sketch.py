@@ -0,0 +1,60 @@
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.quantile_sketch import TDigest
+
+
+def exact_quantile(values, q):
+    values = sorted(values)
+    position = q * (len(values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def test_small_inputs_are_exact():
+    digest = TDigest()
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    for value in values:
+        digest.add(value)
+    for q in (0.0, 0.5, 0.95, 0.99, 1.0):
+        assert abs(digest.quantile(q) - exact_quantile(values, q)) < 1e-9
+    assert TDigest().quantile(0.5) is None
+
+
+def test_large_skewed_input_stays_accurate_and_bounded():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0, 1) for _ in range(200000)]
+    digest = TDigest(compression=100)
+    for value in values:
+        digest.add(value)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = exact_quantile(values, q)
+        assert abs(digest.quantile(q) - exact) / exact < 0.01
+    assert len(digest._centroids) < 1000
+    assert digest.quantile(1.0) == max(values)
+
+
+def test_merge_equals_single_stream():
+    rng = random.Random(3)
+    values = [rng.expovariate(1.0) for _ in range(50000)]
+    left, right = TDigest(), TDigest()
+    for value in values[:20000]:
+        left.add(value)
+    for value in values[20000:]:
+        right.add(value)
+    left.merge(right)
+
+    assert left.count == len(values)
+    exact = exact_quantile(values, 0.99)
+    assert abs(left.quantile(0.99) - exact) / exact < 0.01
+
+
+if __name__ == "__main__":
+    test_small_inputs_are_exact()
+    test_large_skewed_input_stays_accurate_and_bounded()
+    test_merge_equals_single_stream()
+    print("✅ Quantile sketch tests passed!")
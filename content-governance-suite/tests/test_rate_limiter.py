@@ -0,0 +1,51 @@
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.rate_limiter import TokenBucket, ProviderRateLimits
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_paced_reservations():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+    assert bucket.get_stats()["delayed"] == 2
+
+
+def test_tokens_refill_over_time_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now = 10.0
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_provider_limits_from_environment(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_TESTPROVIDER_RPS", "5")
+    monkeypatch.setenv("RATE_LIMIT_TESTPROVIDER_BURST", "3")
+    limits = ProviderRateLimits()
+
+    bucket = limits.get("testprovider")
+    assert (bucket.rate, bucket.capacity) == (5.0, 3.0)
+    assert limits.get("unconfigured") is None
+    assert asyncio.run(limits.aacquire("unconfigured")) == 0.0
+
+
+if __name__ == "__main__":
+    test_burst_then_paced_reservations()
+    test_tokens_refill_over_time_up_to_capacity()
+    print("✅ Rate limiter tests passed!")
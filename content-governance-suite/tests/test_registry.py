@@ -0,0 +1,143 @@
+import asyncio
+import subprocess
+import sys
+import os
+import threading
+import time
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.base_agent import BaseAgent
+from agents.registry import AgentRegistry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CountingAgent(BaseAgent):
+    def __init__(self, name="Counting"):
+        super().__init__(name)
+        self.shutdowns = 0
+
+    def process(self, content):
+        return {"status": "approved"}
+
+    def shutdown(self):
+        self.shutdowns += 1
+
+
+class CountingFactory:
+    """Builds CountingAgents, optionally slowly, and counts how often it was called."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.threads = []
+
+    def __call__(self):
+        self.calls += 1
+        self.threads.append(threading.current_thread())
+        time.sleep(self.delay)
+        return CountingAgent()
+
+
+def make_registry(*names, delay=0.0):
+    registry = AgentRegistry()
+    factories = {name: CountingFactory(delay) for name in names}
+    for name, factory in factories.items():
+        registry.register(name, factory)
+    return registry, factories
+
+
+def test_agents_are_built_on_first_get_and_shared():
+    registry, factories = make_registry("style_analyzer", "consensus")
+    assert factories["style_analyzer"].calls == 0
+    assert not registry.is_loaded("style_analyzer")
+
+    agent = registry.get("style_analyzer")
+    assert registry.get("style_analyzer") is agent
+    assert factories["style_analyzer"].calls == 1
+    assert registry.is_loaded("style_analyzer") and not registry.is_loaded("consensus")
+    assert factories["consensus"].calls == 0
+
+
+def test_concurrent_first_gets_build_the_agent_once():
+    registry, factories = make_registry("factuality", delay=0.05)
+    agents = []
+    threads = [threading.Thread(target=lambda: agents.append(registry.get("factuality"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert factories["factuality"].calls == 1
+    assert len({id(agent) for agent in agents}) == 1
+
+
+def test_unknown_agent_is_rejected():
+    registry, _ = make_registry("consensus")
+    with pytest.raises(KeyError, match="Unknown agent"):
+        registry.get("translator")
+    assert not registry.is_loaded("translator")
+
+
+def test_register_replaces_the_factory_and_drops_the_built_agent():
+    registry, _ = make_registry("consensus")
+    old = registry.get("consensus")
+    replacement = CountingFactory()
+    registry.register("consensus", replacement)
+    assert not registry.is_loaded("consensus")
+    assert registry.get("consensus") is not old and replacement.calls == 1
+
+
+def test_preload_builds_the_named_agents_or_all():
+    registry, factories = make_registry("factuality", "style_analyzer", "consensus")
+    registry.preload(["consensus"])
+    assert [registry.is_loaded(name) for name in registry.names()] == [False, False, True]
+
+    registry.preload()
+    assert all(registry.is_loaded(name) for name in registry.names())
+    assert all(factory.calls == 1 for factory in factories.values())
+
+
+def test_status_reports_loads_without_triggering_any():
+    registry, factories = make_registry("factuality", "consensus", delay=0.01)
+    registry.get("consensus")
+    status = registry.status()
+    assert status["factuality"] == {"status": "not_loaded"}
+    assert status["consensus"]["status"] == "active" and status["consensus"]["load_time"] >= 0.01
+    assert factories["factuality"].calls == 0
+
+
+def test_aget_builds_off_the_event_loop():
+    registry, factories = make_registry("style_analyzer")
+
+    async def run():
+        first = await registry.aget("style_analyzer")
+        return first, await registry.aget("style_analyzer")
+
+    first, second = asyncio.run(run())
+    assert first is second and factories["style_analyzer"].calls == 1
+    assert factories["style_analyzer"].threads[0] is not threading.main_thread()
+
+
+def test_shutdown_only_reaches_loaded_agents_and_survives_failures():
+    registry, factories = make_registry("factuality", "style_analyzer", "consensus")
+    broken = registry.get("factuality")
+    broken.shutdown = lambda: 1 / 0
+    style = registry.get("style_analyzer")
+
+    registry.shutdown()
+    assert style.shutdowns == 1
+    assert factories["consensus"].calls == 0
+
+
+def test_importing_the_registry_loads_no_agent_modules():
+    script = ("import sys; import agents.registry; "
+              "print(sorted(m for m in ('transformers', 'torch', 'langchain_perplexity', "
+              "'agents.factcheck.factuality_agent', 'agents.sentiment.style_analyzer') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Agent registry tests passed!")
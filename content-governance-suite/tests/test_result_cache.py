@@ -0,0 +1,244 @@
+import asyncio
+import sys
+import os
+import time
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.base_agent import BaseAgent
+from agents.registry import AgentRegistry
+from services.result_cache import (
+    request_cache_key, MemoryResultBackend, RedisResultBackend, ResultCache
+)
+from workflows.governance_pipeline import GovernancePipeline, GenerationFailed
+from workflows.review_workflow import ReviewWorkflow
+
+
+class FakeAsyncRedis:
+    """Local stand-in for redis.asyncio.Redis: GET and SET with PX expiry."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, name):
+        value, expires_at = self.data.get(name, (None, None))
+        if value is None or time.monotonic() >= expires_at:
+            return None
+        return value.encode("utf-8")
+
+    async def set(self, name, value, px):
+        self.data[name] = (value, time.monotonic() + px / 1000)
+
+    async def aclose(self):
+        pass
+
+
+class BrokenBackend:
+    async def get(self, key):
+        raise ConnectionError("redis down")
+
+    async def set(self, key, value, ttl):
+        raise ConnectionError("redis down")
+
+    async def aclose(self):
+        pass
+
+
+class CountingAgent(BaseAgent):
+    def __init__(self, name, result, delay=0.01):
+        super().__init__(name)
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+
+    def process(self, content):
+        self.calls += 1
+        return dict(self.result)
+
+    async def aprocess(self, content):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return dict(self.result)
+
+
+def make_pipeline(cache, generator_status="generated", factuality_status="approved"):
+    agents = {
+        "content_generator": CountingAgent("ContentGenerator", {"content": "Text", "status": generator_status}),
+        "factuality": CountingAgent("FactualityChecker", {"status": factuality_status, "overall_score": 0.9}),
+        "style_analyzer": CountingAgent("StyleAnalyzer", {"status": "approved"}),
+        "multimodal_reviewer": CountingAgent("MultimodalReviewer", {"status": "approved"}),
+        "consensus": CountingAgent("ConsensusAgent", {"final_decision": "Approved"}),
+    }
+    registry = AgentRegistry()
+    for name, agent in agents.items():
+        registry.register(name, lambda agent=agent: agent)
+    workflow = ReviewWorkflow({"execution_mode": "concurrent"}, registry)
+    return GovernancePipeline(workflow, registry, result_cache=cache), agents
+
+
+def test_request_key_is_canonical():
+    base = {"type": "blog_post", "topic": "Solar power", "style_guide": {"tone": "formal", "length": 300},
+            "target_audience": "general"}
+    reordered = {"target_audience": "general", "style_guide": {"length": 300, "tone": "formal"},
+                 "topic": "  Solar   power ", "type": "blog_post"}
+    assert request_cache_key(base) == request_cache_key(reordered)
+    assert request_cache_key({"topic": "Solar power", "style_guide": {"tone": "formal", "length": 300}}) == \
+        request_cache_key(base)
+    assert request_cache_key(dict(base, topic="Wind power")) != request_cache_key(base)
+    assert request_cache_key(dict(base, target_audience="experts")) != request_cache_key(base)
+
+
+def test_memory_backend_expires_and_evicts():
+    now = [0.0]
+    backend = MemoryResultBackend(max_entries=2, clock=lambda: now[0])
+
+    async def run():
+        await backend.set("a", "1", ttl=10)
+        await backend.set("b", "2", ttl=10)
+        assert await backend.get("a") == "1"
+        await backend.set("c", "3", ttl=10)  # evicts b, the least recently used
+        assert await backend.get("b") is None
+        now[0] = 11
+        assert await backend.get("a") is None
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("backend_factory", [MemoryResultBackend, lambda: RedisResultBackend(FakeAsyncRedis())])
+def test_concurrent_identical_requests_share_one_run(backend_factory):
+    cache = ResultCache(backend_factory(), ttl=60)
+    calls = []
+
+    async def run_pipeline():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"final_decision": {"final_decision": "Approved"}}
+
+    async def run():
+        results = await asyncio.gather(*(cache.get_or_run("k", run_pipeline) for _ in range(5)))
+        again = await cache.get_or_run("k", run_pipeline)
+        return results, again
+
+    results, again = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result == again for result in results)
+    results[0]["final_decision"]["final_decision"] = "mutated"
+    assert results[1]["final_decision"]["final_decision"] == "Approved"
+    stats = cache.get_stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"], stats["in_flight"]) == (1, 4, 1, 0)
+
+
+def test_failures_are_shared_but_not_cached():
+    cache = ResultCache(MemoryResultBackend(), ttl=60)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("LLM unavailable")
+
+    async def run():
+        outcomes = await asyncio.gather(*(cache.get_or_run("k", failing) for _ in range(3)),
+                                        return_exceptions=True)
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        with pytest.raises(RuntimeError):
+            await cache.get_or_run("k", failing)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_broken_backend_degrades_to_running_the_pipeline():
+    cache = ResultCache(BrokenBackend(), ttl=60)
+
+    async def run_pipeline():
+        return {"ok": True}
+
+    assert asyncio.run(cache.get_or_run("k", run_pipeline)) == {"ok": True}
+    assert cache.get_stats()["backend_errors"] == 2
+
+
+def test_pipeline_serves_repeats_from_cache_and_replays_streams():
+    cache = ResultCache(MemoryResultBackend(), ttl=60)
+    pipeline, agents = make_pipeline(cache)
+    request = {"type": "blog_post", "topic": "Solar power", "target_audience": "general"}
+
+    async def run():
+        first, second = await asyncio.gather(pipeline.arun(request), pipeline.arun(dict(request)))
+        events = [event async for event in pipeline.astream({"topic": "Solar power"})]
+        return first, second, events
+
+    first, second, events = asyncio.run(run())
+    assert first == second
+    assert agents["content_generator"].calls == 1
+    assert agents["consensus"].calls == 1
+    assert [e["type"] for e in events if e["type"] != "generation_update"] == \
+        ["generated_content", "review_result", "review_result", "review_result", "consensus"]
+    assert events[-1]["data"] == first["final_decision"]
+
+
+def test_streamed_runs_populate_the_cache():
+    cache = ResultCache(MemoryResultBackend(), ttl=60)
+    pipeline, agents = make_pipeline(cache)
+
+    async def run():
+        [event async for event in pipeline.astream({"topic": "Wind"})]
+        return await pipeline.arun({"topic": "Wind"})
+
+    result = asyncio.run(run())
+    assert agents["content_generator"].calls == 1
+    assert [step["agent"] for step in result["review_pipeline"]] == \
+        ["FactualityChecker", "StyleAnalyzer", "MultimodalReviewer"]
+
+
+def test_failed_generation_is_not_cached():
+    cache = ResultCache(MemoryResultBackend(), ttl=60)
+    pipeline, agents = make_pipeline(cache, generator_status="failed")
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(GenerationFailed):
+                await pipeline.arun({"topic": "Tides"})
+
+    asyncio.run(run())
+    assert agents["content_generator"].calls == 2
+
+
+def test_runs_with_a_failed_review_step_are_not_cached():
+    cache = ResultCache(MemoryResultBackend(), ttl=60)
+    pipeline, agents = make_pipeline(cache, factuality_status="error")
+
+    async def run():
+        await pipeline.arun({"topic": "Tides"})
+        [event async for event in pipeline.astream({"topic": "Tides"})]
+        return await pipeline.arun({"topic": "Tides"})
+
+    result = asyncio.run(run())
+    assert result["review_pipeline"][0]["result"]["status"] == "error"
+    assert agents["content_generator"].calls == 3
+    assert cache.get_stats()["uncacheable"] == 3
+
+
+def test_error_results_are_shared_with_waiting_callers_but_not_stored():
+    cache = ResultCache(MemoryResultBackend(), ttl=60)
+    calls = []
+
+    async def errored_run():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"generated_content": {"status": "generated"},
+                "review_pipeline": [{"agent": "StyleAnalyzer", "result": {"status": "error", "error": "model"}}]}
+
+    async def run():
+        shared = await asyncio.gather(*(cache.get_or_run("k", errored_run) for _ in range(3)))
+        again = await cache.get_or_run("k", errored_run)
+        return shared, again
+
+    shared, again = asyncio.run(run())
+    assert all(result == again for result in shared)
+    assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Result cache tests passed!")
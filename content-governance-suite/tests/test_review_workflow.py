@@ -0,0 +1,117 @@
+import sys
+import os
+import threading
+import time
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.base_agent import BaseAgent
+from agents.registry import AgentRegistry
+from workflows.review_workflow import ReviewWorkflow
+
+
+class SleepingAgent(BaseAgent):
+    """Synchronous reviewer that sleeps, and records when it ran."""
+
+    def __init__(self, name, delay, status="approved"):
+        super().__init__(name)
+        self.delay = delay
+        self.status = status
+        self.calls = 0
+        self.finished = threading.Event()
+
+    def process(self, content):
+        self.calls += 1
+        time.sleep(self.delay)
+        self.finished.set()
+        return {"status": self.status}
+
+
+def make_workflow(mode, factuality_status="approved", factuality_delay=0.05, other_delay=0.1, max_workers=8):
+    agents = {
+        "factuality": SleepingAgent("FactualityChecker", factuality_delay, factuality_status),
+        "style_analyzer": SleepingAgent("StyleAnalyzer", other_delay),
+        "multimodal_reviewer": SleepingAgent("MultimodalReviewer", other_delay),
+    }
+    registry = AgentRegistry()
+    for name, agent in agents.items():
+        registry.register(name, lambda agent=agent: agent)
+    return ReviewWorkflow({"execution_mode": mode, "max_workers": max_workers}, registry), agents
+
+
+def test_sequential_halts_after_failed_factuality():
+    workflow, agents = make_workflow("sequential", factuality_status="failed")
+    steps = workflow.execute({"content": "Text"})
+    assert [step["agent"] for step in steps] == ["FactualityChecker"]
+    assert agents["style_analyzer"].calls == 0
+
+
+def test_concurrent_runs_reviewers_in_parallel_and_keeps_reporting_order():
+    workflow, _ = make_workflow("concurrent", factuality_delay=0.2, other_delay=0.2)
+    start = time.perf_counter()
+    steps = workflow.execute({"content": "Text"})
+    elapsed = time.perf_counter() - start
+    workflow.shutdown()
+
+    assert [step["agent"] for step in steps] == ["FactualityChecker", "StyleAnalyzer", "MultimodalReviewer"]
+    assert elapsed < 0.5
+    assert all(step["execution_time"] >= 0.2 for step in steps)
+
+
+def test_concurrent_returns_every_result_even_after_failed_factuality():
+    workflow, _ = make_workflow("concurrent", factuality_status="failed")
+    steps = workflow.execute({"content": "Text"})
+    workflow.shutdown()
+    assert len(steps) == 3
+
+
+def test_speculative_returns_all_results_when_factuality_passes():
+    workflow, _ = make_workflow("speculative")
+    steps = workflow.execute({"content": "Text"})
+    workflow.shutdown()
+    assert [step["agent"] for step in steps] == ["FactualityChecker", "StyleAnalyzer", "MultimodalReviewer"]
+
+
+def test_speculative_exits_early_when_factuality_fails():
+    workflow, agents = make_workflow("speculative", factuality_status="failed", factuality_delay=0.01,
+                                     other_delay=0.5)
+    start = time.perf_counter()
+    steps = workflow.execute({"content": "Text"})
+    elapsed = time.perf_counter() - start
+
+    assert [step["agent"] for step in steps] == ["FactualityChecker"]
+    assert elapsed < 0.4  # did not wait for the slow reviewers
+    workflow.shutdown()
+
+
+def test_speculative_failure_cancels_reviewers_that_have_not_started():
+    # One worker: the other reviewers are still queued when factuality fails
+    workflow, agents = make_workflow("speculative", factuality_status="failed", max_workers=1)
+    assert [step["agent"] for step in workflow.execute({"content": "Text"})] == ["FactualityChecker"]
+    workflow.shutdown()
+    time.sleep(0.15)
+    assert agents["style_analyzer"].calls == 0 and agents["multimodal_reviewer"].calls == 0
+
+
+def test_shutdown_releases_the_pool_and_execute_recreates_it():
+    workflow, _ = make_workflow("concurrent", factuality_delay=0, other_delay=0)
+    workflow.execute({"content": "Text"})
+    executor = workflow._executor
+    workflow.shutdown()
+    assert workflow._executor is None
+    assert executor._shutdown
+
+    assert len(workflow.execute({"content": "Text"})) == 3
+    assert workflow._executor is not executor
+    workflow.shutdown()
+
+
+def test_unknown_mode_is_rejected():
+    workflow, _ = make_workflow("concurrent")
+    with pytest.raises(ValueError, match="Unknown review execution mode"):
+        workflow.execute({"content": "Text"}, execution_mode="parallel")
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Review workflow tests passed!")
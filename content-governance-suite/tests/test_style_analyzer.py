@@ -0,0 +1,87 @@
+import re
+import sys
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.registry import AgentRegistry
+from agents.sentiment.style_analyzer import StyleAnalyzerAgent
+
+
+class WhitespaceTokenizer:
+    model_max_length = 512
+
+    def __call__(self, text, add_special_tokens=True, return_offsets_mapping=False):
+        if isinstance(text, list):
+            return {"input_ids": [self(t)["input_ids"] for t in text]}
+        spans = [m.span() for m in re.finditer(r"\S+", text)]
+        encoded = {"input_ids": list(range(len(spans)))}
+        if return_offsets_mapping:
+            encoded["offset_mapping"] = spans
+        return encoded
+
+
+class KeywordPipeline:
+    """Labels a chunk by keyword, with lowercase labels like cardiffnlp/twitter-roberta-base-sentiment-latest."""
+
+    def __init__(self, labels):
+        self.tokenizer = WhitespaceTokenizer()
+        self.labels = labels
+
+    def __call__(self, chunks, batch_size=None, truncation=None):
+        return [{"label": next((label for keyword, label in self.labels if keyword in chunk), "neutral"),
+                 "score": 0.9} for chunk in chunks]
+
+
+class LocalModelsAgent(StyleAnalyzerAgent):
+    def _load_pipeline(self, task, model):
+        if task == "sentiment-analysis":
+            return KeywordPipeline([("great", "positive"), ("awful", "negative")])
+        return KeywordPipeline([("idiot", "toxic")])
+
+
+@pytest.fixture
+def agent():
+    return LocalModelsAgent({"model_server": "", "micro_batching": False, "max_chunk_tokens": 6})
+
+
+@pytest.mark.parametrize("content", ["", "   \n\t "])
+def test_empty_content_gets_a_neutral_result(agent, content):
+    result = agent.process({"content": content})
+    assert result["status"] != "error"
+    assert result["sentiment"] == {"overall_sentiment": "NEUTRAL", "confidence": 1.0,
+                                   "distribution": {"positive": 0, "negative": 0, "neutral": 0}}
+    assert result["readability"]["toxicity_score"] == 0
+
+
+def test_lowercase_sentiment_labels_are_counted(agent):
+    result = agent.process({"content": "This is a great product. The manual is awful. Plain closing line."})
+    assert result["sentiment"]["distribution"] == {"positive": 1, "negative": 1, "neutral": 1}
+    assert result["sentiment"]["overall_sentiment"] == "POSITIVE"
+
+
+def test_lowercase_negative_label_lowers_the_style_score(agent):
+    negative = agent._calculate_style_score({"overall_sentiment": "negative", "confidence": 0.9},
+                                            {"readability_grade": "good"}, {"alignment_score": 1.0})
+    assert negative == pytest.approx((0.5 + 1.0 + 1.0) / 3)
+
+
+def test_registry_shutdown_stops_the_micro_batching_threads():
+    registry = AgentRegistry()
+    registry.register("style_analyzer", lambda: LocalModelsAgent({"model_server": "", "micro_batching": True}))
+    registry.register("unused", lambda: pytest.fail("shutdown must not build agents"))
+    agent = registry.get("style_analyzer")
+    agent.process({"content": "This is a great product. Plain closing line."})
+    workers = [scheduler._worker for scheduler in agent._schedulers.values()]
+    assert len(workers) == 2 and all(worker.is_alive() for worker in workers)
+
+    registry.shutdown()
+    assert not any(worker.is_alive() for worker in workers)
+    assert agent.get_inference_metrics() == {}
+    assert agent.process({"content": "Still works after shutdown."})["status"] != "error"
+    agent.shutdown()
+
+
+if __name__ == "__main__":
+    if pytest.main([__file__, "-q"]) == 0:
+        print("✅ Style analyzer tests passed!")
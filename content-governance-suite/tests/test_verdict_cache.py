@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.factcheck.verdict_cache import ClaimVerdictCache
+
+VERDICT = {"rating": "QUESTIONABLE", "reasoning": "No source given for the statistic."}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalized_claims_share_an_entry():
+    cache = ClaimVerdictCache()
+    cache.set("Studies show that 45% of teams ship faster.", VERDICT)
+
+    assert cache.get("  studies show that 45%   of teams ship faster ") == VERDICT
+    assert cache.get("Studies show that 46% of teams ship faster.") is None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["tokens_saved"] > 0
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ClaimVerdictCache(ttl_seconds=60, clock=clock)
+    cache.set("Clinically proven results.", VERDICT)
+
+    clock.now += 59
+    assert cache.get("Clinically proven results.") == VERDICT
+    clock.now += 2
+    assert cache.get("Clinically proven results.") is None
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ClaimVerdictCache(max_memory_entries=2)
+    cache.set("claim a", VERDICT)
+    cache.set("claim b", VERDICT)
+    cache.get("claim a")
+    cache.set("claim c", VERDICT)
+
+    assert cache.get("claim b") is None
+    assert cache.get("claim a") == VERDICT
+    assert cache.get("claim c") == VERDICT
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "verdicts.sqlite3")
+    first = ClaimVerdictCache(path=path)
+    first.set("Experts say the market doubled.", VERDICT)
+    first.close()
+
+    second = ClaimVerdictCache(path=path)
+    assert second.get_many(["unknown claim", "experts say the market doubled"]) == {1: VERDICT}
+    assert second.get_stats()["disk_hits"] == 1
+    # Promoted into memory, so the next lookup does not touch SQLite
+    second.get("Experts say the market doubled.")
+    assert second.get_stats()["memory_hits"] == 1
+    second.close()
+
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_normalized_claims_share_an_entry()
+    test_entries_expire_after_ttl()
+    test_memory_tier_evicts_least_recently_used()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_disk_tier_survives_restart(pathlib.Path(tmp))
+    print("✅ Verdict cache tests passed!")
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.websocket_manager import WebSocketManager
+
+
+class FakeWebSocket:
+    """Records sent text; sends take `delay` seconds, or fail when `broken`."""
+
+    def __init__(self, delay=0.0, broken=False):
+        self.delay = delay
+        self.broken = broken
+        self.sent = []
+        self.closed = False
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.broken:
+            raise RuntimeError("connection reset")
+        await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed = True
+        self.close_code = code
+
+
+def test_broadcast_is_not_held_up_by_a_slow_client():
+    async def run():
+        manager = WebSocketManager(send_timeout=5)
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=1)
+        await manager.connect(fast)
+        await manager.connect(slow)
+
+        await manager.broadcast({"type": "result", "n": 1})
+        await asyncio.sleep(0.05)
+        return fast, slow
+
+    fast, slow = asyncio.run(run())
+    assert fast.sent == [{"type": "result", "n": 1}]
+    assert slow.sent == []
+
+
+def test_progress_updates_are_coalesced_behind_newer_messages():
+    async def run():
+        manager = WebSocketManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, "user")
+        # Nothing is sent until the sender task runs, so all of these are queued together
+        await manager.send_generation_update("generating", 0, user_id="user")
+        await manager.send_personal_message({"type": "token", "content": "Hi"}, "user")
+        await manager.send_generation_update("reviewing", 40, user_id="user")
+        await asyncio.sleep(0.01)
+        return manager, websocket
+
+    manager, websocket = asyncio.run(run())
+    assert [(m["type"], m.get("step")) for m in websocket.sent] == [("token", None), ("generation_update", "reviewing")]
+    assert manager.get_stats()["coalesced"] == 1
+
+
+def test_full_queue_drops_progress_then_removes_slow_consumer():
+    async def run():
+        manager = WebSocketManager(max_queue_size=2)
+        websocket = FakeWebSocket(delay=10)
+        connection = await manager.connect(websocket)
+        await asyncio.sleep(0)  # sender picks up nothing; queue is empty
+
+        await manager.broadcast({"type": "generation_update", "progress": 1})
+        await manager.broadcast({"type": "result", "n": 1})
+        await manager.broadcast({"type": "result", "n": 2})   # drops the progress update
+        accepted = await manager.broadcast({"type": "result", "n": 3})  # nothing left to drop
+        await asyncio.sleep(0)
+        return manager, connection, websocket, accepted
+
+    manager, connection, websocket, accepted = asyncio.run(run())
+    assert connection.dropped == 1
+    assert accepted == 0
+    assert manager.connections == {}
+    assert manager.removed["slow_consumer"] == 1
+    assert websocket.closed and websocket.close_code == 1013
+
+
+def test_streamed_tokens_are_concatenated_for_a_slow_reader():
+    async def run():
+        manager = WebSocketManager(max_queue_size=3)
+        websocket = FakeWebSocket(delay=0.05)
+        await manager.connect(websocket, "user")
+        await manager.send_personal_message({"type": "token", "content": "first "}, "user")
+        await asyncio.sleep(0.01)  # the first token is being sent
+        for word in ["a ", "slow ", "reader ", "keeps ", "up"]:
+            await manager.send_personal_message({"type": "token", "content": word}, "user")
+        await manager.send_personal_message({"type": "result", "n": 1}, "user")
+        await manager.send_personal_message({"type": "token", "content": "next"}, "user")
+        await asyncio.sleep(0.3)
+        return manager, websocket
+
+    manager, websocket = asyncio.run(run())
+    assert websocket.sent == [{"type": "token", "content": "first "},
+                              {"type": "token", "content": "a slow reader keeps up"},
+                              {"type": "result", "n": 1},
+                              {"type": "token", "content": "next"}]
+    assert manager.get_stats()["coalesced"] == 4
+    assert manager.removed["slow_consumer"] == 0 and not websocket.closed
+
+
+def test_disconnect_closes_with_a_normal_code():
+    async def run():
+        manager = WebSocketManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, "user")
+        manager.disconnect(websocket, "user")
+        await asyncio.sleep(0.01)
+        return manager, websocket
+
+    manager, websocket = asyncio.run(run())
+    assert websocket.closed and websocket.close_code == 1000
+    assert manager.removed["disconnected"] == 1 and manager.user_connections == {}
+
+
+def test_dead_and_timed_out_sockets_are_removed_and_users_keep_other_sockets():
+    async def run():
+        manager = WebSocketManager(send_timeout=0.05)
+        healthy, broken, stuck = FakeWebSocket(), FakeWebSocket(broken=True), FakeWebSocket(delay=1)
+        for websocket in (healthy, broken, stuck):
+            await manager.connect(websocket, "user")
+
+        delivered = await manager.send_personal_message({"type": "result"}, "user")
+        await asyncio.sleep(0.2)
+        return manager, healthy, broken, stuck, delivered
+
+    manager, healthy, broken, stuck, delivered = asyncio.run(run())
+    assert delivered == 3
+    assert healthy.sent == [{"type": "result"}]
+    assert len(manager.user_connections["user"]) == 1
+    assert manager.removed["send_error"] == 1 and manager.removed["send_timeout"] == 1
+    assert broken.close_code == 1000 and stuck.close_code == 1013
+
+
+if __name__ == "__main__":
+    test_broadcast_is_not_held_up_by_a_slow_client()
+    test_progress_updates_are_coalesced_behind_newer_messages()
+    test_full_queue_drops_progress_then_removes_slow_consumer()
+    test_streamed_tokens_are_concatenated_for_a_slow_reader()
+    test_disconnect_closes_with_a_normal_code()
+    test_dead_and_timed_out_sockets_are_removed_and_users_keep_other_sockets()
+    print("✅ WebSocket manager tests passed!")
@@ -0,0 +1,178 @@
+# workflows/governance_pipeline.py
+
+from typing import Dict, Any, List, AsyncIterator
+import asyncio
+import contextlib
+import time
+import sys
+import os
+
+# Ensure the root directory is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.registry import AgentRegistry, agent_registry
+from workflows.review_workflow import ReviewWorkflow
+from services.result_cache import request_cache_key
+
+
+class GenerationFailed(Exception):
+    """Raised when the content generator reports a failed generation."""
+
+
+class GovernancePipeline:
+    """Generator -> ReviewWorkflow -> ConsensusAgent for a single content request."""
+
+    def __init__(self, review_workflow: ReviewWorkflow = None, registry: AgentRegistry = None,
+                 recorder=None, result_cache=None):
+        """
+        ``recorder`` (e.g. services.history_writer.PipelineRecorder) is told
+        about every finished run; it must not block, as it runs on the event loop.
+        ``result_cache`` (services.result_cache.ResultCache) serves identical
+        requests from earlier or in-flight runs.
+        """
+        self.registry = registry or agent_registry
+        self.review_workflow = review_workflow or ReviewWorkflow(registry=self.registry)
+        self.recorder = recorder
+        self.result_cache = result_cache
+
+    async def arun(self, content_request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the full pipeline for one request. All agent work is awaited, so
+        many requests can share one event loop.
+
+        Raises:
+            GenerationFailed: if the content generator could not produce content.
+        """
+        if self.result_cache is not None:
+            return await self.result_cache.get_or_run(
+                request_cache_key(content_request), lambda: self._arun(content_request))
+        return await self._arun(content_request)
+
+    async def _arun(self, content_request: Dict[str, Any]) -> Dict[str, Any]:
+        # Step 1: Generate Content
+        print("\n--- Step 1: GENERATING CONTENT ---")
+        content_generator = await self.registry.aget("content_generator")
+        start = time.perf_counter()
+        generated_content_data = await content_generator.aprocess(content_request)
+        generation_time = round(time.perf_counter() - start, 4)
+        self._check_generation(generated_content_data, generation_time)
+
+        # Step 2: Run Review Workflow
+        print("\n--- Step 2: EXECUTING REVIEW WORKFLOW ---")
+        review_results = await self.review_workflow.aexecute({"content_data": generated_content_data})
+
+        # Step 3: Get Consensus
+        print("\n--- Step 3: CALCULATING CONSENSUS ---")
+        consensus_agent = await self.registry.aget("consensus")
+        start = time.perf_counter()
+        final_consensus = await consensus_agent.aprocess(review_results)
+        self._record_run(content_request, generated_content_data, review_results, final_consensus,
+                         generation_time, round(time.perf_counter() - start, 4))
+
+        return {
+            "generated_content": generated_content_data,
+            "review_pipeline": review_results,
+            "final_decision": final_consensus
+        }
+
+    async def astream(self, content_request: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the pipeline for one request, yielding events as soon as they happen:
+
+        * ``generation_update`` - progress through the pipeline stages
+        * ``token``             - a chunk of generated text (generators with ``astream``)
+        * ``generated_content`` - the full generator result
+        * ``review_result``     - one reviewer's step, as each finishes
+        * ``consensus``         - the final decision; always the last event
+
+        A cached result is replayed as the same events, without tokens.
+
+        Raises:
+            GenerationFailed: if the content generator could not produce content.
+        """
+        yield {"type": "generation_update", "step": "generating", "progress": 0}
+        cache_key = request_cache_key(content_request) if self.result_cache is not None else None
+        if cache_key is not None:
+            cached = await self.result_cache.lookup(cache_key)
+            if cached is not None:
+                yield {"type": "generated_content", "data": cached["generated_content"]}
+                yield {"type": "generation_update", "step": "reviewing", "progress": 40}
+                for step in cached["review_pipeline"]:
+                    yield {"type": "review_result", "data": step}
+                yield {"type": "generation_update", "step": "consensus", "progress": 90}
+                yield {"type": "consensus", "data": cached["final_decision"]}
+                return
+
+        content_generator = await self.registry.aget("content_generator")
+        start = time.perf_counter()
+        if hasattr(content_generator, "astream"):
+            generated_content_data = None
+            async with contextlib.aclosing(content_generator.astream(content_request)) as events:
+                async for event in events:
+                    if event["type"] == "token":
+                        yield event
+                    else:
+                        generated_content_data = event["data"]
+        else:
+            generated_content_data = await content_generator.aprocess(content_request)
+        generation_time = round(time.perf_counter() - start, 4)
+        self._check_generation(generated_content_data, generation_time)
+        yield {"type": "generated_content", "data": generated_content_data}
+
+        yield {"type": "generation_update", "step": "reviewing", "progress": 40}
+        review_results = []
+        # aclosing: if our consumer stops early, reviewers still running are cancelled
+        async with contextlib.aclosing(
+                self.review_workflow.astream({"content_data": generated_content_data})) as steps:
+            async for step in steps:
+                review_results.append(step)
+                yield {"type": "review_result", "data": step}
+
+        yield {"type": "generation_update", "step": "consensus", "progress": 90}
+        consensus_agent = await self.registry.aget("consensus")
+        review_results = self.review_workflow.sort_steps(review_results)
+        start = time.perf_counter()
+        final_consensus = await consensus_agent.aprocess(review_results)
+        self._record_run(content_request, generated_content_data, review_results, final_consensus,
+                         generation_time, round(time.perf_counter() - start, 4))
+        if cache_key is not None:
+            await self.result_cache.set(cache_key, {
+                "generated_content": generated_content_data,
+                "review_pipeline": review_results,
+                "final_decision": final_consensus
+            })
+        yield {"type": "consensus", "data": final_consensus}
+
+    def _check_generation(self, generated_content_data: Dict[str, Any], generation_time: float):
+        """Record and raise a failed generation."""
+        if generated_content_data.get("status") != "failed":
+            return
+        error = generated_content_data.get("error")
+        if self.recorder is not None:
+            try:
+                self.recorder.record_generation_failure(error, generation_time)
+            except Exception as e:
+                print(f"Failed to record pipeline run: {e}")
+        raise GenerationFailed(f"Content generation failed: {error}")
+
+    def _record_run(self, content_request: Dict[str, Any], generated_content_data: Dict[str, Any],
+                    review_results: List[Dict[str, Any]], final_consensus: Dict[str, Any],
+                    generation_time: float, consensus_time: float):
+        # Recording must never fail a request that otherwise succeeded
+        if self.recorder is not None:
+            try:
+                self.recorder.record_run(content_request, generated_content_data, review_results,
+                                         final_consensus, generation_time, consensus_time)
+            except Exception as e:
+                print(f"Failed to record pipeline run: {e}")
+
+    async def awarm(self, content_requests: List[Dict[str, Any]]):
+        """
+        Prepare for a batch of requests: embed all topics in one batched call
+        so each request's retrieval step hits the generator's embedding cache.
+        """
+        content_generator = await self.registry.aget("content_generator")
+        embed_topics = getattr(content_generator, "embed_topics", None)
+        topics = [request.get("topic", "") for request in content_requests if request.get("topic")]
+        if embed_topics is not None and topics:
+            await asyncio.get_running_loop().run_in_executor(None, embed_topics, topics)
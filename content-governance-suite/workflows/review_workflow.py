@@ -1,61 +1,247 @@
 # workflows/review_workflow.py
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple, AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import asyncio
+import threading
+import time
 import sys
 import os
 
 # Ensure the root directory is in the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from agents.factcheck.factuality_agent import FactualityAgent
-from agents.sentiment.style_analyzer import StyleAnalyzerAgent
-from agents.multimodal.multimodal_reviewer import MultimodalReviewerAgent
+from agents.base_agent import BaseAgent
+from agents.registry import AgentRegistry, agent_registry
 
 class ReviewWorkflow:
     """Orchestrates the entire content review process."""
-    
-    def __init__(self):
-        """Initializes all the necessary review agents."""
-        self.factuality_agent = FactualityAgent()
-        self.style_agent = StyleAnalyzerAgent()
-        self.multimodal_agent = MultimodalReviewerAgent()
-        print("ReviewWorkflow initialized with all review agents.")
 
-    def execute(self, generated_content: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # sequential:  run reviewers one after another, stop after a failed factuality check
+    # concurrent:  run all reviewers in parallel and always return every result
+    # speculative: run all reviewers in parallel, but keep only the factuality
+    #              result (and discard the others) when it fails
+    EXECUTION_MODES = ("sequential", "concurrent", "speculative")
+
+    def __init__(self, config: Dict[str, Any] = None, registry: AgentRegistry = None):
+        """
+        Configures the workflow. Review agents come from the shared registry and
+        are only built the first time a review needs them.
+        """
+        self.config = config or {}
+        self.execution_mode = self.config.get(
+            "execution_mode", os.getenv("REVIEW_EXECUTION_MODE", "sequential")
+        )
+        if self.execution_mode not in self.EXECUTION_MODES:
+            raise ValueError(f"Unknown review execution mode: {self.execution_mode}")
+        self.max_workers = int(self.config.get("max_workers", 8))
+
+        self.registry = registry or agent_registry
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        print(f"ReviewWorkflow initialized (mode={self.execution_mode}).")
+
+    @property
+    def factuality_agent(self) -> BaseAgent:
+        return self.registry.get("factuality")
+
+    @property
+    def style_agent(self) -> BaseAgent:
+        return self.registry.get("style_analyzer")
+
+    @property
+    def multimodal_agent(self) -> BaseAgent:
+        return self.registry.get("multimodal_reviewer")
+
+    def _review_agents(self) -> List[Tuple[str, str]]:
+        """(result label, registry name) of each reviewer, in reporting order."""
+        return [
+            ("FactualityChecker", "factuality"),
+            ("StyleAnalyzer", "style_analyzer"),
+            ("MultimodalReviewer", "multimodal_reviewer"),
+        ]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the shared reviewer thread pool on first use."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="review-agent"
+                    )
+        return self._executor
+
+    def _run_step(self, agent_label: str, agent_name: str, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single reviewer and record how long it took."""
+        agent = self.registry.get(agent_name)
+        print(f"Executing {agent.agent_name} Agent...")
+        start = time.perf_counter()
+        result = agent.process(content)
+        return {
+            "agent": agent_label,
+            "result": result,
+            "execution_time": round(time.perf_counter() - start, 4)
+        }
+
+    @staticmethod
+    def _is_critical_failure(step: Dict[str, Any]) -> bool:
+        return step["result"].get("status") in ["failed", "error"]
+
+    def execute(self, generated_content: Dict[str, Any], execution_mode: str = None) -> List[Dict[str, Any]]:
         """
         Executes the full review pipeline on the generated content.
-        
+
         Args:
             generated_content: The output from the ContentGeneratorAgent.
-            
+            execution_mode: Optional per-call override of the configured mode.
+
         Returns:
-            A list of review results from each agent.
+            A list of review results from each agent. Every step also carries
+            the agent's ``execution_time`` in seconds.
         """
-        review_steps = []
+        mode = execution_mode or self.execution_mode
+        if mode not in self.EXECUTION_MODES:
+            raise ValueError(f"Unknown review execution mode: {mode}")
+
         content_to_review = generated_content.get("content_data", generated_content)
 
-        print("--- Starting Review Workflow ---")
+        print(f"--- Starting Review Workflow ({mode}) ---")
+        if mode == "sequential":
+            review_steps = self._execute_sequential(content_to_review)
+        else:
+            review_steps = self._execute_concurrent(content_to_review, speculative=(mode == "speculative"))
+
+        print("--- Review Workflow Completed ---")
+        return review_steps
+
+    def _execute_sequential(self, content_to_review: Dict[str, Any]) -> List[Dict[str, Any]]:
+        review_steps = []
+        for agent_label, agent_name in self._review_agents():
+            step = self._run_step(agent_label, agent_name, content_to_review)
+            review_steps.append(step)
+
+            # Early exit if content fails critical checks
+            if agent_label == "FactualityChecker" and self._is_critical_failure(step):
+                print("Workflow halted: Content failed critical factuality check.")
+                break
+
+        return review_steps
+
+    def _execute_concurrent(self, content_to_review: Dict[str, Any], speculative: bool) -> List[Dict[str, Any]]:
+        executor = self._get_executor()
+        (factuality_label, factuality_name), *others = self._review_agents()
+        factuality_future = executor.submit(self._run_step, factuality_label, factuality_name, content_to_review)
+        futures = [factuality_future]
+        for agent_label, agent_name in others:
+            if speculative:
+                futures.append(executor.submit(self._run_speculative_step, agent_label, agent_name,
+                                               content_to_review, factuality_future))
+            else:
+                futures.append(executor.submit(self._run_step, agent_label, agent_name, content_to_review))
+
+        if speculative:
+            factuality_step = factuality_future.result()
+            if self._is_critical_failure(factuality_step):
+                # Reviewers that have not started yet are cancelled (or skip
+                # themselves if a worker picks them up first); results of those
+                # already running are discarded once they finish.
+                for future in futures[1:]:
+                    future.cancel()
+                print("Workflow halted: Content failed critical factuality check.")
+                return [factuality_step]
+
+        return [future.result() for future in futures]
+
+    def _run_speculative_step(self, agent_label: str, agent_name: str, content: Dict[str, Any],
+                              factuality_future) -> Dict[str, Any]:
+        """_run_step that is skipped if the factuality check has already failed when it starts."""
+        if factuality_future.done() and self._is_critical_failure(factuality_future.result()):
+            return None
+        return self._run_step(agent_label, agent_name, content)
+
+    async def _arun_step(self, agent_label: str, agent_name: str, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of _run_step."""
+        agent = await self.registry.aget(agent_name)
+        print(f"Executing {agent.agent_name} Agent...")
+        start = time.perf_counter()
+        result = await agent.aprocess(content)
+        return {
+            "agent": agent_label,
+            "result": result,
+            "execution_time": round(time.perf_counter() - start, 4)
+        }
 
-        # Step 1: Factuality & Compliance Check (most critical)
-        print("Executing Factuality Agent...")
-        factuality_result = self.factuality_agent.process(content_to_review)
-        review_steps.append({"agent": "FactualityChecker", "result": factuality_result})
-        
-        # Early exit if content fails critical checks
-        if factuality_result.get("status") in ["failed", "error"]:
-            print("Workflow halted: Content failed critical factuality check.")
-            return review_steps
+    async def aexecute(self, generated_content: Dict[str, Any], execution_mode: str = None) -> List[Dict[str, Any]]:
+        """
+        Async variant of execute; awaits each agent's ``aprocess`` so the
+        event loop stays free while reviewers wait on models or LLM calls.
+        """
+        steps = [step async for step in self.astream(generated_content, execution_mode)]
+        return self.sort_steps(steps)
+
+    async def astream(self, generated_content: Dict[str, Any], execution_mode: str = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield each reviewer's step as soon as it finishes, in completion order.
+
+        In speculative mode the other reviewers' steps are held back until the
+        factuality verdict is known, so nothing is emitted that would have been
+        discarded after a failed fact check.
+        """
+        mode = execution_mode or self.execution_mode
+        if mode not in self.EXECUTION_MODES:
+            raise ValueError(f"Unknown review execution mode: {mode}")
 
-        # Step 2: Style & Sentiment Analysis
-        print("Executing Style Analyzer Agent...")
-        style_result = self.style_agent.process(content_to_review)
-        review_steps.append({"agent": "StyleAnalyzer", "result": style_result})
+        content_to_review = generated_content.get("content_data", generated_content)
 
-        # Step 3: Multi-modal Review (if applicable)
-        print("Executing Multimodal Reviewer Agent...")
-        multimodal_result = self.multimodal_agent.process(content_to_review)
-        review_steps.append({"agent": "MultimodalReviewer", "result": multimodal_result})
+        print(f"--- Starting Review Workflow ({mode}, async) ---")
+        if mode == "sequential":
+            for agent_label, agent_name in self._review_agents():
+                step = await self._arun_step(agent_label, agent_name, content_to_review)
+                yield step
+                if agent_label == "FactualityChecker" and self._is_critical_failure(step):
+                    print("Workflow halted: Content failed critical factuality check.")
+                    break
+        else:
+            tasks = [
+                asyncio.ensure_future(self._arun_step(agent_label, agent_name, content_to_review))
+                for agent_label, agent_name in self._review_agents()
+            ]
+            held = []
+            factuality_pending = mode == "speculative"
+            try:
+                for next_step in asyncio.as_completed(tasks):
+                    step = await next_step
+                    if not factuality_pending:
+                        yield step
+                    elif step["agent"] != "FactualityChecker":
+                        held.append(step)
+                    else:
+                        factuality_pending = False
+                        yield step
+                        if self._is_critical_failure(step):
+                            print("Workflow halted: Content failed critical factuality check.")
+                            break
+                        for held_step in held:
+                            yield held_step
+                        held = []
+            finally:
+                # Reviewers still running after a halt (or an abandoned stream) are cancelled
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
 
         print("--- Review Workflow Completed ---")
-        return review_steps
+
+    def sort_steps(self, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order review steps like the reviewers are listed in _review_agents."""
+        order = {agent_label: i for i, (agent_label, _) in enumerate(self._review_agents())}
+        return sorted(steps, key=lambda step: order.get(step["agent"], len(order)))
+
+    def shutdown(self):
+        """Release the reviewer thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None